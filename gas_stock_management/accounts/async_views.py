@@ -0,0 +1,129 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.hashing import PoolSaturated, get_hashing_pool
+from accounts.revocation import get_revocation_store
+from accounts.throttling import client_ip, get_login_limiter
+from accounts.serializers import (
+    ChangePasswordSerializer,
+    LoginSerializer,
+    RegisterSerializer,
+    UserSerializer,
+)
+from accounts.tokens import tokens_for_user
+
+
+def _error(message: str, status_code: int, **extra) -> JsonResponse:
+    return JsonResponse({"success": False, "message": message, "data": {}, **extra}, status=status_code)
+
+
+def _saturated(exc: PoolSaturated) -> JsonResponse:
+    response = _error("Server is busy, please retry shortly", status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = str(exc.retry_after)
+    return response
+
+
+class AsyncAPIView(View):
+    """
+    Async counterparts of the account views. Password hashing runs on the
+    bounded pool from accounts/hashing.py; when it is saturated the view
+    answers 503 with Retry-After instead of queueing the request.
+    """
+
+    @method_decorator(csrf_exempt)
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.json = json.loads(request.body or b'{}')
+        except ValueError:
+            return _error("Invalid JSON body", status.HTTP_400_BAD_REQUEST)
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except PoolSaturated as exc:
+            return _saturated(exc)
+
+
+class AsyncLoginView(AsyncAPIView):
+    async def post(self, request):
+        serializer = LoginSerializer(data=request.json)
+        if not serializer.is_valid():
+            return _error("Invalid input", status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+
+        username = serializer.validated_data['username']
+        password = serializer.validated_data['password']
+        attempt = await sync_to_async(get_login_limiter().attempt)(username, client_ip(request))
+        if not attempt.allowed:
+            response = _error("Too many login attempts, please try again later",
+                              status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(attempt.retry_after)
+            return response
+        if attempt.delay:
+            await asyncio.sleep(attempt.delay)
+        pool = get_hashing_pool()
+
+        user = await User.objects.select_related('profile').filter(username=username).afirst()
+        if user is None:
+            # Hash anyway so unknown usernames take as long as wrong passwords
+            await pool.make_password(password)
+            return _error("Invalid username or password", status.HTTP_401_UNAUTHORIZED)
+
+        if not user.is_active or not await pool.check_password(password, user.password):
+            return _error("Invalid username or password", status.HTTP_401_UNAUTHORIZED)
+
+        await sync_to_async(attempt.succeeded)()
+        refresh = tokens_for_user(user)
+        return JsonResponse({
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+            'user': await sync_to_async(lambda: UserSerializer(user).data)()
+        }, status=status.HTTP_200_OK)
+
+
+class AsyncRegisterView(AsyncAPIView):
+    async def post(self, request):
+        serializer = RegisterSerializer(data=request.json)
+        # Field validation includes the unique-username lookup
+        if not await sync_to_async(serializer.is_valid)():
+            return _error("Invalid input", status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+
+        serializer.context['hashed_password'] = await get_hashing_pool().make_password(
+            serializer.validated_data['password']
+        )
+        await sync_to_async(serializer.save)()
+        return JsonResponse({'message': 'User registered successfully'}, status=status.HTTP_201_CREATED)
+
+
+class AsyncChangePasswordView(AsyncAPIView):
+    async def post(self, request):
+        try:
+            result = await sync_to_async(ClaimsJWTAuthentication().authenticate)(request)
+        except AuthenticationFailed as exc:
+            return _error(str(exc.detail), status.HTTP_401_UNAUTHORIZED)
+        if result is None:
+            return _error("Authentication credentials were not provided.", status.HTTP_401_UNAUTHORIZED)
+
+        serializer = ChangePasswordSerializer(data=request.json)
+        if not serializer.is_valid():
+            return _error("Invalid input", status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+
+        user = await User.objects.aget(pk=result[0].id)
+        pool = get_hashing_pool()
+        if not await pool.check_password(serializer.validated_data['old_password'], user.password):
+            return _error("Invalid input", status.HTTP_400_BAD_REQUEST,
+                          errors={"old_password": ["Old password is incorrect."]})
+
+        user.password = await pool.make_password(serializer.validated_data['new_password'])
+        await user.asave(update_fields=['password'])
+        await sync_to_async(get_revocation_store().revoke_user)(user.id)
+        return JsonResponse({
+            "success": True,
+            "message": "Password changed successfully",
+            "data": {}
+        }, status=status.HTTP_200_OK)
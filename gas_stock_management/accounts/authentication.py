@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from accounts.revocation import get_revocation_store
+from accounts.tokens import ROLE_CLAIM, STAFF_CLAIM, VERSION_CLAIM, get_profile_version
+
+
+class ClaimsProfile:
+    """Read-only stand-in for `Profile` carrying the role from the token."""
+
+    def __init__(self, role: str, claims_version: int):
+        self.role = role
+        self.claims_version = claims_version
+
+
+class ClaimsUser:
+    """
+    Lightweight user built from access-token claims. Permission checks read
+    `id`, `is_staff` and `profile.role` without touching the database; any
+    other attribute loads the real `User` row once and delegates to it.
+    """
+    is_active = True
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(self, token):
+        self.token = token
+        self.id = token[api_settings.USER_ID_CLAIM]
+        self.pk = self.id
+        self.is_staff = token[STAFF_CLAIM]
+        self.profile = ClaimsProfile(token[ROLE_CLAIM], token[VERSION_CLAIM])
+
+    @cached_property
+    def user(self) -> User:
+        return User.objects.select_related('profile').get(pk=self.id)
+
+    def __getattr__(self, name):
+        # Only reached for attributes not resolved from the claims above
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __eq__(self, other):
+        return getattr(other, 'pk', None) == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"ClaimsUser {self.id}"
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Trusts the role claims in the access token while their version matches the
+    cached profile version; falls back to loading the user from the database
+    once the profile has changed (e.g. a role update) since the token was issued.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if get_revocation_store().is_revoked(validated_token):
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+        return validated_token
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in (ROLE_CLAIM, STAFF_CLAIM, VERSION_CLAIM)):
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        current_version = get_profile_version(user_id)
+        if current_version is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if current_version != validated_token[VERSION_CLAIM]:
+            return super().get_user(validated_token)
+
+        return ClaimsUser(validated_token)
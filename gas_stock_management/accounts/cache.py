@@ -0,0 +1,47 @@
+import time
+from gas_stock_management.caching import CacheCounters, VersionedCache
+
+
+class ProfileCache(VersionedCache):
+    """
+    Read-through cache of the serialized profile payload served by
+    `AccountService.get_user_profile`. Entries are keyed by user id and a
+    per-user generation that the signals in accounts/signals.py move on
+    whenever the user or profile row changes. A reader takes the generation
+    before it reads the database and stores the payload under it, so a
+    payload read just before a change is stored where nobody looks.
+    """
+    alias = 'profiles'
+    counters = CacheCounters()
+
+    @staticmethod
+    def _generation_key(user_id) -> str:
+        return f"accounts:profile:{user_id}:generation"
+
+    @staticmethod
+    def _key(user_id, generation) -> str:
+        return f"accounts:profile:{user_id}:{generation}"
+
+    @classmethod
+    def generation(cls, user_id) -> int:
+        """The user's current generation; take it before reading the profile to be cached."""
+        generation = cls._get(cls._generation_key(user_id))
+        if generation is None:
+            cls._add(cls._generation_key(user_id), time.time_ns())
+            generation = cls._get(cls._generation_key(user_id))
+        return generation
+
+    @classmethod
+    def get(cls, user_id, generation):
+        payload = cls._get(cls._key(user_id, generation))
+        cls._count("hits" if payload is not None else "misses")
+        return payload
+
+    @classmethod
+    def set(cls, user_id, generation, payload: dict) -> None:
+        cls._set(cls._key(user_id, generation), payload)
+
+    @classmethod
+    def invalidate(cls, user_id) -> None:
+        cls._set(cls._generation_key(user_id), time.time_ns())
+        cls._count("invalidations")
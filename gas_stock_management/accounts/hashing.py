@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when the hashing pool is at its queue limit."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """
+    Bounded thread pool for password hashing. PBKDF2 releases the GIL, so a
+    few threads keep hashing off the event loop without a process pool. At
+    most `workers + max_queue` jobs are admitted; beyond that callers get
+    `PoolSaturated` right away rather than waiting in an unbounded queue.
+    """
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PoolSaturated(self.retry_after)
+
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    async def check_password(self, raw_password: str, encoded: str) -> bool:
+        return await self.run(check_password, raw_password, encoded)
+
+    async def make_password(self, raw_password: str) -> str:
+        return await self.run(make_password, raw_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool() -> HashingPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = getattr(settings, 'PASSWORD_HASHING_POOL', {})
+                _pool = HashingPool(
+                    workers=config.get('WORKERS', 4),
+                    max_queue=config.get('MAX_QUEUE', 32),
+                    retry_after=config.get('RETRY_AFTER', 2),
+                )
+    return _pool
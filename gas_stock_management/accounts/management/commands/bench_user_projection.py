@@ -0,0 +1,67 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import Profile
+from accounts.projections import UserProjection
+from accounts.serializers import UserSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare UserSerializer and UserProjection on generated users (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        for rows in options['rows']:
+            try:
+                with transaction.atomic():
+                    self._run(rows, options['repeat'])
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _run(self, rows: int, repeat: int) -> None:
+        self._seed(rows)
+        queryset = User.objects.select_related('profile').filter(username__startswith='bench_').order_by('id')
+
+        def serializer_path():
+            return UserSerializer(queryset, many=True).data
+
+        def projection_path():
+            return UserProjection.list(queryset)
+
+        serializer_time = self._best(serializer_path, repeat)
+        projection_time = self._best(projection_path, repeat)
+        self.stdout.write(
+            f"{rows:>7} rows  serializer {serializer_time:8.3f}s  projection {projection_time:8.3f}s  "
+            f"speedup x{serializer_time / projection_time:.1f}"
+        )
+
+    def _seed(self, rows: int) -> None:
+        users = [
+            User(username=f"bench_{i}", email=f"bench_{i}@example.com", password='!')
+            for i in range(rows)
+        ]
+        User.objects.bulk_create(users, batch_size=2000)
+        created = User.objects.filter(username__startswith='bench_').values_list('id', flat=True)
+        Profile.objects.bulk_create(
+            [Profile(user_id=user_id, phone_number=f"+25078{user_id:07d}", address='Kigali') for user_id in created],
+            batch_size=2000,
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def _best(func, repeat: int) -> float:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
@@ -0,0 +1,31 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from accounts.services.user_import_service import UserImportService
+
+
+class Command(BaseCommand):
+    help = "Bulk import users and profiles from a CSV or JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSON file, or '-' for stdin")
+        parser.add_argument('--format', choices=['csv', 'json'], help="Defaults to the file extension")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if fmt not in ('csv', 'json'):
+            raise CommandError("Cannot infer format, pass --format csv|json")
+
+        if path == '-':
+            result = UserImportService.import_rows(UserImportService.parse_stream(sys.stdin, fmt))
+        else:
+            with open(path, 'rb') as stream:
+                result = UserImportService.import_rows(UserImportService.parse_stream(stream, fmt))
+
+        for row in result['data']['rows']:
+            if not row['success']:
+                self.stderr.write(f"row {row['row']} ({row['username']}): {'; '.join(row['errors'])}")
+
+        if not result['data'].get('created') and result['status_code'] >= 400:
+            raise CommandError(result['message'])
+        self.stdout.write(self.style.SUCCESS(result['message']))
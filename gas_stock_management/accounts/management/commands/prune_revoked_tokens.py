@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from accounts.revocation import get_revocation_store
+
+
+class Command(BaseCommand):
+    help = "Delete revocation entries whose tokens have expired"
+
+    def handle(self, *args, **options):
+        deleted = get_revocation_store().prune()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} expired revocation entries"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='claims_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
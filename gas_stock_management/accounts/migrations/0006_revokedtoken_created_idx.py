@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_revokedtoken'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='revokedtoken',
+            index=models.Index(fields=['created_at'], name='revoked_token_created_idx'),
+        ),
+    ]
@@ -15,6 +15,35 @@ class Profile(BaseModel):
      profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
      is_verified = models.BooleanField(default=False)
      role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='customer')
+     # Bumped whenever claims stamped into access tokens (role) go stale
+     claims_version = models.PositiveIntegerField(default=1)
+
+     class Meta:
+        indexes = [
+            # Keyset pagination of users by role
+            models.Index(fields=['role', 'id'], name='profile_role_id_idx'),
+        ]
 
      def __str__(self):
         return f"{self.user.username} - {self.role}"
+
+
+class RevokedToken(BaseModel):
+     """
+     A revoked JWT (by `jti`), or with `jti` empty, a cutoff revoking every
+     token issued to `user_id` before `created_at`. Rows are only needed until
+     `expires_at`, after which the tokens they cover have expired anyway.
+     `user_id` is a plain column so revocations outlive a deleted user.
+     """
+     jti = models.CharField(max_length=64, unique=True, null=True, blank=True)
+     user_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+     expires_at = models.DateTimeField(db_index=True)
+
+     class Meta:
+         indexes = [
+             # Incremental sync reads the rows created since the last one seen
+             models.Index(fields=['created_at'], name='revoked_token_created_idx'),
+         ]
+
+     def __str__(self):
+        return self.jti or f"all sessions of user {self.user_id}"
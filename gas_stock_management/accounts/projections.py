@@ -0,0 +1,18 @@
+from accounts.models import Profile
+from gas_stock_management.projections import Column, Projection, file_url
+
+
+class UserProjection(Projection):
+    """Same output as `UserSerializer` (with nested `ProfileSerializer`), built from values()."""
+    fields = {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'profile': {
+            'phone_number': 'profile__phone_number',
+            'address': 'profile__address',
+            'profile_image': Column('profile__profile_image', file_url(Profile, 'profile_image')),
+            'is_verified': 'profile__is_verified',
+            'role': 'profile__role',
+        },
+    }
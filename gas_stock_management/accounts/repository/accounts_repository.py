@@ -1,8 +1,13 @@
 from django.core.exceptions import ValidationError
+from django.db import transaction, IntegrityError
+from django.db.models import Q
 from rest_framework import status
 from django.contrib.auth.models import User
 from accounts.models import Profile
 from gas_stock_management.response import RepositoryResponse
+from gas_stock_management.pagination import (
+    DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, estimate_count, keyset_page
+)
 import re
 
 
@@ -94,6 +99,61 @@ class AccountRepository:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+    @staticmethod
+    def find_taken_identities(usernames, emails, phone_numbers) -> dict:
+        """Return which of the given usernames, emails and phones already exist, in one query."""
+        condition = Q(username__in=usernames) | Q(email__in=emails)
+        if phone_numbers:
+            condition |= Q(profile__phone_number__in=phone_numbers)
+
+        taken = {"usernames": set(), "emails": set(), "phone_numbers": set()}
+        rows = User.objects.filter(condition).values_list('username', 'email', 'profile__phone_number')
+        for username, email, phone_number in rows:
+            taken["usernames"].add(username)
+            taken["emails"].add(email)
+            if phone_number:
+                taken["phone_numbers"].add(phone_number)
+        return taken
+
+    @staticmethod
+    def bulk_create_users(rows: list, created_by_id: int = None) -> RepositoryResponse:
+        """
+        Insert users and their profiles for already validated rows in one transaction.
+        Each row needs username, email, password (hashed), role and phone_number.
+        """
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(username=row['username'], email=row['email'], password=row['password'])
+                    for row in rows
+                ])
+                Profile.objects.bulk_create([
+                    Profile(
+                        user=user,
+                        role=row['role'],
+                        phone_number=row['phone_number'],
+                        created_by_id=created_by_id,
+                    )
+                    for user, row in zip(users, rows)
+                ])
+            return RepositoryResponse(
+                success=True,
+                data={"users": users},
+                status_code=status.HTTP_201_CREATED
+            )
+        except IntegrityError as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_409_CONFLICT
+            )
+        except Exception as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @staticmethod
     def get_user_by_id(user_id: int) -> RepositoryResponse:
      try:
@@ -117,23 +177,66 @@ class AccountRepository:
         )
 
     @staticmethod
-    def get_users_by_role(role: str) -> RepositoryResponse:
+    def users_by_role_queryset(role: str = None):
+        """Users joined with their profiles, optionally filtered by role (not validated)."""
+        users = User.objects.select_related('profile').filter(profile__isnull=False)
+        if role is not None:
+            users = users.filter(profile__role=role)
+        return users
+
+    @staticmethod
+    def get_users_by_role(role: str = None, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                          count: str = None, projection=None) -> RepositoryResponse:
+        """
+        One page of users (with profiles joined in the same query), ordered by
+        profile id and paginated by keyset on the (role, id) index. With a
+        `projection`, users and profiles are returned as its output dicts
+        instead of model instances.
+        """
         try:
-            if role not in dict(Profile.ROLE_CHOICES).keys():
+            if role is not None and role not in dict(Profile.ROLE_CHOICES).keys():
                 return RepositoryResponse(
                     success=False,
                     message="Invalid role",
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
 
-            users = User.objects.filter(profile__role=role).select_related('profile')
-            users_data = [{"user": user, "profile": user.profile} for user in users]
+            users = AccountRepository.users_by_role_queryset(role)
+
+            total = None
+            if count == 'estimate':
+                total = estimate_count(users)
+            elif count == 'exact':
+                total = users.count()
+
+            if cursor:
+                (last_profile_id,) = decode_cursor(cursor)
+                users = users.filter(profile__id__gt=last_profile_id)
+
+            users = users.order_by('profile__id')
+            if projection is None:
+                rows = list(users[:limit + 1])
+                page, next_cursor = keyset_page(rows, limit, lambda user: [user.profile.id])
+                users_data = [{"user": user, "profile": user.profile} for user in page]
+            else:
+                rows = list(users.values_list(*projection.lookups(), 'profile__id')[:limit + 1])
+                page, next_cursor = keyset_page(rows, limit, lambda row: [row[-1]])
+                users_data = []
+                for row in page:
+                    user = projection.build(row)
+                    users_data.append({"user": user, "profile": user['profile']})
 
             return RepositoryResponse(
                 success=True,
-                data={"users": users_data},
+                data={"users": users_data, "next_cursor": next_cursor, "count": total},
                 status_code=status.HTTP_200_OK
             )
+        except (InvalidCursor, ValueError):
+            return RepositoryResponse(
+                success=False,
+                message="Invalid cursor",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return RepositoryResponse(
                 success=False,
@@ -157,8 +260,9 @@ class AccountRepository:
                 profile.phone_number = phone_number
             if address:
                 profile.address = address
-            if role:
+            if role and role != profile.role:
                 profile.role = role
+                profile.claims_version += 1
             if profile_image:
                 profile.profile_image = profile_image
 
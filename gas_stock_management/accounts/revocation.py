@@ -0,0 +1,230 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone as django_timezone
+from rest_framework_simplejwt.settings import api_settings
+from accounts.models import RevokedToken
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationStore:
+    """
+    Answers "is this token revoked?" from process memory. Revoked jtis go into
+    a Bloom filter; only a filter hit (a real revocation or a rare false
+    positive) is confirmed against the `RevokedToken` table, and confirmations
+    are kept in an LRU. Per-user cutoffs ("revoke all sessions") are held in a
+    dict. Other processes' revocations are pulled in every SYNC_INTERVAL
+    seconds by a background thread (see `start`), never on the request
+    path, and expired rows are pruned at most every PRUNE_INTERVAL seconds.
+
+    Each sync reads the rows created since the newest one already seen,
+    less `sync_overlap` seconds. Ids are handed out before commit, so a row
+    can commit after one with a higher id; the overlap also covers clock
+    skew between servers and transactions still open at the last sync.
+
+    Cutoffs compare against the token's whole-second `iat`, so a token issued
+    within the same second as the cutoff stays valid.
+    """
+
+    def __init__(self, sync_interval: float, prune_interval: float, bloom_capacity: int,
+                 bloom_error_rate: float, lru_size: int, sync_overlap: float = 60):
+        self.sync_interval = sync_interval
+        self.sync_overlap = sync_overlap
+        self.prune_interval = prune_interval
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.lru_size = lru_size
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            self._confirmed = OrderedDict()
+            self._user_cutoffs = {}
+            self._synced_until = None
+            self._last_prune = time.monotonic()
+
+    # --- hot path ---
+
+    def is_revoked(self, token) -> bool:
+        cutoff = self._user_cutoffs.get(token.get(api_settings.USER_ID_CLAIM))
+        if cutoff is not None and token.get('iat', 0) < int(cutoff):
+            return True
+
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti is None or jti not in self._bloom:
+            return False
+
+        with self._lock:
+            if jti in self._confirmed:
+                self._confirmed.move_to_end(jti)
+                return self._confirmed[jti]
+
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+        self._remember(jti, revoked)
+        return revoked
+
+    def _remember(self, jti: str, revoked: bool) -> None:
+        with self._lock:
+            self._confirmed[jti] = revoked
+            self._confirmed.move_to_end(jti)
+            while len(self._confirmed) > self.lru_size:
+                self._confirmed.popitem(last=False)
+
+    # --- writes ---
+
+    def revoke(self, token) -> None:
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti is None:
+            return
+        expires_at = datetime.fromtimestamp(token['exp'], tz=timezone.utc)
+        RevokedToken.objects.get_or_create(
+            jti=jti,
+            defaults={"user_id": token.get(api_settings.USER_ID_CLAIM), "expires_at": expires_at},
+        )
+        with self._lock:
+            self._add_jti(jti)
+            self._remember(jti, True)
+        self._maybe_prune()
+
+    def revoke_user(self, user_id: int) -> None:
+        """Revoke every token issued to the user up to now."""
+        now = django_timezone.now()
+        longest = max(api_settings.REFRESH_TOKEN_LIFETIME, api_settings.ACCESS_TOKEN_LIFETIME)
+        row = RevokedToken.objects.create(user_id=user_id, jti=None, expires_at=now + longest)
+        with self._lock:
+            self._add_cutoff(user_id, row.created_at.timestamp())
+        self._maybe_prune()
+
+    def prune(self) -> int:
+        deleted, _ = RevokedToken.objects.filter(expires_at__lt=django_timezone.now()).delete()
+        with self._lock:
+            self._last_prune = time.monotonic()
+        if deleted:
+            self.rebuild()
+        return deleted
+
+    def rebuild(self) -> None:
+        """Reload all unexpired revocations (drops pruned jtis from the filter)."""
+        with self._lock:
+            self.reset()
+            self._sync()
+
+    # --- internals ---
+
+    def _add_jti(self, jti: str) -> None:
+        if self._bloom.count >= self._bloom.capacity:
+            # Grow instead of letting the false-positive rate climb
+            self.bloom_capacity *= 2
+            self._synced_until = None
+            self._bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            self._sync()
+        self._bloom.add(jti)
+
+    def _add_cutoff(self, user_id: int, timestamp: float) -> None:
+        self._user_cutoffs[user_id] = max(self._user_cutoffs.get(user_id, 0), timestamp)
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        rows = RevokedToken.objects.filter(expires_at__gte=django_timezone.now())
+        if self._synced_until is not None:
+            rows = rows.filter(created_at__gte=self._synced_until - timedelta(seconds=self.sync_overlap))
+        for jti, user_id, created_at in rows.values_list('jti', 'user_id', 'created_at'):
+            # Rows inside the overlap come round again; adding them twice would inflate the count
+            if jti and jti not in self._bloom:
+                self._bloom.add(jti)
+            elif not jti and user_id is not None:
+                self._add_cutoff(user_id, created_at.timestamp())
+            if self._synced_until is None or created_at > self._synced_until:
+                self._synced_until = created_at
+        if self._synced_until is None:
+            self._synced_until = django_timezone.now()
+
+    def start(self) -> None:
+        """Sync in a daemon thread every `sync_interval` seconds until `stop`."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sync_forever, name='token-revocation-sync', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _sync_forever(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            try:
+                self.sync()
+            except DatabaseError:
+                # Try again next interval; the revocations are still in the table
+                pass
+            finally:
+                connection.close()
+
+    def _maybe_prune(self) -> None:
+        if time.monotonic() - self._last_prune >= self.prune_interval:
+            self.prune()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_revocation_store() -> RevocationStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = getattr(settings, 'TOKEN_REVOCATION', {})
+                _store = RevocationStore(
+                    sync_interval=config.get('SYNC_INTERVAL', 5),
+                    prune_interval=config.get('PRUNE_INTERVAL', 60 * 60),
+                    bloom_capacity=config.get('BLOOM_CAPACITY', 100_000),
+                    bloom_error_rate=config.get('BLOOM_ERROR_RATE', 0.001),
+                    lru_size=config.get('LRU_SIZE', 10_000),
+                    sync_overlap=config.get('SYNC_OVERLAP', 60),
+                )
+                # Load what is revoked now, then keep up from the background
+                _store.rebuild()
+                _store.start()
+    return _store
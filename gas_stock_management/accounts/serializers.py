@@ -1,7 +1,13 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 from .models import Profile
+from .revocation import get_revocation_store
+from .tokens import stamp_role_claims
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -34,18 +40,23 @@ class RegisterSerializer(serializers.ModelSerializer):
     
         
         # Create user (this will trigger the signal to create a profile)
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()  # Signal creates profile here
+        hashed_password = self.context.get('hashed_password')
+        if hashed_password:
+            # Already hashed off the request thread by the async register view
+            validated_data['email'] = User.objects.normalize_email(validated_data.get('email', ''))
+            user = User(password=hashed_password, **validated_data)
+            user.save()
+        else:
+            user = User.objects.create_user(password=password, **validated_data)
         
-        # Update the profile's role
+        # Update the profile's role; only changed columns are written
         profile = user.profile
         profile.role = role
         if phone_number:
             profile.phone_number = phone_number 
         # if address:
         #     profile.address = address
-        user.profile.save()
+        profile.save()
         
         return user
 
@@ -67,3 +78,47 @@ def validate(self, data):
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True)
     new_password = serializers.CharField(required=True)
+
+    def validate_old_password(self, value):
+        user = self.context.get('user')
+        if user is not None and not user.check_password(value):
+            raise serializers.ValidationError("Old password is incorrect.")
+        return value
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return stamp_role_claims(super().get_token(user), user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        store = get_revocation_store()
+        if store.is_revoked(refresh):
+            raise AuthenticationFailed("Token has been revoked", "token_revoked")
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.select_related('profile').filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+
+        # Re-stamp so refreshed access tokens carry the current role
+        stamp_role_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # The old refresh token must not be usable after rotation
+            store.revoke(refresh)
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
@@ -7,11 +7,16 @@ from accounts.serializers import (
     ChangePasswordSerializer,
 )
 from gas_stock_management.response import RepositoryResponse, APIResponse
+from gas_stock_management.pagination import DEFAULT_PAGE_SIZE
+from gas_stock_management.streaming import streaming_queryset_response
 from rest_framework import status
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 import re
-from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.tokens import tokens_for_user
+from accounts.cache import ProfileCache
+from accounts.projections import UserProjection
+from accounts.revocation import get_revocation_store
 
 
 class AccountService:
@@ -59,7 +64,7 @@ class AccountService:
                 password=serializer.validated_data['password']
             )
             if user:
-                refresh = RefreshToken.for_user(user)
+                refresh = tokens_for_user(user)
                 return {
                     "success": True,
                     "message": "Login successful",
@@ -87,28 +92,30 @@ class AccountService:
 
     @staticmethod
     def get_user_profile(user_id: int):
-        repo_response = AccountRepository.get_user_by_id(user_id)
-        
-        if repo_response.success:
-            # Serialize the user and profile
-            user_data = UserSerializer(repo_response.data['user']).data
-            profile_data = ProfileSerializer(repo_response.data['profile']).data
+        generation = ProfileCache.generation(user_id)
+        payload = ProfileCache.get(user_id, generation)
+        if payload is None:
+            repo_response = AccountRepository.get_user_by_id(user_id)
+            if not repo_response.success:
+                return {
+                    "success": False,
+                    "message": "User not found",
+                    "data": {},
+                    "status_code": status.HTTP_404_NOT_FOUND
+                }
 
-            return {
-                "success": True,
-                "message": "User profile retrieved successfully",
-                "data": {
-                    "user": user_data,
-                    "profile": profile_data
-                },
-                "status_code": status.HTTP_200_OK
+            # Serialize the user and profile
+            payload = {
+                "user": UserSerializer(repo_response.data['user']).data,
+                "profile": ProfileSerializer(repo_response.data['profile']).data
             }
-        
+            ProfileCache.set(user_id, generation, payload)
+
         return {
-            "success": False,
-            "message": "User not found",
-            "data": {},
-            "status_code": status.HTTP_404_NOT_FOUND
+            "success": True,
+            "message": "User profile retrieved successfully",
+            "data": payload,
+            "status_code": status.HTTP_200_OK
         }
 
     @staticmethod
@@ -139,6 +146,8 @@ class AccountService:
     @staticmethod
     def delete_user(user_id: int):
         repo_response = AccountRepository.delete_user_by_id(user_id)
+        if repo_response.success:
+            get_revocation_store().revoke_user(user_id)
         return {
             "success": repo_response.success,
             "message": repo_response.message or (
@@ -149,8 +158,11 @@ class AccountService:
         }
 
     @staticmethod
-    def get_users_by_role(role: str):
-        repo_response = AccountRepository.get_users_by_role(role)
+    def get_users_by_role(role: str = None, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE,
+                          count: str = None):
+        repo_response = AccountRepository.get_users_by_role(
+            role, cursor=cursor, limit=limit, count=count, projection=UserProjection
+        )
         
         if not repo_response.success:
             return {
@@ -160,29 +172,53 @@ class AccountService:
                 "status_code": repo_response.status_code
             }
         
-        # The repository returns {"user": user_obj, "profile": profile_obj} for each user
-        serialized_users = []
-        for user_data in repo_response.data['users']:
-            serialized_users.append({
-                'user': UserSerializer(user_data['user']).data,
-                'profile': ProfileSerializer(user_data['profile']).data
-            })
-        
+        # UserProjection rows are already shaped like UserSerializer/ProfileSerializer output
+        data = {
+            "users": repo_response.data['users'],
+            "next_cursor": repo_response.data['next_cursor']
+        }
+        if repo_response.data['count'] is not None:
+            data["count"] = repo_response.data['count']
+
         return {
             "success": True,
             "message": "Users retrieved successfully",
-            "data": {
-                "users": serialized_users
-            },
+            "data": data,
             "status_code": status.HTTP_200_OK
         }
 
+    @staticmethod
+    def _user_item(row: tuple) -> dict:
+        user = UserProjection.build(row)
+        return {'user': user, 'profile': user['profile']}
+
+    @staticmethod
+    def stream_users_by_role(request, role: str = None):
+        """All users of a role as a streamed JSON response; an error dict for an invalid role."""
+        if role is not None and not AccountRepository._is_valid_role(role):
+            return {
+                "success": False,
+                "message": "Invalid role",
+                "data": {},
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+
+        users = AccountRepository.users_by_role_queryset(role).order_by('profile__id')
+        return streaming_queryset_response(
+            request,
+            users.values_list(*UserProjection.lookups()),
+            AccountService._user_item,
+            key="users",
+            message="Users retrieved successfully"
+        )
+
     @staticmethod
     def change_password(user: User, data: dict):
         serializer = ChangePasswordSerializer(data=data, context={"user": user})
         if serializer.is_valid():
             user.set_password(serializer.validated_data['new_password'])
             user.save()
+            get_revocation_store().revoke_user(user.id)
             return {
                 "success": True,
                 "message": "Password changed successfully",
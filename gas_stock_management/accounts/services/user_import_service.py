@@ -0,0 +1,137 @@
+import csv
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from rest_framework import status
+from accounts.repository.accounts_repository import AccountRepository
+from gas_stock_management.uploads import parse_rows
+
+IMPORT_FIELDS = ('username', 'email', 'password', 'role', 'phone_number')
+
+
+class UserImportService:
+    """
+    Creates users in bulk from CSV or JSON input. Rows are processed in chunks:
+    each chunk costs one uniqueness query and one transaction with two
+    bulk INSERTs, and passwords are hashed on a thread pool.
+    """
+
+    @staticmethod
+    def _chunk_size() -> int:
+        return getattr(settings, 'ACCOUNTS_IMPORT_CHUNK_SIZE', 500)
+
+    @staticmethod
+    def _hash_workers() -> int:
+        return getattr(settings, 'ACCOUNTS_IMPORT_HASH_WORKERS', 4)
+
+    @staticmethod
+    def parse_stream(stream, fmt: str):
+        """Yield row dicts from a text or binary stream in `csv` or `json` format."""
+        yield from parse_rows(stream, fmt, 'users')
+
+    @staticmethod
+    def _clean_row(raw) -> tuple:
+        if not isinstance(raw, dict):
+            return None, ["Row must be an object"]
+
+        row = {field: (str(raw.get(field) or '')).strip() for field in IMPORT_FIELDS}
+        row['role'] = row['role'] or 'customer'
+        row['phone_number'] = row['phone_number'] or None
+
+        errors = []
+        for field in ('username', 'email', 'password'):
+            if not row[field]:
+                errors.append(f"{field} is required")
+        if row['email']:
+            try:
+                validate_email(row['email'])
+            except ValidationError:
+                errors.append("Invalid email")
+        if not AccountRepository._is_valid_role(row['role']):
+            errors.append("Invalid role")
+        if row['phone_number'] and not AccountRepository._validate_phone_number(row['phone_number']):
+            errors.append("Invalid phone number format")
+        return row, errors
+
+    @staticmethod
+    def _import_chunk(chunk: list, pool: ThreadPoolExecutor, created_by_id: int = None) -> list:
+        results = []
+        valid = []
+        for index, raw in chunk:
+            row, errors = UserImportService._clean_row(raw)
+            results.append({"row": index, "username": (row or {}).get('username'), "errors": errors})
+            if not errors:
+                valid.append((results[-1], row))
+
+        taken = AccountRepository.find_taken_identities(
+            usernames={row['username'] for _, row in valid},
+            emails={row['email'] for _, row in valid},
+            phone_numbers={row['phone_number'] for _, row in valid if row['phone_number']},
+        )
+
+        # Rows claim identities in order, so duplicates within the file are caught too
+        accepted = []
+        for result, row in valid:
+            if row['username'] in taken['usernames']:
+                result['errors'].append("Username already exists")
+            if row['email'] in taken['emails']:
+                result['errors'].append("Email already exists")
+            if row['phone_number'] and row['phone_number'] in taken['phone_numbers']:
+                result['errors'].append("Phone number already exists")
+            if result['errors']:
+                continue
+            taken['usernames'].add(row['username'])
+            taken['emails'].add(row['email'])
+            if row['phone_number']:
+                taken['phone_numbers'].add(row['phone_number'])
+            accepted.append((result, row))
+
+        if accepted:
+            hashed = pool.map(make_password, [row['password'] for _, row in accepted])
+            for (_, row), password in zip(accepted, hashed):
+                row['password'] = password
+
+            repo_response = AccountRepository.bulk_create_users(
+                [row for _, row in accepted], created_by_id=created_by_id
+            )
+            for (result, _), user in zip(accepted, (repo_response.data or {}).get('users', [])):
+                result['id'] = user.id
+            if not repo_response.success:
+                for result, _ in accepted:
+                    result['errors'].append(repo_response.message)
+
+        for result in results:
+            result['success'] = not result['errors']
+        return results
+
+    @staticmethod
+    def import_rows(rows, created_by_id: int = None) -> dict:
+        chunk_size = UserImportService._chunk_size()
+        numbered = enumerate(rows, start=1)
+        report = []
+        try:
+            with ThreadPoolExecutor(max_workers=UserImportService._hash_workers()) as pool:
+                while chunk := list(islice(numbered, chunk_size)):
+                    report.extend(UserImportService._import_chunk(chunk, pool, created_by_id))
+        except (ValueError, csv.Error, UnicodeDecodeError) as e:
+            return {
+                "success": False,
+                "message": f"Could not parse input: {e}",
+                "data": {"rows": report},
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+
+        created = sum(1 for result in report if result['success'])
+        return {
+            "success": created == len(report),
+            "message": f"Imported {created} of {len(report)} users",
+            "data": {
+                "created": created,
+                "failed": len(report) - created,
+                "rows": report
+            },
+            "status_code": status.HTTP_200_OK
+        }
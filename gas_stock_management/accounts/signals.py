@@ -1,11 +1,63 @@
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from .models import Profile
+from .tokens import set_profile_version, clear_profile_version
+from .cache import ProfileCache
+
+# User fields stamped into access tokens; changing one invalidates the claims
+CLAIMED_USER_FIELDS = ('is_active', 'is_staff')
+
+
+@receiver(pre_save, sender=User)
+def detect_claims_change(sender, instance, update_fields=None, **kwargs):
+    instance._claims_changed = False
+    if instance._state.adding or (update_fields is not None and not set(CLAIMED_USER_FIELDS) & set(update_fields)):
+        return
+    stored = User.objects.filter(pk=instance.pk).values_list(*CLAIMED_USER_FIELDS).first()
+    instance._claims_changed = stored is not None and stored != tuple(
+        getattr(instance, field) for field in CLAIMED_USER_FIELDS
+    )
+
 
 @receiver(post_save, sender=User)
 def create_or_update_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
-    else:
-        instance.profile.save()
+        return
+
+    # Only a profile already loaded on this user can carry unsaved edits, and
+    # BaseModel.save() is a no-op unless one of its fields actually changed.
+    profile = User.profile.related.get_cached_value(instance, default=None)
+    if getattr(instance, '_claims_changed', False):
+        # Deactivation or a staff change must not be served from old tokens' claims
+        if profile is not None:
+            profile.claims_version += 1
+        else:
+            Profile.objects.filter(user_id=instance.pk).update(claims_version=F('claims_version') + 1)
+            clear_profile_version(instance.pk)
+    if profile is not None:
+        profile.save()
+
+
+@receiver(post_save, sender=Profile)
+def sync_profile_version(sender, instance, **kwargs):
+    set_profile_version(instance.user_id, instance.claims_version)
+
+
+@receiver(post_delete, sender=Profile)
+def drop_profile_version(sender, instance, **kwargs):
+    clear_profile_version(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_profile(sender, instance, **kwargs):
+    ProfileCache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    ProfileCache.invalidate(instance.user_id)
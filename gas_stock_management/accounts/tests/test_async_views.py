@@ -0,0 +1,94 @@
+import threading
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from accounts.hashing import HashingPool
+from accounts.tokens import tokens_for_user
+
+
+class AsyncAuthViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='manager1',
+            email='manager1@test.com',
+            password='managerpass'
+        )
+        self.pool = HashingPool(workers=2, max_queue=2, retry_after=3)
+        patcher = mock.patch('accounts.async_views.get_hashing_pool', return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.pool.shutdown)
+
+    async def test_async_login(self):
+        response = await self.async_client.post(
+            reverse('async-login'),
+            {"username": "manager1", "password": "managerpass"},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertIn('access', body)
+        self.assertEqual(body['user']['username'], 'manager1')
+
+    async def test_async_login_invalid_credentials(self):
+        for username in ('manager1', 'nobody'):
+            response = await self.async_client.post(
+                reverse('async-login'),
+                {"username": username, "password": "wrongpass"},
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_async_register(self):
+        response = await self.async_client.post(
+            reverse('async-register'),
+            {"username": "newuser", "email": "new@test.com", "password": "testpass123", "role": "delivery"},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = await User.objects.select_related('profile').aget(username='newuser')
+        self.assertEqual(user.profile.role, 'delivery')
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_async_change_password(self):
+        access = str(tokens_for_user(self.user).access_token)
+        url = reverse('async-change-password')
+
+        response = self.client.post(
+            url, {"old_password": "wrongpass", "new_password": "newpass123"},
+            content_type='application/json', HTTP_AUTHORIZATION=f"Bearer {access}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            url, {"old_password": "managerpass", "new_password": "newpass123"},
+            content_type='application/json', HTTP_AUTHORIZATION=f"Bearer {access}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('newpass123'))
+
+    def test_async_change_password_requires_token(self):
+        response = self.client.post(
+            reverse('async-change-password'),
+            {"old_password": "managerpass", "new_password": "newpass123"},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_saturated_pool_returns_503(self):
+        release = threading.Event()
+        for _ in range(4):
+            self.pool.submit(release.wait)
+        self.addCleanup(release.set)
+
+        response = self.client.post(
+            reverse('async-login'),
+            {"username": "manager1", "password": "managerpass"},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertEqual(self.pool.stats()['rejected'], 1)
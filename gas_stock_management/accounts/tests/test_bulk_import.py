@@ -0,0 +1,103 @@
+import os
+import tempfile
+from io import StringIO
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.models import Profile
+from accounts.services.user_import_service import UserImportService
+
+CSV_HEADER = "username,email,password,role,phone_number\n"
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@test.com',
+            password='adminpass'
+        )
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+
+        self.existing = User.objects.create_user(
+            username='existing',
+            email='existing@test.com',
+            password='existingpass'
+        )
+        self.existing.profile.phone_number = '+250788000000'
+        self.existing.profile.save()
+
+    def test_import_rows_reports_per_row_errors(self):
+        rows = [
+            {"username": "driver1", "email": "d1@test.com", "password": "pass1234", "role": "delivery"},
+            {"username": "existing", "email": "new@test.com", "password": "pass1234"},
+            {"username": "cust1", "email": "c1@test.com", "password": "pass1234", "phone_number": "+250788000000"},
+            {"username": "driver1", "email": "d1b@test.com", "password": "pass1234"},
+            {"username": "cust2", "email": "c2@test.com", "password": "pass1234", "role": "owner"},
+            {"username": "cust3", "email": "not-an-email", "password": ""},
+        ]
+        response = UserImportService.import_rows(rows)
+
+        self.assertEqual(response['status_code'], status.HTTP_200_OK)
+        self.assertEqual(response['data']['created'], 1)
+        report = {row['row']: row for row in response['data']['rows']}
+        self.assertTrue(report[1]['success'])
+        self.assertIn("Username already exists", report[2]['errors'])
+        self.assertIn("Phone number already exists", report[3]['errors'])
+        self.assertIn("Username already exists", report[4]['errors'])
+        self.assertIn("Invalid role", report[5]['errors'])
+        self.assertIn("Invalid email", report[6]['errors'])
+        self.assertIn("password is required", report[6]['errors'])
+
+        user = User.objects.get(username='driver1')
+        self.assertEqual(user.profile.role, 'delivery')
+        self.assertTrue(user.check_password('pass1234'))
+
+    @override_settings(ACCOUNTS_IMPORT_CHUNK_SIZE=50)
+    def test_query_count_is_per_chunk(self):
+        rows = [
+            {"username": f"bulk{i}", "email": f"bulk{i}@test.com", "password": "pass1234"}
+            for i in range(100)
+        ]
+        # Per chunk: uniqueness lookup, savepoint, user insert, profile insert, release
+        with self.assertNumQueries(10):
+            response = UserImportService.import_rows(rows)
+
+        self.assertEqual(response['data']['created'], 100)
+        self.assertEqual(Profile.objects.filter(user__username__startswith='bulk').count(), 100)
+
+    def test_csv_upload_endpoint(self):
+        self.client.force_authenticate(user=self.admin)
+        upload = SimpleUploadedFile(
+            "users.csv",
+            (CSV_HEADER + "csvuser,csv@test.com,pass1234,manager,+250788111111\n").encode(),
+            content_type="text/csv"
+        )
+        response = self.client.post(reverse('users-import'), {"file": upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['created'], 1)
+        self.assertEqual(User.objects.get(username='csvuser').profile.created_by, self.admin)
+
+    def test_endpoint_requires_admin(self):
+        self.client.force_authenticate(user=self.existing)
+        response = self.client.post(reverse('users-import'), [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as handle:
+            handle.write('[{"username": "cmd1", "email": "cmd1@test.com", "password": "pass1234"}]')
+        self.addCleanup(os.remove, handle.name)
+
+        out = StringIO()
+        call_command('import_users', handle.name, stdout=out, stderr=StringIO())
+
+        self.assertIn("Imported 1 of 1 users", out.getvalue())
+        self.assertTrue(User.objects.filter(username='cmd1').exists())
@@ -0,0 +1,87 @@
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from accounts.models import Profile
+from accounts.serializers import RegisterSerializer
+
+
+def _writes(queries):
+    return [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+
+class DirtyFieldTrackingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='customer1',
+            email='customer1@test.com',
+            password='customerpass'
+        )
+        self.profile = Profile.objects.get(user=self.user)
+
+    def test_unchanged_save_is_skipped(self):
+        self.assertFalse(self.profile.is_dirty())
+        with self.assertNumQueries(0):
+            self.profile.save()
+
+    def test_save_writes_only_changed_columns(self):
+        self.profile.address = 'Kigali'
+        self.assertEqual(self.profile.get_dirty_fields(), ['address'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.profile.save()
+
+        (update,) = _writes(ctx.captured_queries)
+        self.assertIn('"address"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"role"', update)
+        self.assertFalse(self.profile.is_dirty())
+        self.assertEqual(Profile.objects.get(pk=self.profile.pk).address, 'Kigali')
+
+    def test_explicit_update_fields_keeps_other_edits_dirty(self):
+        self.profile.address = 'Kigali'
+        self.profile.role = 'manager'
+        self.profile.save(update_fields=['address'])
+
+        self.assertEqual(self.profile.get_dirty_fields(), ['role'])
+
+    def test_loading_a_deferred_field_keeps_pending_edits(self):
+        profile = Profile.objects.only('id', 'address').get(pk=self.profile.pk)
+        profile.address = 'Huye'
+        self.assertEqual(profile.role, self.profile.role)
+        self.assertEqual(profile.get_dirty_fields(), ['address'])
+        profile.save()
+
+        self.assertEqual(Profile.objects.get(pk=self.profile.pk).address, 'Huye')
+
+    def test_user_save_does_not_touch_profile(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Alice'
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+
+        writes = _writes(ctx.captured_queries)
+        self.assertEqual(len(writes), 1)
+        self.assertIn('auth_user', writes[0])
+
+    def test_profile_edit_through_user_save_is_persisted(self):
+        self.user.profile.phone_number = '+250788123456'
+        self.user.save()
+
+        self.assertEqual(Profile.objects.get(user=self.user).phone_number, '+250788123456')
+
+    def test_register_issues_minimal_writes(self):
+        serializer = RegisterSerializer(data={
+            'username': 'newuser',
+            'email': 'new@test.com',
+            'password': 'testpass123',
+            'role': 'manager'
+        })
+        self.assertTrue(serializer.is_valid())
+
+        with CaptureQueriesContext(connection) as ctx:
+            serializer.save()
+
+        # INSERT user, INSERT profile, UPDATE profile role
+        self.assertEqual(len(_writes(ctx.captured_queries)), 3)
+        self.assertEqual(Profile.objects.get(user__username='newuser').role, 'manager')
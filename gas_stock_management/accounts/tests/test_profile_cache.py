@@ -0,0 +1,82 @@
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.cache import ProfileCache
+from accounts.models import Profile
+from accounts.repository.accounts_repository import AccountRepository
+from accounts.services.accounts_services import AccountService
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        caches['profiles'].clear()
+        ProfileCache.reset_stats()
+        self.client = APIClient()
+        self.customer = User.objects.create_user(
+            username='customer1',
+            email='customer1@test.com',
+            password='customerpass'
+        )
+
+    def test_second_read_is_served_from_cache(self):
+        first = AccountService.get_user_profile(self.customer.id)
+
+        with self.assertNumQueries(0):
+            second = AccountService.get_user_profile(self.customer.id)
+
+        self.assertEqual(first['data'], second['data'])
+        stats = ProfileCache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_profile_update_invalidates(self):
+        AccountService.get_user_profile(self.customer.id)
+        AccountService.update_profile(self.customer.id, {"address": "Kigali"})
+
+        response = AccountService.get_user_profile(self.customer.id)
+        self.assertEqual(response['data']['profile']['address'], 'Kigali')
+
+    def test_user_update_and_delete_invalidate(self):
+        AccountService.get_user_profile(self.customer.id)
+        self.customer.email = 'changed@test.com'
+        self.customer.save()
+
+        response = AccountService.get_user_profile(self.customer.id)
+        self.assertEqual(response['data']['user']['email'], 'changed@test.com')
+
+        self.customer.delete()
+        response = AccountService.get_user_profile(response['data']['user']['id'])
+        self.assertEqual(response['status_code'], status.HTTP_404_NOT_FOUND)
+
+    def test_change_during_a_read_is_not_cached(self):
+        original = AccountRepository.get_user_by_id
+
+        def get_user_by_id(user_id):
+            response = original(user_id)
+            # Another request saves the profile after this one read it, before it is cached
+            profile = Profile.objects.get(user_id=user_id)
+            profile.address = 'Kigali'
+            profile.save()
+            return response
+
+        with mock.patch.object(AccountRepository, 'get_user_by_id', side_effect=get_user_by_id):
+            stale = AccountService.get_user_profile(self.customer.id)
+        self.assertNotEqual(stale['data']['profile']['address'], 'Kigali')
+
+        response = AccountService.get_user_profile(self.customer.id)
+        self.assertEqual(response['data']['profile']['address'], 'Kigali')
+
+    def test_stats_endpoint_requires_admin(self):
+        url = reverse('profile-cache-stats')
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_superuser(username='admin', email='admin@test.com', password='adminpass')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hit_ratio', response.data['data'])
@@ -0,0 +1,37 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from accounts.projections import UserProjection
+from accounts.serializers import UserSerializer
+
+
+class UserProjectionTests(TestCase):
+    def setUp(self):
+        plain = User.objects.create_user(username='plain', email='plain@test.com', password='pass123')
+
+        full = User.objects.create_user(username='full', email='full@test.com', password='pass123')
+        full.profile.phone_number = '+250788123456'
+        full.profile.address = 'Kigali'
+        full.profile.profile_image = 'profile_images/full.png'
+        full.profile.is_verified = True
+        full.profile.role = 'manager'
+        full.profile.save()
+
+        self.users = User.objects.select_related('profile').filter(id__in=[plain.id, full.id]).order_by('id')
+
+    def test_output_matches_user_serializer(self):
+        expected = [dict(UserSerializer(user).data) for user in self.users]
+        for item in expected:
+            item['profile'] = dict(item['profile'])
+
+        self.assertEqual(UserProjection.list(self.users), expected)
+        self.assertEqual(list(UserProjection.iterate(self.users)), expected)
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            UserProjection.list(User.objects.filter(profile__isnull=False))
+
+    def test_lookups(self):
+        self.assertEqual(UserProjection.lookups(), [
+            'id', 'username', 'email', 'profile__phone_number', 'profile__address',
+            'profile__profile_image', 'profile__is_verified', 'profile__role',
+        ])
@@ -106,6 +106,26 @@ class AccountRepositoryTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.message, "Invalid role")
 
+    def test_get_users_by_role_keyset_pages(self):
+        for i in range(2, 6):
+            User.objects.create_user(username=f'customer{i}', email=f'c{i}@test.com', password='testpass')
+
+        first = AccountRepository.get_users_by_role('customer', limit=3, count='exact')
+        self.assertEqual([u['user'].username for u in first.data['users']], ['customer1', 'customer2', 'customer3'])
+        self.assertEqual(first.data['count'], 5)
+
+        with self.assertNumQueries(1):
+            second = AccountRepository.get_users_by_role('customer', cursor=first.data['next_cursor'], limit=3)
+            usernames = [u['profile'].user.username for u in second.data['users']]
+        self.assertEqual(usernames, ['customer4', 'customer5'])
+        self.assertIsNone(second.data['next_cursor'])
+
+    def test_get_users_invalid_cursor(self):
+        response = AccountRepository.get_users_by_role('customer', cursor='not-a-cursor')
+
+        self.assertFalse(response.success)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     # # === UPDATE PROFILE TESTS ===
     def test_update_profile_success(self):
         response = AccountRepository.update_profile(
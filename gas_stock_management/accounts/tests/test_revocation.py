@@ -0,0 +1,157 @@
+import time
+from io import StringIO
+from unittest import mock
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.models import RevokedToken
+from accounts.revocation import BloomFilter, RevocationStore, get_revocation_store
+from accounts.tokens import tokens_for_user
+
+
+class BloomFilterTests(TestCase):
+    def test_membership_and_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.store = get_revocation_store()
+        self.store.rebuild()
+        self.addCleanup(self.store.reset)
+        self.user = User.objects.create_user(
+            username='customer1',
+            email='customer1@test.com',
+            password='customerpass'
+        )
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@test.com',
+            password='adminpass'
+        )
+        self.profile_url = reverse('my-profile')
+
+    def _use(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return self.client.get(self.profile_url)
+
+    def test_logout_revokes_access_and_refresh_tokens(self):
+        refresh = tokens_for_user(self.user)
+        access = str(refresh.access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = self.client.post(reverse('logout'), {"refresh": str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._use(access).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        response = self.client.post(reverse('token_refresh'), {"refresh": str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_with_a_list_body_still_revokes_the_access_token(self):
+        access = str(tokens_for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = self.client.post(reverse('logout'), [{"refresh": 'x'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._use(access).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrevoked_token_check_runs_no_query(self):
+        access = tokens_for_user(self.user).access_token
+        self.store.revoke(tokens_for_user(self.admin).access_token)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(self.store.is_revoked(access))
+
+    def test_refresh_rotation_revokes_old_refresh_token(self):
+        refresh = str(tokens_for_user(self.user))
+        url = reverse('token_refresh')
+
+        first = self.client.post(url, {"refresh": refresh}, format='json')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(first.data['refresh'], refresh)
+
+        replay = self.client.post(url, {"refresh": refresh}, format='json')
+        self.assertEqual(replay.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            self.client.post(url, {"refresh": first.data['refresh']}, format='json').status_code,
+            status.HTTP_200_OK
+        )
+
+    def test_revoke_user_covers_earlier_tokens(self):
+        access = tokens_for_user(self.user).access_token
+        access['iat'] -= 5
+
+        self.store.revoke_user(self.user.id)
+
+        self.assertTrue(self.store.is_revoked(access))
+        self.assertEqual(self._use(str(access)).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_delete_user_revokes_sessions(self):
+        self.client.force_authenticate(user=self.admin)
+        self.client.delete(reverse('delete-user', kwargs={"user_id": self.user.id}))
+
+        self.assertTrue(RevokedToken.objects.filter(user_id=self.user.id, jti__isnull=True).exists())
+
+    def _other_process(self) -> RevocationStore:
+        other = RevocationStore(sync_interval=5, prune_interval=3600, bloom_capacity=100,
+                                bloom_error_rate=0.01, lru_size=10, sync_overlap=60)
+        other.sync()
+        return other
+
+    def test_other_process_revocations_are_synced(self):
+        other = self._other_process()
+        access = tokens_for_user(self.user).access_token
+        self.store.revoke(access)
+
+        # Checks never query on their own; the background sync picks the row up
+        with self.assertNumQueries(0):
+            self.assertFalse(other.is_revoked(tokens_for_user(self.admin).access_token))
+        other.sync()
+        self.assertTrue(other.is_revoked(access))
+
+    def test_rows_committed_out_of_id_order_are_not_skipped(self):
+        other = self._other_process()
+        late = tokens_for_user(self.user).access_token
+        early = tokens_for_user(self.admin).access_token
+        # `late` got the lower id but only committed after `early` had been synced
+        RevokedToken.objects.create(id=1000, jti=early['jti'], expires_at=timezone.now() + timedelta(minutes=5))
+        other.sync()
+        RevokedToken.objects.create(id=500, jti=late['jti'], expires_at=timezone.now() + timedelta(minutes=5))
+
+        other.sync()
+        self.assertTrue(other.is_revoked(late))
+        self.assertTrue(other.is_revoked(early))
+
+    def test_background_sync_runs_until_stopped(self):
+        other = RevocationStore(sync_interval=0.01, prune_interval=3600, bloom_capacity=100,
+                                bloom_error_rate=0.01, lru_size=10)
+        with mock.patch.object(other, 'sync') as sync, mock.patch('accounts.revocation.connection.close'):
+            other.start()
+            deadline = time.monotonic() + 5
+            while sync.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            other.stop()
+        self.assertGreaterEqual(sync.call_count, 2)
+
+    def test_prune_removes_expired_entries(self):
+        RevokedToken.objects.create(jti='expired', expires_at=timezone.now() - timedelta(minutes=1))
+        RevokedToken.objects.create(jti='live', expires_at=timezone.now() + timedelta(minutes=1))
+
+        call_command('prune_revoked_tokens', stdout=StringIO())
+
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
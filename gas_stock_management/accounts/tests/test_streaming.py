@@ -0,0 +1,68 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from gas_stock_management.streaming import stream_json
+
+
+class StreamingUsersTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@test.com',
+            password='adminpass'
+        )
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+        for i in range(7):
+            User.objects.create_user(username=f'customer{i}', email=f'c{i}@test.com', password='pass123')
+        self.url = reverse('users-by-role')
+
+    def test_stream_json_chunks_form_valid_envelope(self):
+        chunks = list(stream_json(range(5), lambda n: {"n": n}, key="items", message="ok", chunk_size=2))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(json.loads(b''.join(chunks)), {
+            "success": True,
+            "data": {"items": [{"n": n} for n in range(5)]},
+            "message": "ok"
+        })
+
+    def test_stream_json_empty(self):
+        body = json.loads(b''.join(stream_json([], lambda n: n, key="items", message="ok")))
+        self.assertEqual(body['data'], {"items": []})
+
+    def test_streamed_users_under_wsgi(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"role": "customer", "stream": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        # A single query streams every row
+        with self.assertNumQueries(1):
+            body = json.loads(b''.join(response.streaming_content))
+        self.assertTrue(body['success'])
+        usernames = [item['user']['username'] for item in body['data']['users']]
+        self.assertEqual(usernames, [f'customer{i}' for i in range(7)])
+
+    def test_streamed_users_invalid_role(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"role": "owner", "stream": "true"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_streamed_users_under_asgi(self):
+        from accounts.tokens import tokens_for_user
+        from asgiref.sync import sync_to_async
+
+        access = await sync_to_async(lambda: str(tokens_for_user(self.admin).access_token))()
+        response = await self.async_client.get(
+            self.url, {"role": "customer", "stream": "1"}, headers={"Authorization": f"Bearer {access}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        body = json.loads(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual(len(body['data']['users']), 7)
@@ -0,0 +1,85 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.throttling import get_login_limiter
+
+THROTTLE = {
+    'USERNAME_RATE': (3, 60),
+    'IP_RATE': (5, 60),
+    'MODE': 'reject',
+}
+
+
+@override_settings(LOGIN_THROTTLE=THROTTLE)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='customer1',
+            email='customer1@test.com',
+            password='customerpass'
+        )
+        self.login_url = reverse('login')
+
+    def _login(self, username='customer1', password='wrongpass', url=None, ip='10.0.0.1'):
+        return self.client.post(url or self.login_url, {"username": username, "password": password},
+                                format='json', REMOTE_ADDR=ip)
+
+    def test_username_limit_rejects_before_hashing(self):
+        for _ in range(3):
+            self.assertEqual(self._login().status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with mock.patch('accounts.services.accounts_services.authenticate') as authenticate:
+            response = self._login(password='customerpass')
+        authenticate.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_ip_limit_spans_usernames(self):
+        for i in range(5):
+            self._login(username=f'user{i}')
+
+        self.assertEqual(self._login(username='other').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self._login(username='other', ip='10.0.0.2').status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_successful_logins_are_not_counted(self):
+        for _ in range(5):
+            response = self._login(password='customerpass', ip='10.0.0.3')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_token_endpoint_is_throttled(self):
+        url = reverse('token_obtain_pair')
+        for _ in range(3):
+            self._login(url=url)
+        self.assertEqual(self._login(url=url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_metrics(self):
+        for _ in range(4):
+            self._login()
+
+        self.assertEqual(get_login_limiter().metrics(), {"accepted": 3, "delayed": 0, "rejected": 1})
+
+    @override_settings(LOGIN_THROTTLE={**THROTTLE, 'MODE': 'delay', 'DELAY_AFTER': 1, 'BASE_DELAY': 0.5})
+    def test_progressive_delay(self):
+        limiter = get_login_limiter()
+        delays = [limiter.attempt('customer1', '10.0.0.4').delay for _ in range(3)]
+
+        self.assertEqual(delays, [0.0, 0.5, 1.0])
+        self.assertFalse(limiter.attempt('customer1', '10.0.0.4').allowed)
+
+    @override_settings(LOGIN_THROTTLE={**THROTTLE, 'MODE': 'delay', 'DELAY_AFTER': 1, 'BASE_DELAY': 30})
+    def test_sync_views_do_not_sleep_in_delay_mode(self):
+        with mock.patch('time.sleep') as sleep:
+            for url in (self.login_url, reverse('token_obtain_pair')):
+                self.assertEqual(self._login(url=url).status_code, status.HTTP_401_UNAUTHORIZED)
+        sleep.assert_not_called()
+
+    def test_list_body_is_rejected_without_error(self):
+        response = self.client.post(self.login_url, [{"username": 'customer1'}], format='json', REMOTE_ADDR='10.0.0.5')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
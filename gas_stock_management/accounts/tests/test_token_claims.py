@@ -0,0 +1,102 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from accounts.authentication import ClaimsJWTAuthentication, ClaimsUser
+from accounts.permissions import IsManager
+from accounts.repository.accounts_repository import AccountRepository
+from accounts.tokens import tokens_for_user
+
+
+class TokenClaimsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.factory = APIRequestFactory()
+        self.manager = User.objects.create_user(
+            username='manager1',
+            email='manager1@test.com',
+            password='managerpass'
+        )
+        self.manager.profile.role = 'manager'
+        self.manager.profile.save()
+
+    def _authenticate(self, access):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f"Bearer {access}")
+        return ClaimsJWTAuthentication().authenticate(request)
+
+    def test_login_token_carries_role_claims(self):
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {"username": "manager1", "password": "managerpass"},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user, token = self._authenticate(response.data['access'])
+        self.assertEqual(token['role'], 'manager')
+        self.assertFalse(token['is_staff'])
+        self.assertEqual(token['pv'], 1)
+
+    def test_permission_check_without_queries(self):
+        access = str(tokens_for_user(self.manager).access_token)
+
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate(access)
+            self.assertIsInstance(user, ClaimsUser)
+            self.assertEqual(user.id, self.manager.id)
+            request = self.factory.get('/')
+            request.user = user
+            self.assertTrue(IsManager().has_permission(request, None))
+
+    def test_role_change_falls_back_to_database(self):
+        access = str(tokens_for_user(self.manager).access_token)
+        AccountRepository.update_profile(user_id=self.manager.id, role='customer')
+
+        user, _ = self._authenticate(access)
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.profile.role, 'customer')
+
+    def test_deactivated_user_is_rejected(self):
+        access = str(tokens_for_user(self.manager).access_token)
+        self.manager.is_active = False
+        self.manager.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate(access)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertEqual(client.get(reverse('my-profile')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_demoted_staff_loses_staff_claim(self):
+        self.manager.is_staff = True
+        self.manager.save()
+        access = str(tokens_for_user(User.objects.get(pk=self.manager.pk)).access_token)
+        demoted = User.objects.get(pk=self.manager.pk)
+        demoted.is_staff = False
+        demoted.save()
+
+        user, _ = self._authenticate(access)
+        self.assertIsInstance(user, User)
+        self.assertFalse(user.is_staff)
+
+    def test_refresh_restamps_current_role(self):
+        refresh = str(tokens_for_user(self.manager))
+        AccountRepository.update_profile(user_id=self.manager.id, role='delivery')
+
+        response = self.client.post(reverse('token_refresh'), {"refresh": refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user, token = self._authenticate(response.data['access'])
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.profile.role, 'delivery')
+
+    def test_claims_user_delegates_to_database_row(self):
+        access = str(tokens_for_user(self.manager).access_token)
+        user, _ = self._authenticate(access)
+
+        self.assertEqual(user.username, 'manager1')
+        self.assertTrue(user.check_password('managerpass'))
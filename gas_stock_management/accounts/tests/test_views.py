@@ -108,6 +108,27 @@ class AccountTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_users_by_role_paginates(self):
+        for i in range(3):
+            User.objects.create_user(username=f"customer{i}", password="pass123")
+        self.client.force_authenticate(user=self.admin)
+        url = reverse("users-by-role")
+
+        response = self.client.get(url, {"role": "customer", "page_size": 2, "count": "estimate"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['users']), 2)
+        self.assertEqual(response.data['data']['count'], 3)
+
+        response = self.client.get(url, {"role": "customer", "cursor": response.data['data']['next_cursor']})
+        self.assertEqual(len(response.data['data']['users']), 1)
+        self.assertIsNone(response.data['data']['next_cursor'])
+
+    def test_get_users_by_role_forbidden_for_customer(self):
+        customer = User.objects.create_user(username="customer", password="pass123")
+        self.client.force_authenticate(user=customer)
+        response = self.client.get(reverse("users-by-role"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_delete_user_as_admin(self):
         self.client.force_authenticate(user=self.admin)
         user_to_delete = User.objects.create_user(username="deleteuser", password="pass123")
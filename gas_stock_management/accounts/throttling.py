@@ -0,0 +1,134 @@
+import time
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+METRIC_NAMES = ('accepted', 'delayed', 'rejected')
+
+
+class SlidingWindowCounter:
+    """
+    Approximate sliding window over two fixed buckets: the previous bucket's
+    count is weighted by how much of it still overlaps the window. Counts
+    live in the cache, so processes sharing a cache share the limit.
+    """
+
+    def __init__(self, cache, scope: str, limit: int, window: int):
+        self.cache = cache
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+
+    def _key(self, ident: str, bucket: int) -> str:
+        return f"throttle:{self.scope}:{ident}:{bucket}"
+
+    def hit(self, ident: str) -> tuple:
+        """Count one attempt; returns (estimated count in window, bucket key, retry after)."""
+        now = time.time()
+        bucket, offset = divmod(now, self.window)
+        key = self._key(ident, int(bucket))
+
+        self.cache.add(key, 0, timeout=self.window * 2)
+        try:
+            current = self.cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            self.cache.set(key, 1, timeout=self.window * 2)
+            current = 1
+
+        previous = self.cache.get(self._key(ident, int(bucket) - 1), 0)
+        estimate = previous * (1 - offset / self.window) + current
+        return estimate, key, int(self.window - offset) + 1
+
+    def refund(self, key: str) -> None:
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            pass
+
+
+@dataclass
+class LoginAttempt:
+    allowed: bool
+    retry_after: int = 0
+    delay: float = 0.0
+    _refunds: list = field(default_factory=list)
+
+    def succeeded(self) -> None:
+        """Successful logins do not count against the limits."""
+        for counter, key in self._refunds:
+            counter.refund(key)
+        self._refunds = []
+
+
+class LoginRateLimiter:
+    """
+    Sheds login attempts before any password hashing runs. Every attempt is
+    counted per username and per client IP; successful logins are refunded,
+    so the windows effectively hold failed and in-flight attempts. In `delay`
+    mode attempts past DELAY_AFTER are slowed down progressively before the
+    hard limit rejects them; only the async login waits out `delay`, as a
+    sleep in a sync view would hold its worker.
+    """
+
+    def __init__(self, config: dict):
+        self.cache = caches[config.get('CACHE_ALIAS', 'default')]
+        self.mode = config.get('MODE', 'reject')
+        self.delay_after = config.get('DELAY_AFTER', 3)
+        self.base_delay = config.get('BASE_DELAY', 0.25)
+        self.max_delay = config.get('MAX_DELAY', 4.0)
+        self.by_username = SlidingWindowCounter(self.cache, 'login:user', *config.get('USERNAME_RATE', (5, 60)))
+        self.by_ip = SlidingWindowCounter(self.cache, 'login:ip', *config.get('IP_RATE', (30, 60)))
+
+    def attempt(self, username: str, ip: str) -> LoginAttempt:
+        checks = [(self.by_ip, ip or 'unknown')]
+        if username:
+            checks.append((self.by_username, username.strip().lower()))
+
+        refunds = []
+        worst = 0.0
+        retry_after = 0
+        allowed = True
+        for counter, ident in checks:
+            count, key, wait = counter.hit(ident)
+            refunds.append((counter, key))
+            worst = max(worst, count - self.delay_after)
+            if count > counter.limit:
+                allowed = False
+                retry_after = max(retry_after, wait)
+
+        if not allowed:
+            self._count('rejected')
+            return LoginAttempt(allowed=False, retry_after=retry_after)
+
+        delay = 0.0
+        if self.mode == 'delay' and worst > 0:
+            delay = min(self.max_delay, self.base_delay * 2 ** (worst - 1))
+            self._count('delayed')
+        self._count('accepted')
+        return LoginAttempt(allowed=True, delay=delay, _refunds=refunds)
+
+    def _count(self, name: str) -> None:
+        key = f"throttle:login:metrics:{name}"
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, timeout=None)
+
+    def metrics(self) -> dict:
+        values = self.cache.get_many([f"throttle:login:metrics:{name}" for name in METRIC_NAMES])
+        return {name: values.get(f"throttle:login:metrics:{name}", 0) for name in METRIC_NAMES}
+
+    def reset_metrics(self) -> None:
+        self.cache.delete_many([f"throttle:login:metrics:{name}" for name in METRIC_NAMES])
+
+
+def get_login_limiter() -> LoginRateLimiter:
+    return LoginRateLimiter(getattr(settings, 'LOGIN_THROTTLE', {}))
+
+
+def client_ip(request) -> str:
+    """Client address, honouring REST_FRAMEWORK['NUM_PROXIES'] like DRF's throttles."""
+    return BaseThrottle().get_ident(request)
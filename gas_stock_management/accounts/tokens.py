@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import Profile
+
+ROLE_CLAIM = 'role'
+STAFF_CLAIM = 'is_staff'
+VERSION_CLAIM = 'pv'
+
+PROFILE_VERSION_CACHE_TIMEOUT = 60 * 60
+
+
+def _profile_version_key(user_id) -> str:
+    return f"accounts:profile_version:{user_id}"
+
+
+def set_profile_version(user_id, version: int) -> None:
+    cache.set(_profile_version_key(user_id), version, PROFILE_VERSION_CACHE_TIMEOUT)
+
+
+def clear_profile_version(user_id) -> None:
+    cache.delete(_profile_version_key(user_id))
+
+
+def get_profile_version(user_id):
+    """Current claims version for a user, or None if the user has no profile.
+
+    Served from the cache; only a cold key goes to the database.
+    """
+    version = cache.get(_profile_version_key(user_id))
+    if version is None:
+        version = (
+            Profile.objects.filter(user_id=user_id)
+            .values_list('claims_version', flat=True)
+            .first()
+        )
+        if version is not None:
+            set_profile_version(user_id, version)
+    return version
+
+
+def stamp_role_claims(token, user):
+    profile = user.profile
+    token[ROLE_CLAIM] = profile.role
+    token[STAFF_CLAIM] = user.is_staff
+    token[VERSION_CLAIM] = profile.claims_version
+    return token
+
+
+def tokens_for_user(user) -> RefreshToken:
+    return stamp_role_claims(RefreshToken.for_user(user), user)
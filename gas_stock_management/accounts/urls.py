@@ -1,20 +1,28 @@
 from django.urls import path
 from .views import (
     RegisterView, LoginView, LogoutView, ProfileView, UpdateProfileView,
-    DeleteUserView, ChangePasswordView, UsersByRoleView
+    DeleteUserView, ChangePasswordView, UsersByRoleView, BulkImportUsersView,
+    ProfileCacheStatsView, LoginThrottleStatsView
 )
+from .async_views import AsyncLoginView, AsyncRegisterView, AsyncChangePasswordView
 
 urlpatterns = [
    path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/login/', LoginView.as_view(), name='login'),
+    path('auth/login/throttle-stats/', LoginThrottleStatsView.as_view(), name='login-throttle-stats'),
     path('auth/logout/', LogoutView.as_view(), name='logout'),
+    path('auth/async/register/', AsyncRegisterView.as_view(), name='async-register'),
+    path('auth/async/login/', AsyncLoginView.as_view(), name='async-login'),
+    path('auth/async/change-password/', AsyncChangePasswordView.as_view(), name='async-change-password'),
     
     path('profile/', ProfileView.as_view(), name='my-profile'),
     path('profile/<int:user_id>/', ProfileView.as_view(), name='user-profile'),
+    path('profile/cache-stats/', ProfileCacheStatsView.as_view(), name='profile-cache-stats'),
     path('profile/update/', UpdateProfileView.as_view(), name='update-my-profile'),
     path('profile/update/<int:user_id>/', UpdateProfileView.as_view(), name='update-user-profile'),
     
     path('user/delete/<int:user_id>/', DeleteUserView.as_view(), name='delete-user'),
     path('auth/change-password/', ChangePasswordView.as_view(), name='change-password'),
     path('users/', UsersByRoleView.as_view(), name='users-by-role'),
+    path('users/import/', BulkImportUsersView.as_view(), name='users-import'),
 ]
\ No newline at end of file
@@ -3,10 +3,17 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework import status
 from django.contrib.auth import logout
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+from accounts.revocation import get_revocation_store
 from accounts.services.accounts_services import AccountService
+from accounts.services.user_import_service import UserImportService
+from accounts.cache import ProfileCache
+from accounts.throttling import client_ip, get_login_limiter
 from .permissions import IsAdmin, IsManager
-from accounts.serializers import RegisterSerializer, UserSerializer
-from accounts.models import Profile
+from accounts.serializers import RegisterSerializer
+from gas_stock_management.pagination import clamp_page_size
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
@@ -25,15 +32,39 @@ class RegisterView(APIView):
             "errors": serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
 
+def _throttled_response(attempt):
+    response = Response({
+        "success": False,
+        "message": "Too many login attempts, please try again later",
+        "data": {}
+    }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    response['Retry-After'] = str(attempt.retry_after)
+    return response
+
+def _login_username(request) -> str:
+    username = request.data.get('username', '') if isinstance(request.data, dict) else ''
+    return username if isinstance(username, str) else ''
+
 class LoginView(APIView):
+    """
+    Sync login. Attempts over the hard limit get 429; `delay` mode's waits
+    are only applied by AsyncLoginView, since sleeping here would hold a
+    worker for the whole delay.
+    """
     permission_classes = [AllowAny]
 
     def post(self, request):
+        # Throttle before AccountService.login_user runs the password hash
+        attempt = get_login_limiter().attempt(_login_username(request), client_ip(request))
+        if not attempt.allowed:
+            return _throttled_response(attempt)
+
         service_response = AccountService.login_user(request.data)
         status_code = service_response.get("status_code", status.HTTP_200_OK)
         
         # If login successful, flatten the token structure
         if service_response.get('success'):
+            attempt.succeeded()
             response_data = {
                 'access': service_response['data']['tokens']['access'],
                 'refresh': service_response['data']['tokens']['refresh'],
@@ -46,11 +77,43 @@ class LoginView(APIView):
         return Response(
             service_response, 
             status=status_code)
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """`/api/token/` with the same login throttling as LoginView."""
+
+    def post(self, request, *args, **kwargs):
+        attempt = get_login_limiter().attempt(_login_username(request), client_ip(request))
+        if not attempt.allowed:
+            return _throttled_response(attempt)
+
+        response = super().post(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            attempt.succeeded()
+        return response
+
+class LoginThrottleStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response({
+            "success": True,
+            "message": "Login throttle statistics",
+            "data": get_login_limiter().metrics()
+        }, status=status.HTTP_200_OK)
     
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        store = get_revocation_store()
+        if request.auth is not None:
+            store.revoke(request.auth)
+        refresh = request.data.get('refresh') if isinstance(request.data, dict) else None
+        if refresh and isinstance(refresh, str):
+            try:
+                store.revoke(RefreshToken(refresh))
+            except TokenError:
+                pass
         logout(request)
         return Response({
             "success": True,
@@ -88,6 +151,16 @@ class ProfileView(APIView):
             "data": {}
         }, status=status.HTTP_403_FORBIDDEN)
 
+class ProfileCacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response({
+            "success": True,
+            "message": "Profile cache statistics",
+            "data": ProfileCache.stats()
+        }, status=status.HTTP_200_OK)
+
 class UpdateProfileView(APIView):
     permission_classes = [IsAuthenticated]
     def patch(self, request, user_id=None):
@@ -160,42 +233,51 @@ class ChangePasswordView(APIView):
                 "error": str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
+class BulkImportUsersView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload:
+            fmt = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+            rows = UserImportService.parse_stream(upload, fmt)
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            rows = request.data.get('users', [])
+
+        service_response = UserImportService.import_rows(rows, created_by_id=request.user.id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
 class UsersByRoleView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-       
+        if not (request.user.is_staff or request.user.profile.role in ['admin', 'manager']):
+            return Response({
+                "success": False,
+                "message": "Unauthorized access",
+                "data": {}
+            }, status=status.HTTP_403_FORBIDDEN)
+
         try:
-            user_profile = request.user.profile
-            if user_profile.role not in ['admin', 'manager']:
-                return Response({
-                    "success": False,
-                    "message": "Unauthorized access",
-                    "data": {}
-                }, status=status.HTTP_403_FORBIDDEN)
-            role = request.query_params.get('role')
-            if role:
-                profiles = Profile.objects.filter(role=role)
-            else:
-                profiles = Profile.objects.all()
-
-            # Collect related users
-            users = [profile.user for profile in profiles]
-            serializer = UserSerializer(users, many=True)
-
-            return Response(serializer.data, status=200)
+            if request.query_params.get('stream') in ('1', 'true'):
+                streamed = AccountService.stream_users_by_role(request, request.query_params.get('role'))
+                if isinstance(streamed, dict):
+                    return Response(streamed, status=streamed["status_code"])
+                return streamed
 
+            service_response = AccountService.get_users_by_role(
+                request.query_params.get('role'),
+                cursor=request.query_params.get('cursor'),
+                limit=clamp_page_size(request.query_params.get('page_size')),
+                count=request.query_params.get('count')
+            )
+            status_code = service_response.get("status_code", status.HTTP_200_OK)
+            return Response(service_response, status=status_code)
         except Exception as e:
-            return Response({'detail': f'An error occurred: {str(e)}'}, status=500)
-            
-        #     service_response = AccountService.get_users_by_role(
-        #         request.query_params.get('role', 'customer')
-        #     )
-        #     status_code = service_response.get("status_code", status.HTTP_200_OK)
-        #     return Response(service_response, status=status_code)
-        # except Exception as e:
-        #     return Response({
-        #         "success": False,
-        #         "message": "Failed to fetch users",
-        #         "error": str(e)
-        #     }, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({
+                "success": False,
+                "message": "Failed to fetch users",
+                "error": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
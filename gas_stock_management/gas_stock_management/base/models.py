@@ -1,3 +1,4 @@
+import copy
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -9,4 +10,71 @@ class BaseModel(models.Model):
     updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="%(class)s_updated_by")
 
     class Meta:
-        abstract = True 
+        abstract = True
+
+    # Dirty-field tracking: instances remember the column values they were
+    # loaded with, so `save()` on an existing row only writes the columns that
+    # changed and skips the UPDATE entirely when nothing did.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._snapshot_fields()
+
+    def _tracked_fields(self):
+        deferred = self.get_deferred_fields()
+        return [
+            field for field in self._meta.concrete_fields
+            if not field.primary_key
+            and not getattr(field, 'auto_now', False)
+            and field.attname not in deferred
+        ]
+
+    def _tracked_value(self, field):
+        value = self.__dict__.get(field.attname)
+        if isinstance(field, models.FileField):
+            return getattr(value, 'name', value) or None
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def _snapshot_fields(self, names=None):
+        values = {
+            field.attname: self._tracked_value(field) for field in self._tracked_fields()
+            if names is None or field.name in names or field.attname in names
+        }
+        if names is None:
+            self._loaded_values = values
+        else:
+            self._loaded_values.update(values)
+
+    def get_dirty_fields(self) -> list:
+        """Names of fields whose value differs from what was loaded or last saved."""
+        return [
+            field.name for field in self._tracked_fields()
+            if field.attname not in self._loaded_values
+            or self._loaded_values[field.attname] != self._tracked_value(field)
+        ]
+
+    def is_dirty(self) -> bool:
+        return self._state.adding or bool(self.get_dirty_fields())
+
+    def save(self, *args, **kwargs):
+        explicit = args or kwargs.get('force_insert') or kwargs.get('update_fields') is not None
+        if not explicit and not self._state.adding:
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            auto_now = [
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False)
+            ]
+            kwargs['update_fields'] = dirty + auto_now
+
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        self._snapshot_fields(None if update_fields is None else set(update_fields))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Loading a deferred field reloads just that field; edits to the others stay dirty
+        self._snapshot_fields(None if fields is None else set(fields))
@@ -0,0 +1,81 @@
+import threading
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+class CacheCounters:
+    """Process-local hit, miss and invalidation counters for one cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+class VersionedCache:
+    """
+    Base for the caches the apps keep in Django's cache framework. Every
+    key is stored under `payload_version`; bump it when the shape of the
+    cached payload changes so old entries are ignored. A subclass that
+    reports its hit ratio sets `counters` to a `CacheCounters()` and counts
+    its lookups with `_count`.
+    """
+    alias = 'default'
+    payload_version = 1
+    counters = None
+
+    @classmethod
+    def _cache(cls):
+        return caches[cls.alias]
+
+    @classmethod
+    def _count(cls, name: str) -> None:
+        if cls.counters is not None:
+            cls.counters.count(name)
+
+    @classmethod
+    def _get(cls, key):
+        return cls._cache().get(key, version=cls.payload_version)
+
+    @classmethod
+    def _get_many(cls, keys) -> dict:
+        return cls._cache().get_many(keys, version=cls.payload_version)
+
+    @classmethod
+    def _set(cls, key, value) -> None:
+        cls._cache().set(key, value, version=cls.payload_version)
+
+    @classmethod
+    def _set_many(cls, values: dict) -> None:
+        cls._cache().set_many(values, version=cls.payload_version)
+
+    @classmethod
+    def _add(cls, key, value, timeout=DEFAULT_TIMEOUT) -> None:
+        cls._cache().add(key, value, timeout=timeout, version=cls.payload_version)
+
+    @classmethod
+    def _delete(cls, key) -> None:
+        cls._cache().delete(key, version=cls.payload_version)
+
+    @classmethod
+    def stats(cls) -> dict:
+        return cls.counters.stats()
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls.counters.reset()
@@ -0,0 +1,73 @@
+class Column:
+    """A projected column with a converter applied to the raw database value."""
+
+    def __init__(self, lookup: str, convert):
+        self.lookup = lookup
+        self.convert = convert
+
+
+def file_url(model, field_name: str):
+    """Converter matching DRF's FileField/ImageField output without a request: url or None."""
+    storage = model._meta.get_field(field_name).storage
+
+    def convert(name):
+        return storage.url(name) if name else None
+    return convert
+
+
+class Projection:
+    """
+    Read-only output shape declared once as `fields`: output key -> ORM lookup
+    (str), `Column`, or a nested dict for nested objects. Rows are fetched
+    with `values_list()` and turned into dicts directly, skipping model and
+    serializer instantiation. Subclasses must keep their output identical to
+    the serializer they stand in for.
+    """
+    fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._lookups = []
+        cls._plan = cls._compile(cls.fields)
+
+    @classmethod
+    def _compile(cls, fields: dict) -> list:
+        plan = []
+        for key, spec in fields.items():
+            if isinstance(spec, dict):
+                plan.append((key, None, None, cls._compile(spec)))
+                continue
+            column = spec if isinstance(spec, Column) else Column(spec, None)
+            plan.append((key, len(cls._lookups), column.convert, None))
+            cls._lookups.append(column.lookup)
+        return plan
+
+    @classmethod
+    def lookups(cls) -> list:
+        return list(cls._lookups)
+
+    @classmethod
+    def _build(cls, plan: list, row: tuple) -> dict:
+        out = {}
+        for key, index, convert, nested in plan:
+            if nested is not None:
+                out[key] = cls._build(nested, row)
+            elif convert is None:
+                out[key] = row[index]
+            else:
+                out[key] = convert(row[index])
+        return out
+
+    @classmethod
+    def build(cls, row: tuple) -> dict:
+        """Dict for one `values_list(*lookups(), ...)` row; trailing extra columns are ignored."""
+        return cls._build(cls._plan, row)
+
+    @classmethod
+    def iterate(cls, queryset, chunk_size: int = 2000):
+        for row in queryset.values_list(*cls._lookups).iterator(chunk_size=chunk_size):
+            yield cls._build(cls._plan, row)
+
+    @classmethod
+    def list(cls, queryset) -> list:
+        return [cls._build(cls._plan, row) for row in queryset.values_list(*cls._lookups)]
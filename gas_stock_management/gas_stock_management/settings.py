@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -62,10 +63,16 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
     ),
 }
 
+SIMPLE_JWT = {
+    'ROTATE_REFRESH_TOKENS': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.RoleTokenRefreshSerializer',
+}
+
 
 ROOT_URLCONF = 'gas_stock_management.urls'
 
@@ -94,9 +101,74 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Seconds a writer waits on SQLite's database lock before failing
+            'timeout': 20,
+        },
     }
 }
 
+# Tests run on an in-memory database. The threaded stress tests need real
+# SQLite locking and are skipped there; THREADED_TESTS=1 runs the suite on a
+# file-based test database so they run too.
+if os.environ.get('THREADED_TESTS'):
+    DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The `profiles` alias holds serialized profile payloads (accounts/cache.py).
+# Pick its backend with PROFILE_CACHE_BACKEND=locmem|file|redis.
+# The `catalog` alias holds the catalog version and bodies (products/catalog.py);
+# pick it with CATALOG_CACHE_BACKEND. It must be shared (file or redis) when
+# more than one process serves requests, or a catalog write is only seen by
+# the process that made it.
+
+PROFILE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'profiles',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('PROFILE_CACHE_DIR', str(BASE_DIR / '.cache' / 'profiles')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CATALOG_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'catalog',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CATALOG_CACHE_DIR', str(BASE_DIR / '.cache' / 'catalog')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+        'KEY_PREFIX': 'catalog',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'profiles': {
+        **PROFILE_CACHE_BACKENDS[os.environ.get('PROFILE_CACHE_BACKEND', 'locmem')],
+        'TIMEOUT': 15 * 60,
+    },
+    'catalog': {
+        **CATALOG_CACHE_BACKENDS[os.environ.get('CATALOG_CACHE_BACKEND', 'locmem')],
+        'TIMEOUT': 60 * 60,
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -117,6 +189,83 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Bounded pool used by the async auth views (accounts/hashing.py). Requests
+# beyond WORKERS + MAX_QUEUE get a 503 with Retry-After (seconds).
+PASSWORD_HASHING_POOL = {
+    'WORKERS': 4,
+    'MAX_QUEUE': 32,
+    'RETRY_AFTER': 2,
+}
+
+# In-process revocation checks (accounts/revocation.py). Other processes'
+# revocations are picked up by a background sync within SYNC_INTERVAL
+# seconds; each sync re-reads the last SYNC_OVERLAP seconds of rows.
+TOKEN_REVOCATION = {
+    'SYNC_INTERVAL': 5,
+    'SYNC_OVERLAP': 60,
+    'PRUNE_INTERVAL': 60 * 60,
+    'BLOOM_CAPACITY': 100_000,
+    'BLOOM_ERROR_RATE': 0.001,
+    'LRU_SIZE': 10_000,
+}
+
+# Login throttling (accounts/throttling.py). Rates are (attempts, window in
+# seconds); successful logins are not counted. MODE is 'reject' or 'delay'
+# (progressive back-off after DELAY_AFTER attempts, up to the hard limit;
+# only the async login waits, the sync views never hold a worker asleep).
+# Point CACHE_ALIAS at a shared cache to share limits across processes.
+LOGIN_THROTTLE = {
+    'CACHE_ALIAS': 'default',
+    'USERNAME_RATE': (5, 60),
+    'IP_RATE': (30, 60),
+    'MODE': 'reject',
+    'DELAY_AFTER': 3,
+    'BASE_DELAY': 0.25,
+    'MAX_DELAY': 4.0,
+}
+
+# Stock balance writes that lose a race (stale version, or SQLite's database
+# lock) are retried by the stock service up to MAX_RETRIES times, sleeping a
+# random 0..min(MAX_DELAY, BASE_DELAY * 2**attempt) seconds in between.
+STOCK_CONCURRENCY = {
+    'MAX_RETRIES': 5,
+    'BASE_DELAY': 0.01,
+    'MAX_DELAY': 0.25,
+}
+
+# Nightly demand forecast (reports). Daily sales are smoothed with weight
+# ALPHA and averaged over WINDOW_DAYS; the first run looks back HISTORY_DAYS.
+# Reorder point = demand over LEAD_TIME_DAYS plus SERVICE_Z standard
+# deviations of it; reorder quantity = demand over REVIEW_DAYS.
+DEMAND_FORECAST = {
+    'WINDOW_DAYS': 28,
+    'ALPHA': 0.3,
+    'HISTORY_DAYS': 180,
+    'LEAD_TIME_DAYS': 3,
+    'REVIEW_DAYS': 7,
+    'SERVICE_Z': 1.65,
+}
+
+# Product catalog (products/catalog.py). The cached catalog version expires
+# after VERSION_TIMEOUT seconds, bounding how long a missed invalidation can
+# keep answering 304 for a catalog that changed.
+CATALOG = {
+    'VERSION_TIMEOUT': 5,
+}
+
+# Orders (orders app). A placed order holds its stock for
+# RESERVATION_MINUTES; unpaid orders release it once that has passed.
+# Distributor batches (orders/batches.py) hold stock for
+# BATCH_RESERVATION_MINUTES, are placed BATCH_CHUNK_SIZE lines per
+# transaction and run on BATCH_WORKERS background threads.
+ORDERS = {
+    'RESERVATION_MINUTES': 15,
+    'BATCH_RESERVATION_MINUTES': 24 * 60,
+    'BATCH_CHUNK_SIZE': 500,
+    'BATCH_WORKERS': 2,
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -138,3 +287,7 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Bulk user import (accounts/services/user_import_service.py)
+ACCOUNTS_IMPORT_CHUNK_SIZE = 500
+ACCOUNTS_IMPORT_HASH_WORKERS = 4
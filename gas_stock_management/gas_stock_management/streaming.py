@@ -0,0 +1,77 @@
+import json
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+DEFAULT_CHUNK_SIZE = 500
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _envelope(key: str, message: str) -> tuple:
+    """Head and tail of the `APIResponse.success` envelope around a streamed array."""
+    head = '{"success":true,"data":{%s:[' % json.dumps(key)
+    tail = ']},"message":%s}' % json.dumps(message)
+    return head, tail
+
+
+def stream_json(rows, serialize, key: str, message: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Sync generator: serializes `rows` one at a time and yields ~chunk_size rows per chunk."""
+    head, tail = _envelope(key, message)
+    buffer = [head]
+    first = True
+    for count, row in enumerate(rows, start=1):
+        buffer.append(('' if first else ',') + _encoder.encode(serialize(row)))
+        first = False
+        if count % chunk_size == 0:
+            yield ''.join(buffer).encode()
+            buffer = []
+    buffer.append(tail)
+    yield ''.join(buffer).encode()
+
+
+async def astream_json(rows, serialize, key: str, message: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Async generator counterpart of `stream_json` for ASGI; `rows` is an async iterable."""
+    head, tail = _envelope(key, message)
+    buffer = [head]
+    first = True
+    count = 0
+    async for row in rows:
+        count += 1
+        buffer.append(('' if first else ',') + _encoder.encode(serialize(row)))
+        first = False
+        if count % chunk_size == 0:
+            yield ''.join(buffer).encode()
+            buffer = []
+    buffer.append(tail)
+    yield ''.join(buffer).encode()
+
+
+async def _aiterate(queryset, chunk_size: int):
+    """
+    Async iteration over `queryset.iterator()`, one chunk per thread hop.
+    (`QuerySet.aiterator()` fails on values_list() querysets, which run their
+    query eagerly inside the event loop.)
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    fetch = sync_to_async(lambda: list(islice(rows, chunk_size)), thread_sensitive=True)
+    while batch := await fetch():
+        for row in batch:
+            yield row
+
+
+def streaming_queryset_response(request, queryset, serialize, key: str, message: str,
+                                chunk_size: int = DEFAULT_CHUNK_SIZE) -> StreamingHttpResponse:
+    """
+    Stream a queryset as `{"success", "data": {key: [...]}, "message"}` without
+    materializing it: rows come from `.iterator()` (fetched a chunk at a time
+    off the event loop under ASGI) and `serialize` must not query the database per row.
+    """
+    raw_request = getattr(request, '_request', request)
+    if isinstance(raw_request, ASGIRequest):
+        content = astream_json(_aiterate(queryset, chunk_size), serialize, key, message, chunk_size)
+    else:
+        content = stream_json(queryset.iterator(chunk_size=chunk_size), serialize, key, message, chunk_size)
+    return StreamingHttpResponse(content, content_type='application/json')
@@ -0,0 +1,27 @@
+import csv
+import io
+import json
+
+
+def parse_rows(stream, fmt: str, key: str):
+    """
+    Yield row dicts from a text or binary stream (or a str / bytes payload)
+    in `csv` or `json` format. JSON may be a list of rows or an object
+    holding that list under `key`.
+    """
+    if isinstance(stream, (bytes, str)):
+        stream = io.BytesIO(stream) if isinstance(stream, bytes) else io.StringIO(stream)
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig')
+
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'json':
+        payload = json.load(stream)
+        if isinstance(payload, dict):
+            payload = payload.get(key, [])
+        if not isinstance(payload, list):
+            raise ValueError(f"JSON input must be a list of {key}")
+        yield from payload
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
@@ -1,3 +1,7 @@
 from django.contrib import admin
+from .models import NotificationEvent
 
-# Register your models here.
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ('event_type', 'recipient', 'status', 'created_at')
+    list_filter = ('event_type', 'status', 'created_at')
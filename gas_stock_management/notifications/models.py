@@ -1,3 +1,31 @@
 from django.db import models
+from django.contrib.auth.models import User
+from gas_stock_management.base.models import BaseModel
 
-# Create your models here.
+
+class NotificationEvent(BaseModel):
+    """
+    An event waiting to be delivered. Producers insert rows inside their own
+    transaction, so an event exists exactly when the change it reports committed.
+    """
+    LOW_STOCK = 'low_stock'
+    EVENT_TYPE_CHOICES = [
+        (LOW_STOCK, 'Low Stock'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    event_type = models.CharField(max_length=30, choices=EVENT_TYPE_CHOICES)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='notifications')
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='notification_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.status})"
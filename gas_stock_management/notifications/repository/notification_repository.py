@@ -0,0 +1,19 @@
+from rest_framework import status
+from notifications.models import NotificationEvent
+from gas_stock_management.response import RepositoryResponse
+
+
+class NotificationRepository:
+    @staticmethod
+    def enqueue(event_type: str, payload: dict, recipient_id: int = None) -> RepositoryResponse:
+        """Insert a pending event; runs inside the caller's transaction, if any."""
+        event = NotificationEvent.objects.create(
+            event_type=event_type,
+            payload=payload,
+            recipient_id=recipient_id,
+        )
+        return RepositoryResponse(
+            success=True,
+            data={"event": event},
+            status_code=status.HTTP_201_CREATED
+        )
@@ -0,0 +1,24 @@
+from notifications.models import NotificationEvent
+from notifications.repository.notification_repository import NotificationRepository
+
+
+class NotificationService:
+
+    @staticmethod
+    def enqueue_low_stock(station_id: int, product_id: int, quantity, reorder_point, recipient_id: int = None):
+        repo_response = NotificationRepository.enqueue(
+            NotificationEvent.LOW_STOCK,
+            {
+                "station_id": station_id,
+                "product_id": product_id,
+                "quantity": str(quantity),
+                "reorder_point": str(reorder_point),
+            },
+            recipient_id=recipient_id,
+        )
+        return {
+            "success": repo_response.success,
+            "message": "Low stock notification queued",
+            "data": {"event_id": repo_response.data['event'].id},
+            "status_code": repo_response.status_code
+        }
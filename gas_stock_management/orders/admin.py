@@ -1,3 +1,32 @@
 from django.contrib import admin
+from .models import Order, OrderBatch, OrderLine
 
-# Register your models here.
+
+class OrderLineInline(admin.TabularInline):
+    model = OrderLine
+    extra = 0
+    readonly_fields = ('product', 'quantity', 'unit_price', 'total')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    list_display = ('number', 'customer', 'station', 'status', 'total', 'expires_at', 'created_at')
+    search_fields = ('number', 'customer__username')
+    list_filter = ('status', 'station')
+    inlines = [OrderLineInline]
+    # Status changes move reserved stock; they go through the orders API
+    readonly_fields = ('number', 'customer', 'station', 'tier', 'status', 'total', 'expires_at',
+                       'idempotency_key', 'request_hash')
+
+
+@admin.register(OrderBatch)
+class OrderBatchAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'tier', 'lines_processed', 'lines_failed', 'orders_placed', 'created_by',
+                    'created_at', 'finished_at')
+    list_filter = ('status',)
+    exclude = ('source',)
+    readonly_fields = ('status', 'format', 'tier', 'manager', 'message', 'lines_processed', 'lines_failed',
+                       'orders_placed', 'report', 'finished_at')
@@ -0,0 +1,45 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection
+
+
+class BatchPool:
+    """
+    Background threads that place distributor order batches, so an upload
+    returns as soon as it is stored. Each job runs on the thread's own
+    database connection, closed when the job ends. Jobs are submitted once
+    the transaction storing the batch commits (see
+    `OrderBatchService.submit`); batches left queued by a restart are picked
+    up by `manage.py import_orders --queued`.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='order-batches')
+
+    @staticmethod
+    def _run(fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            connection.close()
+
+    def submit(self, fn, *args):
+        return self._executor.submit(self._run, fn, *args)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_batch_pool() -> BatchPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BatchPool(workers=getattr(settings, 'ORDERS', {}).get('BATCH_WORKERS', 2))
+    return _pool
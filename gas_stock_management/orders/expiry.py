@@ -0,0 +1,71 @@
+import heapq
+import time
+from django.utils import timezone
+from orders.services.orders_services import OrdersService
+
+
+class ExpiryWorker:
+    """
+    Releases the stock of unpaid orders as their reservations run out.
+    Instead of polling the orders table, it keeps a min-heap of the next
+    `heap_size` deadlines (read in order from the (status, expires_at)
+    index), sleeps until the earliest one and expires due orders in
+    batches of `batch_size`. The heap is reloaded once it is empty or `max_sleep`
+    seconds old, which picks up new orders and drops paid or cancelled
+    ones. Several workers may run at once: each order is claimed by
+    exactly one of them (see `OrdersRepository.expire_orders`).
+    """
+
+    def __init__(self, batch_size: int = 50, heap_size: int = 1000, max_sleep: float = 30.0):
+        self.batch_size = batch_size
+        self.heap_size = heap_size
+        self.max_sleep = max_sleep
+        self.heap = []
+        self.loaded_at = None
+
+    def load(self, now=None) -> None:
+        self.heap = [
+            (expires_at.timestamp(), order_id)
+            for expires_at, order_id in OrdersService.reservation_deadlines(self.heap_size)
+        ]
+        # Already in deadline order, which is a valid heap
+        heapq.heapify(self.heap)
+        self.loaded_at = (now or timezone.now()).timestamp()
+
+    def is_stale(self, now) -> bool:
+        return not self.heap or self.loaded_at is None or now.timestamp() - self.loaded_at >= self.max_sleep
+
+    def release_due(self, now) -> dict:
+        """Expire every loaded order due at `now`: {"expired": count, "failed": batches that lost out}."""
+        moment = now.timestamp()
+        expired = failed = 0
+        while self.heap and self.heap[0][0] <= moment:
+            batch = []
+            while self.heap and self.heap[0][0] <= moment and len(batch) < self.batch_size:
+                batch.append(heapq.heappop(self.heap)[1])
+            response = OrdersService.expire_reservations(batch, now)
+            expired += len(response['data']['expired'])
+            if not response['success']:
+                # Still pending, so the next load brings them back
+                failed += 1
+        return {"expired": expired, "failed": failed}
+
+    def seconds_until_next(self, now) -> float:
+        if not self.heap:
+            return self.max_sleep
+        return max(0.0, min(self.max_sleep, self.heap[0][0] - now.timestamp()))
+
+    def run_once(self, now=None) -> dict:
+        now = now or timezone.now()
+        self.load(now)
+        return self.release_due(now)
+
+    def run(self, should_stop=lambda: False, sleep=time.sleep, on_release=None) -> None:
+        while not should_stop():
+            now = timezone.now()
+            if self.is_stale(now):
+                self.load(now)
+            result = self.release_due(now)
+            if on_release is not None and (result['expired'] or result['failed']):
+                on_release(result)
+            sleep(self.seconds_until_next(timezone.now()))
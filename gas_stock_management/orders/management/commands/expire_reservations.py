@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from orders.expiry import ExpiryWorker
+
+
+class Command(BaseCommand):
+    help = (
+        "Release the stock held by unpaid orders once their reservation expires. Runs until interrupted, "
+        "sleeping until the next deadline; safe to run in several processes at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help="Orders expired per transaction")
+        parser.add_argument('--heap-size', type=int, default=1000, help="Upcoming deadlines kept in memory")
+        parser.add_argument('--max-sleep', type=float, default=30.0,
+                            help="Longest sleep, in seconds, and how often the deadlines are reloaded")
+        parser.add_argument('--once', action='store_true', help="Expire what is due now and exit")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['heap_size'] < 1:
+            raise CommandError("--batch-size and --heap-size must be at least 1")
+        if options['max_sleep'] <= 0:
+            raise CommandError("--max-sleep must be positive")
+        worker = ExpiryWorker(
+            batch_size=options['batch_size'], heap_size=options['heap_size'], max_sleep=options['max_sleep']
+        )
+
+        if options['once']:
+            self._report(worker.run_once())
+            return
+        try:
+            worker.run(on_release=self._report)
+        except KeyboardInterrupt:
+            pass
+
+    def _report(self, result: dict) -> None:
+        message = f"Expired {result['expired']} orders"
+        if result['failed']:
+            self.stdout.write(self.style.WARNING(f"{message}; {result['failed']} batches will be retried"))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,57 @@
+import sys
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from orders.repository.order_batch_repository import OrderBatchRepository
+from orders.services.order_batch_services import OrderBatchService
+
+
+class Command(BaseCommand):
+    help = (
+        "Place a distributor's order lines from a CSV or JSON file and print the lines that failed, "
+        "or with --queued place the uploaded batches still waiting (e.g. after a restart)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help="CSV or JSON file, or '-' for stdin")
+        parser.add_argument('--format', choices=['csv', 'json'], help="Defaults to the file extension")
+        parser.add_argument('--tier', help="Price tier, wholesale by default")
+        parser.add_argument('--user', help="Username the orders are placed by")
+        parser.add_argument('--queued', action='store_true', help="Place every queued batch instead of a file")
+
+    def handle(self, *args, **options):
+        if options['queued']:
+            batch_ids = OrderBatchRepository.queued_batch_ids()
+            for batch_id in batch_ids:
+                self.stdout.write(f"batch {batch_id}: {OrderBatchService.process(batch_id)['message']}")
+            self.stdout.write(self.style.SUCCESS(f"Processed {len(batch_ids)} queued batches"))
+            return
+
+        path = options['path']
+        if not path:
+            raise CommandError("Pass a file to import or --queued")
+        fmt = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if fmt not in ('csv', 'json'):
+            raise CommandError("Cannot infer format, pass --format csv|json")
+        user_id = None
+        if options['user']:
+            user_id = User.objects.filter(username=options['user']).values_list('id', flat=True).first()
+            if user_id is None:
+                raise CommandError(f"Unknown user {options['user']}")
+
+        if path == '-':
+            payload = sys.stdin.read()
+        else:
+            with open(path, 'rb') as stream:
+                payload = stream.read()
+        created = OrderBatchService.create_batch(payload, fmt, tier=options['tier'], created_by_id=user_id)
+        if not created['success']:
+            raise CommandError(f"{created['message']}: {created['data']}")
+        result = OrderBatchService.process(created['data']['batch']['id'])
+
+        for row in result['data'].get('rows', []):
+            if not row['success']:
+                self.stderr.write(f"line {row['row']} ({row['customer']}): {'; '.join(row['errors'])}")
+
+        if result['status_code'] >= 400:
+            raise CommandError(result['message'])
+        self.stdout.write(self.style.SUCCESS(result['message']))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-17 01:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        ('stock', '0006_stock_reservations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['expires_at', 'id'], name='order_pending_expiry_idx'),
+        ),
+    ]
@@ -1,3 +1,105 @@
 from django.db import models
+from django.contrib.auth.models import User
+from gas_stock_management.base.models import BaseModel
+from products.models import PriceRule, Product
+from stock.models import Station
 
-# Create your models here.
+
+class Order(BaseModel):
+    """
+    A customer's order from one station. While `pending` its lines hold
+    stock (StockBalance.reserved) until `expires_at`; confirming payment
+    books the sale in the ledger under `number`, and cancelling or expiry
+    releases the hold. `idempotency_key` is the client's Idempotency-Key
+    and `request_hash` a digest of the request it came with, so a retried
+    request returns this order instead of placing another.
+    """
+    PENDING = 'pending'
+    CONFIRMED = 'confirmed'
+    CANCELLED = 'cancelled'
+    EXPIRED = 'expired'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (CONFIRMED, 'Confirmed'),
+        (CANCELLED, 'Cancelled'),
+        (EXPIRED, 'Expired'),
+    ]
+    number = models.CharField(max_length=32, unique=True)
+    customer = models.ForeignKey(User, on_delete=models.PROTECT, related_name='orders')
+    station = models.ForeignKey(Station, on_delete=models.PROTECT, related_name='orders')
+    tier = models.CharField(max_length=20, choices=PriceRule.TIER_CHOICES, default=PriceRule.RETAIL)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    idempotency_key = models.CharField(max_length=255, null=True, blank=True)
+    request_hash = models.CharField(max_length=64, blank=True, default='')
+
+    class Meta:
+        constraints = [
+            # Also the index behind the one-lookup duplicate check
+            models.UniqueConstraint(fields=['customer', 'idempotency_key'], name='order_customer_idempotency_uniq'),
+        ]
+        indexes = [
+            # Order history, newest first by (created_at, id), one index per filter pattern:
+            # a customer's own orders, a station's (optionally by status), by status, and everything
+            models.Index(fields=['customer', 'created_at', 'id'], name='order_customer_created_idx'),
+            models.Index(fields=['station', 'created_at', 'id'], name='order_station_created_idx'),
+            models.Index(fields=['station', 'status', 'created_at', 'id'], name='order_station_status_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='order_status_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='order_created_idx'),
+            # Next reservation deadlines for the expiry worker, in order (only pending orders have one)
+            models.Index(fields=['status', 'expires_at', 'id'], name='order_status_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return self.number
+
+
+class OrderLine(BaseModel):
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='lines')
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='order_lines')
+    quantity = models.DecimalField(max_digits=14, decimal_places=3)
+    unit_price = models.DecimalField(max_digits=12, decimal_places=2)
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.order_id}: {self.quantity} x {self.product_id}"
+
+
+class OrderBatch(BaseModel):
+    """
+    A distributor's upload of many order lines, placed in the background.
+    `source` keeps the uploaded CSV or JSON until it has been processed;
+    `report` then has one entry per line saying which order it went into
+    or why it was rejected. Orders are placed at `tier` prices, and a batch
+    sent by a station manager (`manager`) may only order from their
+    stations.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('json', 'JSON'),
+    ]
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    tier = models.CharField(max_length=20, choices=PriceRule.TIER_CHOICES, default=PriceRule.WHOLESALE)
+    manager = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='order_batches')
+    source = models.TextField(blank=True, default='')
+    message = models.CharField(max_length=255, blank=True, default='')
+    lines_processed = models.PositiveIntegerField(default=0)
+    lines_failed = models.PositiveIntegerField(default=0)
+    orders_placed = models.PositiveIntegerField(default=0)
+    report = models.JSONField(default=list, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Order batch {self.pk} ({self.status})"
@@ -0,0 +1,20 @@
+from rest_framework.fields import DateTimeField
+from gas_stock_management.projections import Column, Projection
+
+# DRF's own datetime output (None for null)
+_datetime = DateTimeField().to_representation
+
+
+class OrderSummaryProjection(Projection):
+    """Same output as `OrderSummarySerializer`, built from values()."""
+    fields = {
+        'id': 'id',
+        'number': 'number',
+        'customer': 'customer_id',
+        'station': 'station_id',
+        'tier': 'tier',
+        'status': 'status',
+        'total': Column('total', lambda total: f"{total:.2f}"),
+        'expires_at': Column('expires_at', _datetime),
+        'created_at': Column('created_at', _datetime),
+    }
@@ -0,0 +1,158 @@
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db import transaction, IntegrityError
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from orders.models import Order, OrderBatch, OrderLine
+from products.models import Product
+from stock.concurrency import StockConflict
+from stock.models import Station, StockBalance
+from stock.repository.stock_repository import InsufficientStock, StockRepository
+from gas_stock_management.response import RepositoryResponse
+
+
+class OrderBatchRepository:
+    @staticmethod
+    def create_batch(source: str, fmt: str, tier: str, created_by_id: int = None,
+                     manager_id: int = None) -> OrderBatch:
+        return OrderBatch.objects.create(
+            source=source, format=fmt, tier=tier, manager_id=manager_id, created_by_id=created_by_id
+        )
+
+    @staticmethod
+    def get_batch(batch_id: int, created_by_id: int = None) -> RepositoryResponse:
+        batches = OrderBatch.objects.filter(pk=batch_id)
+        if created_by_id is not None:
+            batches = batches.filter(created_by_id=created_by_id)
+        batch = batches.defer('source').first()
+        if batch is None:
+            return RepositoryResponse(
+                success=False,
+                message="Order batch not found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return RepositoryResponse(success=True, data={"batch": batch}, status_code=status.HTTP_200_OK)
+
+    @staticmethod
+    def queued_batch_ids() -> list:
+        return list(OrderBatch.objects.filter(status=OrderBatch.QUEUED).order_by('id').values_list('id', flat=True))
+
+    @staticmethod
+    def claim_batch(batch_id: int):
+        """Move a queued batch to running and return it, or None if another worker already has it."""
+        if not OrderBatch.objects.filter(pk=batch_id, status=OrderBatch.QUEUED).update(
+            status=OrderBatch.RUNNING, updated_at=timezone.now()
+        ):
+            return None
+        return OrderBatch.objects.get(pk=batch_id)
+
+    @staticmethod
+    def record_progress(batch_id: int, lines: int, failed: int, orders: int) -> None:
+        OrderBatch.objects.filter(pk=batch_id).update(
+            lines_processed=F('lines_processed') + lines,
+            lines_failed=F('lines_failed') + failed,
+            orders_placed=F('orders_placed') + orders,
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def finish_batch(batch_id: int, status_value: str, message: str, report: list) -> None:
+        """Store the report and drop the uploaded source, which is no longer needed."""
+        now = timezone.now()
+        OrderBatch.objects.filter(pk=batch_id).update(
+            status=status_value, message=message[:255], report=report, source='', finished_at=now, updated_at=now
+        )
+
+    @staticmethod
+    def resolve_references(usernames, station_codes, skus, manager_id: int = None) -> dict:
+        """
+        Ids of the active customers, stations and products a chunk names, one
+        query each: {"customers": {username: id}, "stations": {code: id},
+        "products": {sku: id}}. With `manager_id` only that manager's
+        stations are found.
+        """
+        stations = Station.objects.filter(code__in=station_codes, is_active=True)
+        if manager_id is not None:
+            stations = stations.filter(manager_id=manager_id)
+        return {
+            "customers": dict(
+                User.objects.filter(username__in=usernames, is_active=True).values_list('username', 'id')
+            ),
+            "stations": dict(stations.values_list('code', 'id')),
+            "products": dict(Product.objects.filter(sku__in=skus, is_active=True).values_list('sku', 'id')),
+        }
+
+    @staticmethod
+    def placed_keys(customer_ids, idempotency_keys) -> dict:
+        """{(customer id, idempotency key): (order number, request hash)} of the given keys already used, in one query."""
+        if not idempotency_keys:
+            return {}
+        rows = Order.objects.filter(
+            customer_id__in=customer_ids, idempotency_key__in=idempotency_keys
+        ).values_list('customer_id', 'idempotency_key', 'number', 'request_hash')
+        return {(customer_id, key): (number, request_hash) for customer_id, key, number, request_hash in rows}
+
+    @staticmethod
+    def available_stock(keys) -> dict:
+        """{(station, product): quantity not yet reserved} for the given pairs that have a balance, in one query."""
+        if not keys:
+            return {}
+        station_ids = {station_id for station_id, _ in keys}
+        product_ids = {product_id for _, product_id in keys}
+        rows = StockBalance.objects.filter(station_id__in=station_ids, product_id__in=product_ids).values_list(
+            'station_id', 'product_id', 'quantity', 'reserved'
+        )
+        return {
+            (station_id, product_id): quantity - reserved
+            for station_id, product_id, quantity, reserved in rows
+            if (station_id, product_id) in keys
+        }
+
+    @staticmethod
+    def place_orders(orders: list, tier: str, expires_at, created_by_id: int = None) -> list:
+        """
+        Reserve the stock of many orders and write them in one transaction:
+        one guarded UPDATE per (station, product) over all of them, one
+        bulk insert of the orders and one of their lines. Each order is a
+        dict with customer_id, station_id, idempotency_key, request_hash, total and lines
+        ((product id, quantity, unit price, line total) tuples). Returns
+        the Order rows in the same order.
+
+        Quantities are expected to fit the stock read by `available_stock`;
+        if it has moved on since, or an idempotency key was used meanwhile,
+        StockConflict is raised and nothing is written, so the caller can
+        re-read and retry.
+        """
+        held = defaultdict(Decimal)
+        for order in orders:
+            for product_id, quantity, _, _ in order['lines']:
+                held[(order['station_id'], product_id)] += quantity
+        try:
+            with transaction.atomic():
+                StockRepository.reserve(dict(held))
+                placed = Order.objects.bulk_create([
+                    Order(
+                        number=uuid.uuid4().hex[:16].upper(),
+                        customer_id=order['customer_id'],
+                        station_id=order['station_id'],
+                        tier=tier,
+                        total=order['total'],
+                        expires_at=expires_at,
+                        idempotency_key=order['idempotency_key'],
+                        request_hash=order['request_hash'],
+                        created_by_id=created_by_id,
+                    )
+                    for order in orders
+                ])
+                OrderLine.objects.bulk_create([
+                    OrderLine(order=row, product_id=product_id, quantity=quantity, unit_price=unit_price,
+                              total=line_total, created_by_id=created_by_id)
+                    for row, order in zip(placed, orders)
+                    for product_id, quantity, unit_price, line_total in order['lines']
+                ])
+        except (InsufficientStock, IntegrityError) as e:
+            raise StockConflict(str(e)) from e
+        return placed
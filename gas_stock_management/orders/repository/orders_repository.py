@@ -0,0 +1,214 @@
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction, IntegrityError, OperationalError
+from django.db.models import Q, Sum
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
+from rest_framework import status
+from orders.models import Order, OrderLine
+from orders.projections import OrderSummaryProjection
+from stock.concurrency import StockConflict, is_retryable
+from stock.repository.stock_repository import InsufficientStock, StockRepository
+from gas_stock_management.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, keyset_page
+from gas_stock_management.response import RepositoryResponse
+
+
+class OrdersRepository:
+    @staticmethod
+    def find_by_key(customer_id: int, idempotency_key: str):
+        """The customer's order placed with this Idempotency-Key, if any (one lookup on the unique index)."""
+        return Order.objects.filter(customer_id=customer_id, idempotency_key=idempotency_key).first()
+
+    @staticmethod
+    def held_quantities(station_id: int, lines) -> dict:
+        """{(station, product): quantity} held by order lines given as (product id, quantity) pairs."""
+        held = defaultdict(Decimal)
+        for product_id, quantity in lines:
+            held[(station_id, product_id)] += quantity
+        return dict(held)
+
+    @staticmethod
+    def place_order(customer_id: int, station_id: int, tier: str, lines: list, total: Decimal, expires_at,
+                    idempotency_key: str = None, request_hash: str = '') -> RepositoryResponse:
+        """
+        Reserve the stock for `lines` ((product id, quantity, unit price,
+        line total) tuples) and write the order in one short transaction:
+        a guarded UPDATE per balance, one order insert and one bulk insert
+        of its lines. Nothing is written if any product is short. Lock
+        timeouts are raised for the caller to retry.
+        """
+        try:
+            with transaction.atomic():
+                StockRepository.reserve(OrdersRepository.held_quantities(
+                    station_id, [(product_id, quantity) for product_id, quantity, _, _ in lines]
+                ))
+                order = Order.objects.create(
+                    number=uuid.uuid4().hex[:16].upper(),
+                    customer_id=customer_id,
+                    station_id=station_id,
+                    tier=tier,
+                    total=total,
+                    expires_at=expires_at,
+                    idempotency_key=idempotency_key,
+                    request_hash=request_hash,
+                    created_by_id=customer_id,
+                )
+                OrderLine.objects.bulk_create([
+                    OrderLine(order=order, product_id=product_id, quantity=quantity, unit_price=unit_price,
+                              total=line_total)
+                    for product_id, quantity, unit_price, line_total in lines
+                ])
+            return RepositoryResponse(
+                success=True,
+                message="Order placed successfully",
+                data={"order": order},
+                status_code=status.HTTP_201_CREATED
+            )
+        except InsufficientStock as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_409_CONFLICT
+            )
+        except OperationalError as e:
+            if is_retryable(e):
+                raise
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        except IntegrityError as e:
+            # Most likely the same Idempotency-Key placed concurrently; the caller looks it up
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_409_CONFLICT
+            )
+
+    @staticmethod
+    def get_order(order_id: int, customer_id: int = None, manager_id: int = None) -> RepositoryResponse:
+        """An order with its lines; scoped like `list_orders` by `customer_id` or `manager_id`."""
+        orders = Order.objects.prefetch_related('lines').filter(pk=order_id)
+        if customer_id is not None:
+            orders = orders.filter(customer_id=customer_id)
+        if manager_id is not None:
+            orders = orders.filter(station__manager_id=manager_id)
+        order = orders.first()
+        if order is None:
+            return RepositoryResponse(
+                success=False,
+                message="Order not found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return RepositoryResponse(success=True, data={"order": order}, status_code=status.HTTP_200_OK)
+
+    @staticmethod
+    def list_orders(filters: dict, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, customer_id: int = None,
+                    manager_id: int = None) -> RepositoryResponse:
+        """
+        One page of order summaries, newest first, in a single query. Pages
+        follow a keyset cursor on (created_at, id) written as `created_at <=
+        t AND (created_at < t OR id < i)` so the bound is an index range,
+        and each combination of filters walks one of the composite indexes
+        on Order in order (customer, station, station + status, status, or
+        none). `customer_id` and `manager_id` scope the list to a customer's
+        own orders or the stations a manager runs.
+        """
+        try:
+            orders = Order.objects.all()
+            if customer_id is not None:
+                orders = orders.filter(customer_id=customer_id)
+            if manager_id is not None:
+                orders = orders.filter(station__manager_id=manager_id)
+            for field in ('customer', 'station', 'status'):
+                if field in filters:
+                    orders = orders.filter(**{field: filters[field]})
+            if 'created_from' in filters:
+                orders = orders.filter(created_at__gte=filters['created_from'])
+            if 'created_to' in filters:
+                orders = orders.filter(created_at__lt=filters['created_to'])
+
+            if cursor:
+                last_created, last_id = decode_cursor(cursor)
+                last_created = parse_datetime(last_created)
+                if last_created is None or not isinstance(last_id, int):
+                    raise InvalidCursor("Invalid cursor")
+                orders = orders.filter(
+                    Q(created_at__lt=last_created) | Q(id__lt=last_id), created_at__lte=last_created
+                )
+
+            rows = list(
+                orders.order_by('-created_at', '-id')
+                .values_list(*OrderSummaryProjection.lookups(), 'created_at')[:limit + 1]
+            )
+            page, next_cursor = keyset_page(rows, limit, lambda row: [row[-1].isoformat(), row[0]])
+            return RepositoryResponse(
+                success=True,
+                data={"orders": [OrderSummaryProjection.build(row) for row in page], "next_cursor": next_cursor},
+                status_code=status.HTTP_200_OK
+            )
+        except (InvalidCursor, TypeError, ValueError):
+            return RepositoryResponse(
+                success=False,
+                message="Invalid cursor",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+    @staticmethod
+    def claim(order_id: int, status_value: str, **fields) -> bool:
+        """
+        Move a pending order to `status_value` with one conditional UPDATE;
+        False if it is no longer pending (another request got there first).
+        """
+        return bool(Order.objects.filter(pk=order_id, status=Order.PENDING).update(
+            status=status_value, updated_at=timezone.now(), **fields
+        ))
+
+    @staticmethod
+    def order_lines(order_id: int) -> list:
+        return list(OrderLine.objects.filter(order_id=order_id).values_list('product_id', 'quantity'))
+
+    @staticmethod
+    def reservation_deadlines(limit: int) -> list:
+        """(expires_at, id) of the `limit` pending orders due soonest, in order from the (status, expires_at) index."""
+        return list(
+            Order.objects.filter(status=Order.PENDING, expires_at__isnull=False)
+            .order_by('expires_at', 'id')
+            .values_list('expires_at', 'id')[:limit]
+        )
+
+    @staticmethod
+    def expire_orders(order_ids: list, now) -> list:
+        """
+        Expire those of `order_ids` that are still pending and due at `now`
+        and release the stock they hold; returns the ids expired. Rows are
+        claimed with SELECT ... FOR UPDATE SKIP LOCKED where the database
+        has it, so concurrent workers split a batch instead of waiting on
+        each other; the status-guarded UPDATE then raises StockConflict if
+        another worker expired any of them first (on SQLite, which has no
+        row locks). Must run inside the caller's transaction.
+        """
+        ids = list(
+            Order.objects.select_for_update(skip_locked=True)
+            .filter(id__in=order_ids, status=Order.PENDING, expires_at__lte=now)
+            .values_list('id', flat=True)
+        )
+        if not ids:
+            return []
+        updated = Order.objects.filter(id__in=ids, status=Order.PENDING).update(
+            status=Order.EXPIRED, expires_at=None, updated_at=now
+        )
+        if updated != len(ids):
+            raise StockConflict("Orders were expired concurrently")
+
+        held = (
+            OrderLine.objects.filter(order_id__in=ids)
+            .values('order__station_id', 'product_id')
+            .annotate(quantity=Sum('quantity'))
+            .order_by()
+            .values_list('order__station_id', 'product_id', 'quantity')
+        )
+        StockRepository.release({(station_id, product_id): quantity for station_id, product_id, quantity in held})
+        return ids
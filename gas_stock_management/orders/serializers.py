@@ -0,0 +1,68 @@
+from decimal import Decimal
+from rest_framework import serializers
+from products.models import PriceRule
+from .models import Order, OrderBatch, OrderLine
+
+
+class OrderLineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderLine
+        fields = ['product', 'quantity', 'unit_price', 'total']
+
+
+class OrderSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Order
+        fields = ['id', 'number', 'customer', 'station', 'tier', 'status', 'total', 'expires_at', 'created_at']
+
+
+class OrderSerializer(OrderSummarySerializer):
+    lines = OrderLineSerializer(many=True, read_only=True)
+
+    class Meta(OrderSummarySerializer.Meta):
+        fields = OrderSummarySerializer.Meta.fields + ['lines']
+
+
+class PlaceOrderLineSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    quantity = serializers.DecimalField(max_digits=14, decimal_places=3, min_value=Decimal('0.001'))
+
+
+class PlaceOrderSerializer(serializers.Serializer):
+    """A retail order from one station; repeated products are merged into one line."""
+    MAX_LINES = 200
+
+    station = serializers.IntegerField()
+    lines = PlaceOrderLineSerializer(many=True, allow_empty=False, max_length=MAX_LINES)
+
+    def validate_lines(self, lines):
+        merged = {}
+        for line in lines:
+            merged[line['product']] = merged.get(line['product'], Decimal('0')) + line['quantity']
+        return [{"product": product_id, "quantity": quantity} for product_id, quantity in merged.items()]
+
+
+class OrderHistoryQuerySerializer(serializers.Serializer):
+    """Order list filters; `created_to` is exclusive."""
+    customer = serializers.IntegerField(required=False)
+    station = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES, required=False)
+    created_from = serializers.DateTimeField(required=False)
+    created_to = serializers.DateTimeField(required=False)
+
+
+class OrderBatchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderBatch
+        fields = ['id', 'status', 'format', 'tier', 'lines_processed', 'lines_failed', 'orders_placed', 'message',
+                  'created_at', 'finished_at']
+
+
+class OrderBatchReportSerializer(OrderBatchSerializer):
+    class Meta(OrderBatchSerializer.Meta):
+        fields = OrderBatchSerializer.Meta.fields + ['report']
+
+
+class OrderBatchUploadSerializer(serializers.Serializer):
+    format = serializers.ChoiceField(choices=OrderBatch.FORMAT_CHOICES)
+    tier = serializers.ChoiceField(choices=PriceRule.TIER_CHOICES, default=PriceRule.WHOLESALE)
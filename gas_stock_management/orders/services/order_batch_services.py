@@ -0,0 +1,379 @@
+import csv
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from gas_stock_management.uploads import parse_rows
+from orders.batches import get_batch_pool
+from orders.models import OrderBatch
+from orders.repository.order_batch_repository import OrderBatchRepository
+from orders.serializers import OrderBatchReportSerializer, OrderBatchSerializer, OrderBatchUploadSerializer
+from orders.services.orders_services import OrdersService
+from products.services.pricing_services import PricingService
+from stock.concurrency import StockConflict, run_with_retries
+
+BATCH_FIELDS = ('customer', 'station', 'product', 'quantity', 'reference')
+MAX_REFERENCE_LENGTH = 200
+MAX_QUANTITY = Decimal('1e11')
+# Batch references share the customer's idempotency keys with checkout requests
+KEY_PREFIX = 'batch:'
+
+
+class OrderBatchService:
+    """
+    Places a distributor's order lines in bulk. Each line names a customer
+    (username), a station (code), a product (SKU), a quantity and an
+    optional `reference`: lines with the same customer and reference make
+    up one order and the reference is its idempotency key, so uploading a
+    file again does not order twice (uploading it with other lines for the
+    reference fails them instead). Lines without a reference are grouped
+    by customer and station within their chunk.
+
+    Lines are processed in chunks of ORDERS['BATCH_CHUNK_SIZE']. Consecutive
+    lines of one reference stay in the same chunk; a reference that comes
+    back after its chunk was placed fails those lines. One query each resolves
+    the chunk's customers, stations and products, prices come from the
+    in-process price index (brought up to date once per chunk), and one
+    query each reads the keys already used and the stock left. The orders
+    that fit are then placed in a single transaction. Every line succeeds
+    or fails on its own; an order is placed with the lines that could be.
+    """
+
+    @staticmethod
+    def _chunk_size() -> int:
+        return getattr(settings, 'ORDERS', {}).get('BATCH_CHUNK_SIZE', 500)
+
+    @staticmethod
+    def _reservation_minutes() -> int:
+        return getattr(settings, 'ORDERS', {}).get('BATCH_RESERVATION_MINUTES', 24 * 60)
+
+    @staticmethod
+    def parse_stream(stream, fmt: str):
+        """Yield line dicts from a text or binary stream in `csv` or `json` format."""
+        yield from parse_rows(stream, fmt, 'lines')
+
+    @staticmethod
+    def _chunks(numbered, size: int):
+        """Lists of about `size` (line number, line) pairs, never splitting consecutive lines of one reference."""
+        chunk, last = [], None
+        for item in numbered:
+            raw = item[1]
+            key = (raw.get('customer'), raw.get('reference')) if isinstance(raw, dict) and raw.get('reference') else None
+            if len(chunk) >= size and (key is None or key != last):
+                yield chunk
+                chunk = []
+            chunk.append(item)
+            last = key
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _clean_line(raw) -> tuple:
+        if not isinstance(raw, dict):
+            return None, ["Line must be an object"]
+
+        row = {field: str(raw.get(field) or '').strip() for field in BATCH_FIELDS}
+        errors = [f"{field} is required" for field in ('customer', 'station', 'product') if not row[field]]
+        try:
+            quantity = Decimal(row['quantity'])
+        except InvalidOperation:
+            quantity = None
+        if (quantity is None or not quantity.is_finite() or not 0 < quantity < MAX_QUANTITY
+                or quantity.normalize().as_tuple().exponent < -3):
+            errors.append("Invalid quantity")
+        row['quantity'] = quantity
+        if len(row['reference']) > MAX_REFERENCE_LENGTH:
+            errors.append(f"reference must be at most {MAX_REFERENCE_LENGTH} characters")
+        return row, errors
+
+    @staticmethod
+    def _group_lines(valid: list, refs: dict) -> list:
+        """
+        Resolve the cleaned lines against `refs` and group them into orders:
+        [{"customer_id", "station_id", "reference", "lines": {product id:
+        [quantity, line results]}}], in the order they first appear.
+        """
+        groups = {}
+        for result, row in valid:
+            customer_id = refs['customers'].get(row['customer'])
+            station_id = refs['stations'].get(row['station'])
+            product_id = refs['products'].get(row['product'])
+            if customer_id is None:
+                result['errors'].append("Unknown or inactive customer")
+            if station_id is None:
+                result['errors'].append("Unknown or inactive station")
+            if product_id is None:
+                result['errors'].append("Unknown or inactive product")
+            if result['errors']:
+                continue
+
+            key = (customer_id, row['reference']) if row['reference'] else (customer_id, '', station_id)
+            group = groups.setdefault(key, {
+                "customer_id": customer_id, "station_id": station_id, "reference": row['reference'], "lines": {},
+            })
+            if group['station_id'] != station_id:
+                result['errors'].append("Reference is already used for an order from another station")
+                continue
+            line = group['lines'].setdefault(product_id, [Decimal('0'), []])
+            line[0] += row['quantity']
+            line[1].append(result)
+        return list(groups.values())
+
+    @staticmethod
+    def _price(groups: list, tier: str) -> list:
+        """
+        Price each order's lines; lines with no price fail and orders left
+        without lines are dropped. Each order keeps the digest of all the
+        lines asked for, as checkout does, to tell a replay from a changed
+        reference.
+        """
+        orders = []
+        # One version read for the whole chunk rather than one per order
+        PricingService.refresh_prices()
+        for group in groups:
+            lines = [(product_id, quantity) for product_id, (quantity, _) in group['lines'].items()]
+            request_hash = OrdersService._request_hash({
+                "station": group['station_id'],
+                "lines": [{"product": product_id, "quantity": quantity} for product_id, quantity in lines],
+            })
+            cart = PricingService.price_cart(lines, group['station_id'], tier, refresh=False)
+            priced = []
+            for (product_id, quantity), (unit_price, line_total) in zip(lines, cart['lines']):
+                results = group['lines'][product_id][1]
+                if unit_price is None:
+                    for result in results:
+                        result['errors'].append("No price for this product at this station")
+                    continue
+                priced.append((product_id, quantity, unit_price, line_total, results))
+            if priced:
+                orders.append({**group, "request_hash": request_hash, "lines": priced})
+        return orders
+
+    @staticmethod
+    def _reserve(orders: list, tier: str, expires_at, created_by_id: int = None) -> list:
+        """
+        One attempt at placing the chunk's priced orders: skip those whose
+        reference was already placed (failing them if it was placed with
+        other lines), fit the rest line by line into the stock left and
+        write them. Returns (line results, order number,
+        error, replayed) per line group; raises StockConflict if the stock
+        or keys moved on meanwhile.
+        """
+        keyed = [order for order in orders if order['reference']]
+        placed_keys = OrderBatchRepository.placed_keys(
+            {order['customer_id'] for order in keyed}, {KEY_PREFIX + order['reference'] for order in keyed}
+        )
+        available = OrderBatchRepository.available_stock(
+            {(order['station_id'], line[0]) for order in orders for line in order['lines']}
+        )
+
+        outcomes, plan = [], []
+        for order in orders:
+            key = KEY_PREFIX + order['reference'] if order['reference'] else None
+            placed = placed_keys.get((order['customer_id'], key)) if key else None
+            if placed is not None:
+                number, request_hash = placed
+                if request_hash != order['request_hash']:
+                    outcomes.extend(
+                        (line[4], None, "Reference was already used for a different order", False)
+                        for line in order['lines']
+                    )
+                else:
+                    outcomes.extend((line[4], number, None, True) for line in order['lines'])
+                continue
+            kept = []
+            for product_id, quantity, unit_price, line_total, results in order['lines']:
+                pair = (order['station_id'], product_id)
+                if available.get(pair, Decimal('0')) >= quantity:
+                    available[pair] -= quantity
+                    kept.append((product_id, quantity, unit_price, line_total, results))
+                else:
+                    outcomes.append((results, None, "Insufficient stock", False))
+            if kept:
+                plan.append({
+                    "customer_id": order['customer_id'],
+                    "station_id": order['station_id'],
+                    "idempotency_key": key,
+                    "request_hash": order['request_hash'],
+                    "total": sum((line[3] for line in kept), Decimal('0.00')),
+                    "lines": kept,
+                })
+
+        if plan:
+            rows = OrderBatchRepository.place_orders([
+                {**order, "lines": [line[:4] for line in order['lines']]} for order in plan
+            ], tier, expires_at, created_by_id=created_by_id)
+            for row, order in zip(rows, plan):
+                outcomes.extend((line[4], row.number, None, False) for line in order['lines'])
+        return outcomes
+
+    @staticmethod
+    def _place_chunk(chunk: list, batch: OrderBatch, expires_at, earlier: set) -> tuple:
+        """
+        Place one chunk of (line number, line) pairs; returns (line results,
+        orders placed). `earlier` holds the (customer, reference) pairs of
+        the chunks before, whose orders are already placed: lines naming
+        one fail rather than replay an order they are not part of. The
+        chunk's own pairs are added to it.
+        """
+        results = []
+        valid = []
+        references = set()
+        for index, raw in chunk:
+            row, errors = OrderBatchService._clean_line(raw)
+            results.append({
+                "row": index,
+                "customer": (row or {}).get('customer'),
+                "reference": (row or {}).get('reference'),
+                "product": (row or {}).get('product'),
+                "order": None,
+                "replayed": False,
+                "errors": errors,
+            })
+            if row and row['reference']:
+                key = (row['customer'], row['reference'])
+                if key in earlier:
+                    errors.append("Reference already placed in this batch")
+                references.add(key)
+            if not errors:
+                valid.append((results[-1], row))
+        earlier.update(references)
+
+        refs = OrderBatchRepository.resolve_references(
+            usernames={row['customer'] for _, row in valid},
+            station_codes={row['station'] for _, row in valid},
+            skus={row['product'] for _, row in valid},
+            manager_id=batch.manager_id,
+        )
+        orders = OrderBatchService._price(OrderBatchService._group_lines(valid, refs), batch.tier)
+
+        placed = 0
+        if orders:
+            try:
+                outcomes = run_with_retries(lambda: OrderBatchService._reserve(
+                    orders, batch.tier, expires_at, created_by_id=batch.created_by_id
+                ))
+            except StockConflict as e:
+                outcomes = [(line[4], None, str(e), False) for order in orders for line in order['lines']]
+            placed = len({number for _, number, error, replayed in outcomes if error is None and not replayed})
+            for line_results, number, error, replayed in outcomes:
+                for result in line_results:
+                    result['order'] = number
+                    result['replayed'] = replayed
+                    if error:
+                        result['errors'].append(error)
+
+        for result in results:
+            result['success'] = not result['errors']
+        return results, placed
+
+    @staticmethod
+    def create_batch(payload, fmt: str, tier: str = None, created_by_id: int = None, manager_id: int = None):
+        """Store an upload (text or bytes) as a queued batch."""
+        serializer = OrderBatchUploadSerializer(data={"format": fmt, **({"tier": tier} if tier else {})})
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        try:
+            source = payload.decode('utf-8-sig') if isinstance(payload, bytes) else payload
+        except UnicodeDecodeError as e:
+            return {
+                "success": False,
+                "message": f"Could not parse input: {e}",
+                "data": {},
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+
+        validated = serializer.validated_data
+        batch = OrderBatchRepository.create_batch(
+            source, validated['format'], validated['tier'], created_by_id=created_by_id, manager_id=manager_id
+        )
+        return {
+            "success": True,
+            "message": "Order batch created",
+            "data": {"batch": OrderBatchSerializer(batch).data},
+            "status_code": status.HTTP_201_CREATED
+        }
+
+    @staticmethod
+    def submit(payload, fmt: str, tier: str = None, created_by_id: int = None, manager_id: int = None):
+        """Store the upload and have the batch pool place it once the batch is committed."""
+        response = OrderBatchService.create_batch(
+            payload, fmt, tier=tier, created_by_id=created_by_id, manager_id=manager_id
+        )
+        if not response['success']:
+            return response
+        batch_id = response['data']['batch']['id']
+        transaction.on_commit(lambda: get_batch_pool().submit(OrderBatchService.process, batch_id))
+        return {**response, "message": "Order batch queued", "status_code": status.HTTP_202_ACCEPTED}
+
+    @staticmethod
+    def process(batch_id: int):
+        """Place a queued batch chunk by chunk, keeping its counts current, and store the per-line report."""
+        batch = OrderBatchRepository.claim_batch(batch_id)
+        if batch is None:
+            return {
+                "success": False,
+                "message": "Order batch is not queued",
+                "data": {},
+                "status_code": status.HTTP_409_CONFLICT
+            }
+
+        expires_at = timezone.now() + timedelta(minutes=OrderBatchService._reservation_minutes())
+        numbered = enumerate(OrderBatchService.parse_stream(batch.source, batch.format), start=1)
+        report = []
+        placed = 0
+        references = set()
+        try:
+            for chunk in OrderBatchService._chunks(numbered, OrderBatchService._chunk_size()):
+                results, chunk_placed = OrderBatchService._place_chunk(chunk, batch, expires_at, references)
+                report.extend(results)
+                placed += chunk_placed
+                OrderBatchRepository.record_progress(
+                    batch.id, len(results), sum(1 for result in results if not result['success']), chunk_placed
+                )
+        except (ValueError, csv.Error) as e:
+            message = f"Could not parse input: {e}"
+            OrderBatchRepository.finish_batch(batch.id, OrderBatch.FAILED, message, report)
+            return {
+                "success": False,
+                "message": message,
+                "data": {"batch_id": batch.id, "orders_placed": placed, "rows": report},
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        except Exception as e:
+            OrderBatchRepository.finish_batch(batch.id, OrderBatch.FAILED, str(e), report)
+            raise
+
+        succeeded = sum(1 for result in report if result['success'])
+        message = f"Placed {placed} orders from {succeeded} of {len(report)} lines"
+        OrderBatchRepository.finish_batch(batch.id, OrderBatch.COMPLETED, message, report)
+        return {
+            "success": succeeded == len(report),
+            "message": message,
+            "data": {"batch_id": batch.id, "orders_placed": placed, "rows": report},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def get_batch(batch_id: int, created_by_id: int = None):
+        repo_response = OrderBatchRepository.get_batch(batch_id, created_by_id=created_by_id)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": "Order batch retrieved successfully",
+            "data": {"batch": OrderBatchReportSerializer(repo_response.data['batch']).data},
+            "status_code": status.HTTP_200_OK
+        }
@@ -0,0 +1,280 @@
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from gas_stock_management.response import RepositoryResponse
+from orders.models import Order
+from orders.repository.orders_repository import OrdersRepository
+from gas_stock_management.pagination import DEFAULT_PAGE_SIZE
+from orders.serializers import OrderHistoryQuerySerializer, OrderSerializer, PlaceOrderSerializer
+from products.models import PriceRule
+from products.services.pricing_services import PricingService
+from stock.concurrency import StockConflict, run_with_retries
+from stock.models import StockMovement
+from stock.repository.stock_repository import StockRepository
+from stock.services.stock_service import StockService
+
+
+class OrdersService:
+
+    @staticmethod
+    def _request_hash(validated: dict) -> str:
+        """Digest of what an order request asks for, to tell a retry from a different request under the same key."""
+        canonical = {
+            "station": validated['station'],
+            "lines": sorted([line['product'], str(line['quantity'].normalize())] for line in validated['lines']),
+        }
+        return hashlib.sha256(json.dumps(canonical, separators=(',', ':')).encode()).hexdigest()
+
+    @staticmethod
+    def _replay(order: Order, request_hash: str):
+        if order.request_hash != request_hash:
+            return {
+                "success": False,
+                "message": "Idempotency-Key was already used for a different order request",
+                "data": {},
+                "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY
+            }
+        return {
+            "success": True,
+            "message": "Order already placed",
+            "data": {"order": OrderSerializer(order).data, "replayed": True},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def place_order(data: dict, customer_id: int, idempotency_key: str = None):
+        """
+        Price and place a retail order, holding its stock for
+        ORDERS['RESERVATION_MINUTES']. With an Idempotency-Key, a request
+        already placed under it returns that order instead (one indexed
+        lookup) and the same key with a different request is rejected.
+        """
+        serializer = PlaceOrderSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        validated = serializer.validated_data
+        request_hash = OrdersService._request_hash(validated) if idempotency_key else ''
+        if idempotency_key:
+            existing = OrdersRepository.find_by_key(customer_id, idempotency_key)
+            if existing is not None:
+                return OrdersService._replay(existing, request_hash)
+
+        station_id = validated['station']
+        lines = [(line['product'], line['quantity']) for line in validated['lines']]
+        stations, products = StockRepository.active_ids([station_id], [product_id for product_id, _ in lines])
+        unknown = [product_id for product_id, _ in lines if product_id not in products]
+        if station_id not in stations or unknown:
+            return {
+                "success": False,
+                "message": "Unknown or inactive station or products",
+                "data": {"station": station_id if station_id not in stations else None, "products": unknown},
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        cart = PricingService.price_cart(lines, station_id, PriceRule.RETAIL)
+        if cart['unpriced']:
+            return {
+                "success": False,
+                "message": "Some products have no price at this station",
+                "data": {"products": cart['unpriced']},
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+
+        minutes = getattr(settings, 'ORDERS', {}).get('RESERVATION_MINUTES', 15)
+        priced = [
+            (product_id, quantity, unit_price, line_total)
+            for (product_id, quantity), (unit_price, line_total) in zip(lines, cart['lines'])
+        ]
+        try:
+            repo_response = run_with_retries(lambda: OrdersRepository.place_order(
+                customer_id, station_id, PriceRule.RETAIL, priced, cart['total'],
+                expires_at=timezone.now() + timedelta(minutes=minutes),
+                idempotency_key=idempotency_key,
+                request_hash=request_hash,
+            ))
+        except StockConflict as e:
+            repo_response = RepositoryResponse(success=False, message=str(e), status_code=status.HTTP_409_CONFLICT)
+        if not repo_response.success:
+            existing = OrdersRepository.find_by_key(customer_id, idempotency_key) if idempotency_key else None
+            if existing is not None:
+                return OrdersService._replay(existing, request_hash)
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+
+        order = OrdersRepository.get_order(repo_response.data['order'].id).data['order']
+        return {
+            "success": True,
+            "message": repo_response.message,
+            "data": {"order": OrderSerializer(order).data, "replayed": False},
+            "status_code": status.HTTP_201_CREATED
+        }
+
+    @staticmethod
+    def get_order(order_id: int, customer_id: int = None, manager_id: int = None):
+        repo_response = OrdersRepository.get_order(order_id, customer_id=customer_id, manager_id=manager_id)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": "Order retrieved successfully",
+            "data": {"order": OrderSerializer(repo_response.data['order']).data},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def list_orders(params: dict, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE, customer_id: int = None,
+                    manager_id: int = None):
+        serializer = OrderHistoryQuerySerializer(data=params)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid filters",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        repo_response = OrdersRepository.list_orders(
+            serializer.validated_data, cursor=cursor, limit=limit, customer_id=customer_id, manager_id=manager_id
+        )
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": "Orders retrieved successfully",
+            "data": repo_response.data,
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def _apply_confirm(order: Order, user_id: int = None):
+        """Claim the pending order, release its hold and book the sale, all in one transaction."""
+        with transaction.atomic():
+            if not OrdersRepository.claim(order.id, Order.CONFIRMED, expires_at=None, updated_by_id=user_id):
+                return RepositoryResponse(
+                    success=False,
+                    message="Only pending orders can be confirmed",
+                    status_code=status.HTTP_409_CONFLICT
+                )
+            lines = OrdersRepository.order_lines(order.id)
+            StockRepository.release(OrdersRepository.held_quantities(order.station_id, lines))
+            repo_response = StockRepository.record_movements([
+                {
+                    "station_id": order.station_id,
+                    "product_id": product_id,
+                    "movement_type": StockMovement.SALE,
+                    "quantity": -quantity,
+                    "reference": order.number,
+                    "note": "order",
+                }
+                for product_id, quantity in lines
+            ], created_by_id=user_id)
+            if not repo_response.success:
+                transaction.set_rollback(True)
+                return repo_response
+            StockService._detect_low_stock(repo_response.data['deltas'], repo_response.data['balances'])
+        return repo_response
+
+    @staticmethod
+    def _apply_cancel(order: Order, user_id: int = None):
+        with transaction.atomic():
+            if not OrdersRepository.claim(order.id, Order.CANCELLED, expires_at=None, updated_by_id=user_id):
+                return RepositoryResponse(
+                    success=False,
+                    message="Only pending orders can be cancelled",
+                    status_code=status.HTTP_409_CONFLICT
+                )
+            StockRepository.release(OrdersRepository.held_quantities(
+                order.station_id, OrdersRepository.order_lines(order.id)
+            ))
+        return RepositoryResponse(success=True, status_code=status.HTTP_200_OK)
+
+    @staticmethod
+    def _transition(apply, message: str, order_id: int, user_id: int = None, **scope):
+        repo_response = OrdersRepository.get_order(order_id, **scope)
+        if repo_response.success:
+            order = repo_response.data['order']
+            try:
+                repo_response = run_with_retries(lambda: apply(order, user_id=user_id))
+            except StockConflict as e:
+                repo_response = RepositoryResponse(success=False, message=str(e), status_code=status.HTTP_409_CONFLICT)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": message,
+            "data": {"order": OrderSerializer(OrdersRepository.get_order(order_id).data['order']).data},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def confirm_order(order_id: int, user_id: int = None, customer_id: int = None, manager_id: int = None):
+        """
+        Payment received: the held stock is sold (ledger rows referenced by
+        the order number). Scoped like `cancel_order`.
+        """
+        return OrdersService._transition(
+            OrdersService._apply_confirm, "Order confirmed", order_id, user_id=user_id,
+            customer_id=customer_id, manager_id=manager_id
+        )
+
+    @staticmethod
+    def cancel_order(order_id: int, user_id: int = None, customer_id: int = None, manager_id: int = None):
+        return OrdersService._transition(
+            OrdersService._apply_cancel, "Order cancelled", order_id, user_id=user_id,
+            customer_id=customer_id, manager_id=manager_id
+        )
+
+    @staticmethod
+    def reservation_deadlines(limit: int) -> list:
+        return OrdersRepository.reservation_deadlines(limit)
+
+    @staticmethod
+    def expire_reservations(order_ids: list, now=None):
+        """Release the stock of those orders that are still unpaid past their deadline, in one transaction."""
+        now = now or timezone.now()
+
+        def attempt():
+            with transaction.atomic():
+                return OrdersRepository.expire_orders(order_ids, now)
+
+        try:
+            expired = run_with_retries(attempt)
+        except StockConflict as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "data": {"expired": []},
+                "status_code": status.HTTP_409_CONFLICT
+            }
+        return {
+            "success": True,
+            "message": f"{len(expired)} orders expired",
+            "data": {"expired": expired},
+            "status_code": status.HTTP_200_OK
+        }
@@ -0,0 +1,261 @@
+import json
+import os
+import tempfile
+import time
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from orders.models import Order, OrderBatch, OrderLine
+from orders.services.order_batch_services import OrderBatchService
+from orders.tests.test_orders import OrderFixtures
+from products.models import PriceRule, Product
+from products.pricing import PriceIndex
+from stock.models import Station, StockBalance
+
+
+class BatchFixtures(OrderFixtures):
+    def _setup_batch(self, opening_stock='100'):
+        self._setup_catalog(opening_stock=opening_stock)
+        PriceRule.objects.create(
+            product=self.product, tier=PriceRule.WHOLESALE, price=Decimal('20.00'),
+            effective_from=timezone.now() - timezone.timedelta(days=1),
+        )
+        self.retailers = [self._customer(f'shop{n}') for n in range(3)]
+
+    @staticmethod
+    def _csv(lines) -> str:
+        rows = ['customer,station,product,quantity,reference']
+        rows.extend(','.join(str(value) for value in line) for line in lines)
+        return '\n'.join(rows) + '\n'
+
+    @staticmethod
+    def _retailers(count: int) -> list:
+        """Usernames of `count` new customers, inserted at once (they never log in, so no password hashing)."""
+        users = User.objects.bulk_create([User(username=f'retail{n}') for n in range(count)])
+        return [user.username for user in users]
+
+    def _run(self, source, fmt='csv', **kwargs):
+        batch_id = OrderBatchService.create_batch(source, fmt, **kwargs)['data']['batch']['id']
+        return OrderBatchService.process(batch_id)
+
+
+class OrderBatchTests(BatchFixtures, TestCase):
+    def setUp(self):
+        self._setup_batch()
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def test_lines_are_grouped_into_orders_at_wholesale_prices(self):
+        result = self._run(self._csv([
+            ('shop0', 'KGL01', 'LPG-12', '2', 'A-1'),
+            ('shop0', 'KGL01', 'LPG-12', '1', 'A-1'),
+            ('shop0', 'KGL01', 'LPG-12', '4', 'A-2'),
+            ('shop1', 'KGL01', 'LPG-12', '3', ''),
+        ]))
+
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual(result['data']['orders_placed'], 3)
+        rows = result['data']['rows']
+        self.assertEqual(rows[0]['order'], rows[1]['order'])
+        self.assertEqual(len({row['order'] for row in rows}), 3)
+        first = Order.objects.get(number=rows[0]['order'])
+        self.assertEqual((first.tier, first.total, first.idempotency_key), ('wholesale', Decimal('60.00'), 'batch:A-1'))
+        self.assertEqual(OrderLine.objects.filter(order=first).count(), 1)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('10'))
+
+        batch = OrderBatch.objects.get()
+        self.assertEqual((batch.status, batch.lines_processed, batch.lines_failed, batch.orders_placed),
+                         (OrderBatch.COMPLETED, 4, 0, 3))
+        self.assertEqual(batch.source, '')
+        self.assertEqual(len(batch.report), 4)
+
+    def test_each_line_fails_on_its_own(self):
+        hose = Product.objects.create(name='Hose', sku='HOSE', category='accessory')
+        managed = Station.objects.create(name='Huye', code='HUY01', manager=self._customer('boss'))
+        result = self._run(json.dumps({"lines": [
+            {"customer": 'shop0', "station": 'KGL01', "product": 'LPG-12', "quantity": '5', "reference": 'R1'},
+            {"customer": 'nobody', "station": 'KGL01', "product": 'LPG-12', "quantity": '1'},
+            {"customer": 'shop0', "station": 'KGL01', "product": 'NOPE', "quantity": '1', "reference": 'R1'},
+            {"customer": 'shop0', "station": 'KGL01', "product": 'HOSE', "quantity": '1', "reference": 'R1'},
+            {"customer": 'shop0', "station": 'KGL01', "product": 'LPG-12', "quantity": '-1'},
+            {"customer": 'shop1', "station": 'KGL01', "product": 'LPG-12', "quantity": '96'},
+            {"customer": 'shop2', "station": 'KGL01', "product": 'LPG-12', "quantity": '95'},
+            {"customer": 'shop0', "station": 'HUY01', "product": 'LPG-12', "quantity": '1', "reference": 'R1'},
+            "not a line",
+        ]}), fmt='json')
+
+        self.assertFalse(result['success'])
+        errors = [row['errors'] for row in result['data']['rows']]
+        self.assertEqual(errors, [
+            [],
+            ["Unknown or inactive customer"],
+            ["Unknown or inactive product"],
+            ["No price for this product at this station"],
+            ["Invalid quantity"],
+            ["Insufficient stock"],
+            [],
+            ["Reference is already used for an order from another station"],
+            ["Line must be an object"],
+        ])
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(StockBalance.objects.get(station=self.station).reserved, Decimal('100'))
+        self.assertEqual(OrderBatch.objects.get().lines_failed, 7)
+        self.assertFalse(hose.order_lines.exists())
+        self.assertFalse(Order.objects.filter(station=managed).exists())
+
+    def test_uploading_again_does_not_order_twice(self):
+        source = self._csv([('shop0', 'KGL01', 'LPG-12', '2', 'DAY-1'), ('shop1', 'KGL01', 'LPG-12', '2', 'DAY-1')])
+        first = self._run(source)['data']['rows']
+
+        again = self._run(source)
+        self.assertEqual(again['data']['orders_placed'], 0)
+        self.assertEqual([row['order'] for row in again['data']['rows']], [row['order'] for row in first])
+        self.assertTrue(all(row['replayed'] and row['success'] for row in again['data']['rows']))
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('4'))
+
+    def test_changed_reference_is_not_replayed(self):
+        self._run(self._csv([('shop0', 'KGL01', 'LPG-12', '2', 'DAY-1')]))
+
+        again = self._run(self._csv([('shop0', 'KGL01', 'LPG-12', '3', 'DAY-1')]))
+        self.assertEqual(again['data']['rows'][0]['errors'], ["Reference was already used for a different order"])
+        self.assertIsNone(again['data']['rows'][0]['order'])
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('2'))
+
+    @override_settings(ORDERS={'BATCH_CHUNK_SIZE': 1})
+    def test_reference_split_across_chunks_is_not_reported_as_placed(self):
+        result = self._run(self._csv([
+            ('shop0', 'KGL01', 'LPG-12', '2', 'R1'),
+            ('shop1', 'KGL01', 'LPG-12', '1', ''),
+            ('shop0', 'KGL01', 'LPG-12', '3', 'R1'),
+        ]))
+
+        rows = result['data']['rows']
+        self.assertEqual([row['success'] for row in rows], [True, True, False])
+        self.assertEqual(rows[2]['errors'], ["Reference already placed in this batch"])
+        self.assertFalse(rows[2]['replayed'])
+        self.assertEqual(result['data']['orders_placed'], 2)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('3'))
+
+    @override_settings(ORDERS={'BATCH_CHUNK_SIZE': 50})
+    def test_reads_per_chunk_do_not_grow_with_its_lines(self):
+        customers = self._retailers(40)
+        lines = [(customers[n % 40], 'KGL01', 'LPG-12', '0.5', f'R{n % 40}') for n in range(80)]
+        lines.sort(key=lambda line: line[4])
+        PriceIndex.refresh()
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self._run(self._csv(lines))
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual(result['data']['orders_placed'], 40)
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        # The batch itself, then catalog version, customers, stations, products, used keys and stock per chunk
+        self.assertEqual(len(selects), 1 + 6 * 2)
+        self.assertEqual(OrderLine.objects.count(), 40)
+
+    def test_unparseable_input_fails_the_batch(self):
+        result = self._run('{"lines": [', fmt='json')
+        self.assertEqual(result['status_code'], status.HTTP_400_BAD_REQUEST)
+        batch = OrderBatch.objects.get()
+        self.assertEqual(batch.status, OrderBatch.FAILED)
+        self.assertIn('Could not parse input', batch.message)
+        self.assertEqual(OrderBatchService.process(batch.id)['status_code'], status.HTTP_409_CONFLICT)
+
+    def test_endpoint_queues_the_batch_and_reports_per_line(self):
+        manager = self._customer('manager')
+        manager.profile.role = 'manager'
+        manager.profile.save()
+        self.station.manager = manager
+        self.station.save()
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        upload = SimpleUploadedFile('orders.csv', self._csv([('shop0', 'KGL01', 'LPG-12', '2', 'X')]).encode())
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = client.post(reverse('order-batches'), {"file": upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(callbacks), 1)
+        batch_id = response.data['data']['batch']['id']
+        self.assertEqual(response.data['data']['batch']['status'], OrderBatch.QUEUED)
+
+        OrderBatchService.process(batch_id)
+        response = client.get(reverse('order-batch-detail', args=[batch_id]))
+        self.assertEqual(response.data['data']['batch']['status'], OrderBatch.COMPLETED)
+        self.assertTrue(response.data['data']['batch']['report'][0]['success'])
+
+        other = self._customer('other-manager')
+        other.profile.role = 'manager'
+        other.profile.save()
+        client.force_authenticate(user=other)
+        self.assertEqual(client.get(reverse('order-batch-detail', args=[batch_id])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        response = client.post(reverse('order-batches'), [{"customer": 'shop0'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        client.force_authenticate(user=self.retailers[0])
+        self.assertEqual(client.post(reverse('order-batches'), [], format='json').status_code,
+                         status.HTTP_403_FORBIDDEN)
+
+    def test_command_places_a_file_and_queued_batches(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write(self._csv([('shop0', 'KGL01', 'LPG-12', '2', 'C1'), ('ghost', 'KGL01', 'LPG-12', '1', '')]))
+        self.addCleanup(os.unlink, handle.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_orders', handle.name, user='shop2', stdout=out, stderr=err)
+        self.assertIn('Placed 1 orders from 1 of 2 lines', out.getvalue())
+        self.assertIn('line 2 (ghost): Unknown or inactive customer', err.getvalue())
+        self.assertEqual(Order.objects.get().created_by, self.retailers[2])
+
+        OrderBatchService.create_batch(self._csv([('shop1', 'KGL01', 'LPG-12', '1', '')]), 'csv')
+        out = StringIO()
+        call_command('import_orders', queued=True, stdout=out)
+        self.assertIn('Processed 1 queued batches', out.getvalue())
+        self.assertEqual(Order.objects.count(), 2)
+
+
+@skipUnless(connection.vendor != 'sqlite' or connection.settings_dict['TEST']['NAME'],
+            "needs a file-based test database: set THREADED_TESTS=1")
+class BackgroundBatchTests(BatchFixtures, TransactionTestCase):
+    """The upload is placed by the batch pool, on its own connection, once the request has committed."""
+
+    def setUp(self):
+        self._setup_batch(opening_stock='1000')
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def test_large_upload_is_placed_in_the_background(self):
+        customers = self._retailers(200)
+        source = self._csv((customers[n // 10], 'KGL01', 'LPG-12', '0.1', f'R{n // 10}') for n in range(2000))
+        admin = User.objects.create_user(username='admin', email='admin@test.com', password='pass123')
+        admin.profile.role = 'admin'
+        admin.profile.save()
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        upload = SimpleUploadedFile('orders.csv', source.encode())
+        response = client.post(reverse('order-batches'), {"file": upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        batch_id = response.data['data']['batch']['id']
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            batch = client.get(reverse('order-batch-detail', args=[batch_id])).data['data']['batch']
+            if batch['status'] in (OrderBatch.COMPLETED, OrderBatch.FAILED):
+                break
+            time.sleep(0.05)
+        self.assertEqual((batch['status'], batch['orders_placed'], batch['lines_failed']),
+                         (OrderBatch.COMPLETED, 200, 0))
+        self.assertEqual(len(batch['report']), 2000)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('200'))
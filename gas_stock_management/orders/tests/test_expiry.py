@@ -0,0 +1,135 @@
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from orders.expiry import ExpiryWorker
+from orders.models import Order
+from orders.repository.orders_repository import OrdersRepository
+from orders.services.orders_services import OrdersService
+from orders.tests.test_orders import OrderFixtures
+from products.pricing import PriceIndex
+from stock.models import StockBalance
+
+
+class ExpiryWorkerTests(OrderFixtures, TestCase):
+    def setUp(self):
+        self._setup_catalog()
+        self.customer = self._customer()
+        self.now = timezone.now()
+        self.orders = []
+        # Deadlines 10 and 5 minutes ago, 1 minute ago, and 20 minutes from now
+        for minutes in (-10, -5, -1, 20):
+            order_id = OrdersService.place_order(self._payload('2'), self.customer.id)['data']['order']['id']
+            Order.objects.filter(pk=order_id).update(expires_at=self.now + timedelta(minutes=minutes))
+            self.orders.append(order_id)
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def _statuses(self):
+        return list(Order.objects.order_by('expires_at', 'id').values_list('status', flat=True))
+
+    def test_due_orders_are_released_in_batches(self):
+        worker = ExpiryWorker(batch_size=2)
+        worker.load(self.now)
+        self.assertEqual([order_id for _, order_id in sorted(worker.heap)], self.orders)
+
+        with mock.patch.object(OrdersService, 'expire_reservations', wraps=OrdersService.expire_reservations) as expire:
+            result = worker.release_due(self.now)
+        self.assertEqual(result, {"expired": 3, "failed": 0})
+        self.assertEqual([call.args[0] for call in expire.call_args_list], [self.orders[:2], self.orders[2:3]])
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('2'))
+        self.assertEqual(Order.objects.filter(status=Order.EXPIRED).count(), 3)
+        self.assertEqual(worker.seconds_until_next(self.now), worker.max_sleep)
+        self.assertEqual(worker.seconds_until_next(self.now + timedelta(minutes=19, seconds=50)), 10)
+
+    def test_orders_paid_after_loading_are_left_alone(self):
+        worker = ExpiryWorker()
+        worker.load(self.now)
+        OrdersService.confirm_order(self.orders[0])
+        OrdersService.cancel_order(self.orders[1])
+
+        self.assertEqual(worker.release_due(self.now)['expired'], 1)
+        self.assertEqual(self._statuses(), ['confirmed', 'cancelled', 'expired', 'pending'])
+        balance = StockBalance.objects.get()
+        self.assertEqual((balance.quantity, balance.reserved), (Decimal('8'), Decimal('2')))
+
+    def test_each_order_is_claimed_by_one_worker(self):
+        first, second = ExpiryWorker(), ExpiryWorker()
+        first.load(self.now)
+        second.load(self.now)
+
+        self.assertEqual(first.release_due(self.now)['expired'], 3)
+        self.assertEqual(second.release_due(self.now)['expired'], 0)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('2'))
+
+    def test_deadlines_come_from_the_index(self):
+        queryset = Order.objects.filter(status=Order.PENDING, expires_at__isnull=False).order_by('expires_at', 'id')
+        sql, params = queryset.values_list('expires_at', 'id')[:10].query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('order_status_expiry_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+        self.assertEqual([order_id for _, order_id in OrdersRepository.reservation_deadlines(2)], self.orders[:2])
+
+    def test_run_sleeps_until_the_next_deadline(self):
+        sleeps = []
+        worker = ExpiryWorker(max_sleep=3600)
+        with mock.patch('orders.expiry.timezone.now', return_value=self.now):
+            worker.run(should_stop=lambda: len(sleeps) == 1, sleep=sleeps.append)
+        self.assertAlmostEqual(sleeps[0], 20 * 60, delta=1)
+        self.assertEqual(self._statuses(), ['expired', 'expired', 'expired', 'pending'])
+
+    def test_command_once(self):
+        out = StringIO()
+        call_command('expire_reservations', once=True, stdout=out)
+        self.assertIn('Expired 3 orders', out.getvalue())
+
+
+@skipUnless(connection.vendor != 'sqlite' or connection.settings_dict['TEST']['NAME'],
+            "needs a file-based test database: set THREADED_TESTS=1")
+@override_settings(STOCK_CONCURRENCY={'MAX_RETRIES': 50, 'BASE_DELAY': 0.002, 'MAX_DELAY': 0.05})
+class ConcurrentExpiryTests(OrderFixtures, TransactionTestCase):
+    """Several worker processes (threads on their own connections) sharing the same due orders."""
+    WORKERS = 4
+    ORDERS = 40
+
+    def setUp(self):
+        self._setup_catalog(opening_stock=str(self.ORDERS))
+        customer = self._customer()
+        for _ in range(self.ORDERS):
+            OrdersService.place_order(self._payload('1'), customer.id)
+        Order.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def test_every_order_expires_exactly_once(self):
+        expired = []
+        lock = threading.Lock()
+        start = threading.Barrier(self.WORKERS)
+
+        def worker():
+            try:
+                start.wait()
+                result = ExpiryWorker(batch_size=5).run_once()
+                with lock:
+                    expired.append(result['expired'])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(expired), self.ORDERS)
+        self.assertEqual(Order.objects.filter(status=Order.EXPIRED).count(), self.ORDERS)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('0'))
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from orders.models import Order
+from orders.services.orders_services import OrdersService
+from stock.models import Station
+
+START = datetime(2026, 3, 1, 8, tzinfo=dt_timezone.utc)
+
+
+class OrderHistoryTests(TestCase):
+    def setUp(self):
+        self.admin = self._user('admin', 'admin')
+        self.manager = self._user('manager', 'manager')
+        self.alice = self._user('alice', 'customer')
+        self.bob = self._user('bob', 'customer')
+        self.managed = Station.objects.create(name='Kigali Central', code='KGL01', manager=self.manager)
+        self.other = Station.objects.create(name='Huye', code='HUY01')
+
+        # 30 orders, two per timestamp so (created_at, id) ties are broken by id
+        orders = [
+            Order(
+                number=f'N{i:04d}',
+                customer=self.alice if i % 3 else self.bob,
+                station=self.managed if i % 2 else self.other,
+                status=Order.PENDING if i % 5 else Order.CONFIRMED,
+                total=Decimal('10.00'),
+            )
+            for i in range(30)
+        ]
+        Order.objects.bulk_create(orders)
+        for i, order in enumerate(Order.objects.order_by('id')):
+            Order.objects.filter(pk=order.pk).update(created_at=START + timedelta(hours=i // 2))
+
+    @staticmethod
+    def _user(username, role):
+        user = User.objects.create_user(username=username, email=f'{username}@test.com', password='pass123')
+        user.profile.role = role
+        user.profile.save()
+        return user
+
+    def _expected(self, **filters):
+        return list(Order.objects.filter(**filters).order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def _walk(self, page_size=4, params=None, **scope):
+        seen, cursor = [], None
+        while True:
+            with self.assertNumQueries(1):
+                response = OrdersService.list_orders(params or {}, cursor=cursor, limit=page_size, **scope)
+            self.assertTrue(response['success'], response['message'])
+            seen.extend(order['id'] for order in response['data']['orders'])
+            cursor = response['data']['next_cursor']
+            if cursor is None:
+                return seen
+
+    def test_customer_pages_cost_one_query_each(self):
+        self.assertEqual(self._walk(customer_id=self.alice.id), self._expected(customer=self.alice))
+        self.assertEqual(self._walk(page_size=1, customer_id=self.bob.id), self._expected(customer=self.bob))
+
+    def test_manager_sees_only_their_stations(self):
+        self.assertEqual(self._walk(manager_id=self.manager.id), self._expected(station=self.managed))
+        self.assertEqual(
+            self._walk(params={"status": Order.PENDING}, manager_id=self.manager.id),
+            self._expected(station=self.managed, status=Order.PENDING),
+        )
+        self.assertEqual(self._walk(params={"station": self.other.id}, manager_id=self.manager.id), [])
+
+    def test_admin_filters_and_date_range(self):
+        params = {
+            "customer": self.alice.id,
+            "created_from": (START + timedelta(hours=3)).isoformat(),
+            "created_to": (START + timedelta(hours=10)).isoformat(),
+        }
+        self.assertEqual(
+            self._walk(params=params),
+            self._expected(
+                customer=self.alice, created_at__gte=START + timedelta(hours=3), created_at__lt=START + timedelta(hours=10)
+            ),
+        )
+        self.assertEqual(self._walk(params={"status": Order.CONFIRMED}), self._expected(status=Order.CONFIRMED))
+        self.assertEqual(self._walk(page_size=7), self._expected())
+
+    def test_each_filter_pattern_walks_an_index_in_order(self):
+        cursor = OrdersService.list_orders({}, limit=10)['data']['next_cursor']
+        patterns = {
+            'order_customer_created_idx': ({}, {"customer_id": self.alice.id}),
+            'order_station_created_idx': ({"station": self.managed.id}, {}),
+            'order_station_status_idx': ({"station": self.managed.id, "status": Order.PENDING}, {}),
+            'order_status_created_idx': ({"status": Order.PENDING}, {}),
+            'order_created_idx': ({}, {}),
+        }
+        for index, (params, scope) in patterns.items():
+            with CaptureQueriesContext(connection) as queries:
+                OrdersService.list_orders(params, cursor=cursor, **scope)
+            with connection.cursor() as db:
+                db.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+                plan = ' '.join(str(row[-1]) for row in db.fetchall())
+            self.assertIn(f'INDEX {index} ', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_endpoint_scopes_by_role(self):
+        client = APIClient()
+        client.force_authenticate(user=self.bob)
+        response = client.get(reverse('orders'), {"page_size": 50, "customer": self.alice.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['orders'], [])
+
+        response = client.get(reverse('orders'), {"page_size": 3})
+        self.assertEqual([o['customer'] for o in response.data['data']['orders']], [self.bob.id] * 3)
+        self.assertIsNotNone(response.data['data']['next_cursor'])
+        self.assertEqual(client.get(reverse('orders'), {"cursor": 'bad'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(client.get(reverse('orders'), {"status": 'lost'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        client.force_authenticate(user=self.manager)
+        elsewhere = Order.objects.filter(station=self.other).first()
+        self.assertEqual(client.get(reverse('order-detail', args=[elsewhere.id])).status_code, status.HTTP_404_NOT_FOUND)
+        client.force_authenticate(user=self.admin)
+        self.assertEqual(client.get(reverse('order-detail', args=[elsewhere.id])).status_code, status.HTTP_200_OK)
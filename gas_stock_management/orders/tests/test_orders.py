@@ -0,0 +1,216 @@
+import threading
+from decimal import Decimal
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from orders.models import Order, OrderLine
+from orders.services.orders_services import OrdersService
+from products.models import PriceRule, Product
+from products.pricing import PriceIndex
+from stock.models import Station, StockBalance, StockMovement
+from stock.services.stock_service import StockService
+
+
+class OrderFixtures:
+    def _setup_catalog(self, opening_stock='10'):
+        cache.clear()
+        caches['catalog'].clear()
+        PriceIndex.reset()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        PriceRule.objects.create(
+            product=self.product, price=Decimal('25.50'), effective_from=timezone.now() - timezone.timedelta(days=1)
+        )
+        StockService.record_movement({
+            "station": self.station.id, "product": self.product.id, "movement_type": 'receipt',
+            "quantity": opening_stock,
+        })
+
+    def _customer(self, username='customer'):
+        return User.objects.create_user(username=username, email=f'{username}@test.com', password='pass123')
+
+    def _payload(self, quantity='2'):
+        return {"station": self.station.id, "lines": [{"product": self.product.id, "quantity": quantity}]}
+
+
+class PlaceOrderTests(OrderFixtures, TestCase):
+    def setUp(self):
+        self._setup_catalog()
+        self.customer = self._customer()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer)
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def _place(self, payload=None, key=None):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+        return self.client.post(reverse('orders'), payload or self._payload(), format='json', **headers)
+
+    def test_order_reserves_stock_at_the_current_price(self):
+        response = self._place({
+            "station": self.station.id,
+            "lines": [{"product": self.product.id, "quantity": '2'}, {"product": self.product.id, "quantity": '1'}],
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = response.data['data']['order']
+        self.assertEqual((order['status'], order['total']), ('pending', '76.50'))
+        self.assertEqual(len(order['lines']), 1)
+        balance = StockBalance.objects.get()
+        self.assertEqual((balance.quantity, balance.reserved), (Decimal('10'), Decimal('3')))
+
+    def test_reserved_stock_cannot_be_ordered_or_sold_again(self):
+        self._place(self._payload('8'))
+
+        response = self._place(self._payload('3'))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.count(), 1)
+        sale = StockService.record_movement({
+            "station": self.station.id, "product": self.product.id, "movement_type": 'sale', "quantity": '3',
+        })
+        self.assertEqual(sale['status_code'], status.HTTP_409_CONFLICT)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('8'))
+
+    def test_retry_with_idempotency_key_returns_the_stored_order(self):
+        first = self._place(key='checkout-1')
+
+        with self.assertNumQueries(2):
+            retry = self._place(key='checkout-1')
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['data']['order'], first.data['data']['order'])
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(StockBalance.objects.get().reserved, Decimal('2'))
+
+        reused = self._place(self._payload('5'), key='checkout-1')
+        self.assertEqual(reused.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        # Keys belong to one customer
+        other = APIClient()
+        other.force_authenticate(user=self._customer('other'))
+        self.assertEqual(
+            other.post(reverse('orders'), self._payload(), format='json', HTTP_IDEMPOTENCY_KEY='checkout-1').status_code,
+            status.HTTP_201_CREATED,
+        )
+
+    def test_unpriced_or_unknown_products_are_rejected(self):
+        unpriced = Product.objects.create(name='Hose', sku='HOSE', category='accessory')
+        response = self._place({"station": self.station.id, "lines": [{"product": unpriced.id, "quantity": '1'}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['data']['products'], [unpriced.id])
+
+        response = self._place({"station": self.station.id, "lines": [{"product": 9999, "quantity": '1'}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_confirm_books_the_sale_and_cancel_releases(self):
+        staff = User.objects.create_user(username='driver', email='driver@test.com', password='pass123')
+        staff.profile.role = 'delivery'
+        staff.profile.save()
+        staff_client = APIClient()
+        staff_client.force_authenticate(user=staff)
+        paid = self._place().data['data']['order']
+        dropped = self._place(self._payload('3')).data['data']['order']
+
+        self.assertEqual(
+            self.client.post(reverse('order-confirm', args=[paid['id']])).status_code, status.HTTP_403_FORBIDDEN
+        )
+        response = staff_client.post(reverse('order-confirm', args=[paid['id']]))
+        self.assertEqual(response.data['data']['order']['status'], 'confirmed')
+        sale = StockMovement.objects.get(reference=paid['number'])
+        self.assertEqual((sale.movement_type, sale.quantity), (StockMovement.SALE, Decimal('-2')))
+
+        response = self.client.post(reverse('order-cancel', args=[dropped['id']]))
+        self.assertEqual(response.data['data']['order']['status'], 'cancelled')
+        self.assertEqual(
+            staff_client.post(reverse('order-confirm', args=[dropped['id']])).status_code, status.HTTP_409_CONFLICT
+        )
+        balance = StockBalance.objects.get()
+        self.assertEqual((balance.quantity, balance.reserved), (Decimal('8'), Decimal('0')))
+        self.assertEqual(StockService.check_balances()['data']['drift'], [])
+
+    def _manager_client(self, username):
+        manager = self._customer(username)
+        manager.profile.role = 'manager'
+        manager.profile.save()
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        return manager, client
+
+    def test_managers_only_confirm_their_stations_orders(self):
+        order = self._place().data['data']['order']
+        self.station.manager, own = self._manager_client('station-manager')
+        self.station.save()
+        _, other = self._manager_client('other-manager')
+
+        response = other.post(reverse('order-confirm', args=[order['id']]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Order.objects.get(pk=order['id']).status, Order.PENDING)
+        response = own.post(reverse('order-confirm', args=[order['id']]))
+        self.assertEqual(response.data['data']['order']['status'], 'confirmed')
+
+    def test_customers_only_see_their_own_orders(self):
+        order = self._place().data['data']['order']
+        other = APIClient()
+        other.force_authenticate(user=self._customer('other'))
+
+        self.assertEqual(self.client.get(reverse('order-detail', args=[order['id']])).status_code, status.HTTP_200_OK)
+        self.assertEqual(other.get(reverse('order-detail', args=[order['id']])).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(other.post(reverse('order-cancel', args=[order['id']])).status_code, status.HTTP_404_NOT_FOUND)
+
+
+@skipUnless(connection.vendor != 'sqlite' or connection.settings_dict['TEST']['NAME'],
+            "needs a file-based test database: set THREADED_TESTS=1")
+@override_settings(STOCK_CONCURRENCY={'MAX_RETRIES': 50, 'BASE_DELAY': 0.002, 'MAX_DELAY': 0.05})
+class ConcurrentOrdersStressTests(OrderFixtures, TransactionTestCase):
+    """Many buyers ordering the last cylinders at once, each thread on its own connection."""
+    THREADS = 8
+    ORDERS_PER_THREAD = 6
+    OPENING_STOCK = 20
+
+    def setUp(self):
+        self._setup_catalog(opening_stock=str(self.OPENING_STOCK))
+        self.buyers = [self._customer(f'buyer{n}') for n in range(self.THREADS)]
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def test_no_oversell_and_retries_place_once(self):
+        outcomes = []
+        lock = threading.Lock()
+        start = threading.Barrier(self.THREADS)
+
+        def buyer(number):
+            try:
+                start.wait()
+                for attempt in range(self.ORDERS_PER_THREAD):
+                    # Every order is sent twice, as a client retrying after a lost response would
+                    key = f'{number}-{attempt}'
+                    for _ in range(2):
+                        response = OrdersService.place_order(
+                            self._payload('1'), self.buyers[number].id, idempotency_key=key
+                        )
+                        with lock:
+                            outcomes.append((key, response['status_code']))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buyer, args=(n,)) for n in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        placed = {key for key, code in outcomes if code == status.HTTP_201_CREATED}
+        self.assertEqual(len(placed), self.OPENING_STOCK)
+        self.assertTrue(all(code in (200, 201, 409) for _, code in outcomes))
+        self.assertEqual(Order.objects.count(), self.OPENING_STOCK)
+        self.assertEqual(OrderLine.objects.count(), self.OPENING_STOCK)
+        balance = StockBalance.objects.get()
+        self.assertEqual((balance.quantity, balance.reserved), (Decimal('20'), Decimal('20')))
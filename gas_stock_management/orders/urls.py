@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import (
+    OrderListView, OrderDetailView, OrderCancelView, OrderConfirmView, OrderBatchListView, OrderBatchDetailView
+)
+
+urlpatterns = [
+    path('', OrderListView.as_view(), name='orders'),
+    path('<int:order_id>/', OrderDetailView.as_view(), name='order-detail'),
+    path('<int:order_id>/cancel/', OrderCancelView.as_view(), name='order-cancel'),
+    path('<int:order_id>/confirm/', OrderConfirmView.as_view(), name='order-confirm'),
+    path('batches/', OrderBatchListView.as_view(), name='order-batches'),
+    path('batches/<int:batch_id>/', OrderBatchDetailView.as_view(), name='order-batch-detail'),
+]
@@ -1,3 +1,121 @@
-from django.shortcuts import render
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+import json
+from rest_framework import status
+from accounts.permissions import IsDeliveryStaff, IsManager
+from gas_stock_management.pagination import clamp_page_size
+from orders.services.order_batch_services import OrderBatchService
+from orders.services.orders_services import OrdersService
 
-# Create your views here.
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def _order_scope(request) -> dict:
+    """Customers reach their own orders and managers their stations' orders; admins and delivery staff reach all."""
+    role = request.user.profile.role
+    if role == 'customer':
+        return {"customer_id": request.user.id}
+    if role == 'manager':
+        return {"manager_id": request.user.id}
+    return {}
+
+
+class OrderListView(APIView):
+    """
+    GET lists order history, newest first, filtered by `?customer=`,
+    `?station=`, `?status=` and `?created_from=` / `?created_to=`, in
+    cursor-paginated pages. POST places an order; clients should send an
+    Idempotency-Key header (e.g. a UUID per checkout) so that retrying
+    after a lost response returns the order already placed, marked with
+    Idempotent-Replayed, instead of a second one.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        service_response = OrdersService.list_orders(
+            request.query_params,
+            cursor=request.query_params.get('cursor'),
+            limit=clamp_page_size(request.query_params.get('page_size')),
+            **_order_scope(request)
+        )
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+    def post(self, request):
+        idempotency_key = request.headers.get('Idempotency-Key') or None
+        if idempotency_key is not None and len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            return Response({
+                "success": False,
+                "message": f"Idempotency-Key must be at most {MAX_IDEMPOTENCY_KEY_LENGTH} characters",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        service_response = OrdersService.place_order(request.data, request.user.id, idempotency_key=idempotency_key)
+        response = Response(service_response, status=service_response.get("status_code", status.HTTP_201_CREATED))
+        if service_response["success"] and service_response["data"]["replayed"]:
+            response['Idempotent-Replayed'] = 'true'
+        return response
+
+
+class OrderDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, order_id):
+        service_response = OrdersService.get_order(order_id, **_order_scope(request))
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class OrderCancelView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, order_id):
+        service_response = OrdersService.cancel_order(order_id, user_id=request.user.id, **_order_scope(request))
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class OrderConfirmView(APIView):
+    """
+    Record payment for a pending order, which turns its reserved stock into
+    a sale. Managers may only confirm their stations' orders.
+    """
+    permission_classes = [IsAuthenticated, IsDeliveryStaff]
+
+    def post(self, request, order_id):
+        service_response = OrdersService.confirm_order(order_id, user_id=request.user.id, **_order_scope(request))
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class OrderBatchListView(APIView):
+    """
+    Upload a distributor's order lines as a CSV or JSON `file` (or a JSON
+    body: a list of lines or {"lines": [...]}) with an optional `tier`
+    (wholesale by default). Answers 202 with the queued batch right away;
+    poll its detail for progress and the per-line report. Managers may
+    only order from the stations they run.
+    """
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload:
+            fmt = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+            payload = upload.read()
+        else:
+            fmt = 'json'
+            payload = json.dumps(request.data if isinstance(request.data, list) else request.data.get('lines', []))
+        tier = request.data.get('tier') if not isinstance(request.data, list) else None
+
+        service_response = OrderBatchService.submit(
+            payload, fmt, tier=tier, created_by_id=request.user.id, **_order_scope(request)
+        )
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_202_ACCEPTED))
+
+
+class OrderBatchDetailView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def get(self, request, batch_id):
+        # Managers see the batches they sent, admins every batch
+        scope = {"created_by_id": request.user.id} if request.user.profile.role == 'manager' else {}
+        service_response = OrderBatchService.get_batch(batch_id, **scope)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
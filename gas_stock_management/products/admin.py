@@ -1,3 +1,25 @@
 from django.contrib import admin
+from .models import PriceRule, Product
 
-# Register your models here.
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('name', 'sku', 'category', 'brand', 'size', 'unit', 'is_active')
+    search_fields = ('name', 'sku', 'brand')
+    list_filter = ('category', 'is_active')
+
+
+@admin.register(PriceRule)
+class PriceRuleAdmin(admin.ModelAdmin):
+    list_display = ('product', 'station', 'tier', 'price', 'effective_from', 'effective_until', 'is_active')
+    list_filter = ('tier', 'is_active', 'station')
+    readonly_fields = ('catalog_version',)
+
+    # The key a price index recompiles by is fixed once the rule exists
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return self.readonly_fields
+        return self.readonly_fields + ('product', 'station', 'tier')
+
+    # Retired with is_active so price indexes see the change
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from gas_stock_management.caching import CacheCounters, VersionedCache
+from products.models import CatalogVersion
+
+CATALOG_ROW = 1
+VERSION_KEY = "products:catalog:version"
+
+
+class CatalogCache(VersionedCache):
+    """
+    Cache of the catalog version and of the serialized catalog bytes and
+    ETag for each version. Writers bump the version row in the database and
+    drop the cached version once they commit, so the next reader picks up
+    the new version and rebuilds the bytes once; until then every request
+    is answered from the cache alone.
+
+    The `catalog` alias must be shared by every process (file or redis):
+    a write only drops the cached version where it was made. The version
+    is also kept for just CATALOG['VERSION_TIMEOUT'] seconds, which bounds
+    how long a missed invalidation can serve a stale ETag.
+    """
+    alias = 'catalog'
+    counters = CacheCounters()
+
+    @staticmethod
+    def _key(version) -> str:
+        return f"products:catalog:{version}"
+
+    @staticmethod
+    def stored_version() -> int:
+        """The committed catalog version, read from its row (one primary-key lookup, no cache)."""
+        return CatalogVersion.objects.filter(pk=CATALOG_ROW).values_list('version', flat=True).first() or 1
+
+    @classmethod
+    def version(cls) -> int:
+        version = cls._get(VERSION_KEY)
+        if version is None:
+            version = cls.stored_version()
+            cls._add(VERSION_KEY, version, timeout=getattr(settings, 'CATALOG', {}).get('VERSION_TIMEOUT', 5))
+            # A write may have committed, and dropped the key, between the read and the add
+            current = cls.stored_version()
+            if current != version:
+                cls.invalidate()
+                version = current
+        return version
+
+    @classmethod
+    def bump(cls) -> int:
+        """
+        Count a catalog write and return the new version; call inside the
+        writing transaction. The version row stays locked until it commits,
+        so versions become visible in the order they were handed out.
+        """
+        if not CatalogVersion.objects.filter(pk=CATALOG_ROW).update(version=F('version') + 1):
+            CatalogVersion.objects.get_or_create(pk=CATALOG_ROW, defaults={"version": 2})
+        transaction.on_commit(cls.invalidate)
+        return CatalogVersion.objects.filter(pk=CATALOG_ROW).values_list('version', flat=True).get()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls._delete(VERSION_KEY)
+        cls._count("invalidations")
+
+    @classmethod
+    def get_etag(cls, version):
+        return cls._get(f"{cls._key(version)}:etag")
+
+    @classmethod
+    def get(cls, version):
+        """(etag, body) for a catalog version, or None."""
+        entry = cls._get_many([f"{cls._key(version)}:etag", f"{cls._key(version)}:body"])
+        cls._count("hits" if len(entry) == 2 else "misses")
+        if len(entry) != 2:
+            return None
+        return entry[f"{cls._key(version)}:etag"], entry[f"{cls._key(version)}:body"]
+
+    @classmethod
+    def set(cls, version, etag: str, body: bytes) -> None:
+        cls._set_many({f"{cls._key(version)}:etag": etag, f"{cls._key(version)}:body": body})
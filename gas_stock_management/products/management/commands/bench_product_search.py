@@ -0,0 +1,73 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from products.models import Product
+from products.search import SearchIndex, search_terms
+
+BRANDS = ['Total', 'Oryx', 'Afrigas', 'Engen', 'SP', 'Lake Gas', 'Meru', 'Kobil']
+KINDS = ['LPG cylinder', 'Refill', 'Regulator', 'Hose', 'Burner', 'Valve', 'Cooker', 'Lantern']
+SIZES = ['3kg', '6kg', '12kg', '15kg', '20kg', '45kg']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare an icontains scan and the search index on generated products (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--query', nargs='+', default=['oryx 12kg', 'meru lantern 45kg', 'bnch-0042424', 'regul'])
+
+    def handle(self, *args, **options):
+        for rows in options['rows']:
+            try:
+                with transaction.atomic():
+                    self._run(rows, options['repeat'], options['query'])
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def _run(self, rows: int, repeat: int, queries: list) -> None:
+        self._seed(rows)
+        for query in queries:
+            terms = search_terms(query)
+
+            def scan_path():
+                return SearchIndex._search_scan('products', terms, 0, 50)
+
+            def index_path():
+                return SearchIndex.search('products', query, 0, 50)
+
+            scan_time = self._best(scan_path, repeat)
+            index_time = self._best(index_path, repeat)
+            self.stdout.write(
+                f"{rows:>7} rows  {query!r:<20} scan {scan_time * 1000:9.2f}ms  "
+                f"index {index_time * 1000:9.2f}ms  speedup x{scan_time / index_time:.1f}"
+            )
+
+    def _seed(self, rows: int) -> None:
+        products = [
+            Product(
+                name=f"{BRANDS[i % len(BRANDS)]} {KINDS[i // len(BRANDS) % len(KINDS)]} {SIZES[i % len(SIZES)]} #{i}",
+                sku=f"BNCH-{i:07d}",
+                category='lpg',
+                brand=BRANDS[i % len(BRANDS)],
+                size=SIZES[i % len(SIZES)],
+                unit='cylinder',
+            )
+            for i in range(rows)
+        ]
+        Product.objects.bulk_create(products, batch_size=2000)
+        SearchIndex.rebuild('products')
+
+    @staticmethod
+    def _best(func, repeat: int) -> float:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from products.search import INDEXES, SearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product and station search index from the base tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=sorted(INDEXES), help="Rebuild only this index")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not SearchIndex.fts_enabled():
+            self.stdout.write("This database searches its base tables directly; nothing to rebuild")
+            return
+        for kind in [options['kind']] if options['kind'] else sorted(INDEXES):
+            with transaction.atomic():
+                indexed = SearchIndex.rebuild(kind, chunk_size=options['chunk_size'])
+            self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} {kind}"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=150)),
+                ('sku', models.CharField(max_length=50, unique=True)),
+                ('category', models.CharField(choices=[('lpg', 'LPG Cylinder'), ('fuel', 'Fuel'), ('accessory', 'Accessory')], max_length=20)),
+                ('brand', models.CharField(blank=True, default='', max_length=100)),
+                ('size', models.CharField(blank=True, default='', max_length=20)),
+                ('unit', models.CharField(choices=[('cylinder', 'Cylinder'), ('litre', 'Litre'), ('piece', 'Piece')], default='piece', max_length=20)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# SQLite: FTS5 tables with the trigram tokenizer, rowid = object id.
+# PostgreSQL: pg_trgm GIN indexes on the searched columns of the base tables.
+FTS_TABLES = {
+    'products_product_fts': ('products_product', ['name', 'brand', 'size', 'sku']),
+    'products_station_fts': ('stock_station', ['name', 'code', 'address']),
+}
+TRIGRAM_INDEXES = {
+    'products_product': ['name', 'brand', 'size', 'sku'],
+    'stock_station': ['name', 'code', 'address'],
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table, (source, columns) in FTS_TABLES.items():
+            values = ', '.join(f"COALESCE({column}, '')" for column in columns)
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table} USING fts5({', '.join(columns)}, tokenize='trigram')"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table} (rowid, {', '.join(columns)}) SELECT id, {values} FROM {source} WHERE is_active"
+            )
+    elif vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, columns in TRIGRAM_INDEXES.items():
+            for column in columns:
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)"
+                )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table in FTS_TABLES:
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+    elif vendor == 'postgresql':
+        for table, columns in TRIGRAM_INDEXES.items():
+            for column in columns:
+                schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_price_rules'),
+        ('stock', '0005_cylinders'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
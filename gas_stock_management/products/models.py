@@ -1,3 +1,85 @@
-from django.db import models
+from django.db import models, transaction
+from gas_stock_management.base.models import BaseModel
 
-# Create your models here.
+
+class Product(BaseModel):
+    CATEGORY_CHOICES = [
+        ('lpg', 'LPG Cylinder'),
+        ('fuel', 'Fuel'),
+        ('accessory', 'Accessory'),
+    ]
+    UNIT_CHOICES = [
+        ('cylinder', 'Cylinder'),
+        ('litre', 'Litre'),
+        ('piece', 'Piece'),
+    ]
+    name = models.CharField(max_length=150)
+    sku = models.CharField(max_length=50, unique=True)
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    brand = models.CharField(max_length=100, blank=True, default='')
+    # Cylinder size or pack size as sold, e.g. "12kg"
+    size = models.CharField(max_length=20, blank=True, default='')
+    unit = models.CharField(max_length=20, choices=UNIT_CHOICES, default='piece')
+    is_active = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.sku})"
+
+
+class CatalogVersion(BaseModel):
+    """
+    Single row counting writes to the catalog. Every product (and price)
+    write bumps `version` in its own transaction, so clients and caches can
+    tell whether the catalog changed without reading it.
+    """
+    version = models.PositiveBigIntegerField(default=1)
+
+    def __str__(self):
+        return f"Catalog v{self.version}"
+
+
+class PriceRule(BaseModel):
+    """
+    Unit price of a product for a customer tier from `effective_from` until
+    `effective_until` (open-ended if null), at one station or, with no
+    station, at every station without its own rule. Where rules overlap the
+    one that started last applies. Rules are retired with `is_active` rather
+    than deleted, and every write stamps the catalog version it bumped, so
+    price indexes can pick up exactly the rules written since they were
+    built.
+    """
+    RETAIL = 'retail'
+    WHOLESALE = 'wholesale'
+    DISTRIBUTOR = 'distributor'
+    TIER_CHOICES = [
+        (RETAIL, 'Retail'),
+        (WHOLESALE, 'Wholesale'),
+        (DISTRIBUTOR, 'Distributor'),
+    ]
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='price_rules')
+    station = models.ForeignKey('stock.Station', on_delete=models.PROTECT, null=True, blank=True, related_name='price_rules')
+    tier = models.CharField(max_length=20, choices=TIER_CHOICES, default=RETAIL)
+    price = models.DecimalField(max_digits=12, decimal_places=2)
+    effective_from = models.DateTimeField()
+    effective_until = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    catalog_version = models.PositiveBigIntegerField(default=0, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['product', 'station', 'tier', 'effective_from'], name='price_rule_key_from_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Imported here: the catalog module depends on these models
+        from products.catalog import CatalogCache
+        with transaction.atomic():
+            if self.is_dirty():
+                self.catalog_version = CatalogCache.bump()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Price rules are retired with is_active, not deleted")
+
+    def __str__(self):
+        return f"{self.product_id}@{self.station_id or '*'} {self.tier}: {self.price} from {self.effective_from}"
@@ -0,0 +1,131 @@
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from django.db.models import Q
+from django.utils import timezone
+from products.catalog import CatalogCache
+from products.models import PriceRule
+
+CENT = Decimal('0.01')
+
+
+def compile_rules(rules: list) -> tuple:
+    """
+    Flatten one key's (effective_from, effective_until, price) rules into
+    sorted segment starts and the price over each segment (None where no
+    rule applies), so a lookup is a single bisect. Within a segment the
+    rule that started last wins; when it ends, earlier rules still in
+    effect apply again.
+    """
+    boundaries = sorted({rule[0] for rule in rules} | {rule[1] for rule in rules if rule[1] is not None})
+    by_start = sorted(rules, key=lambda rule: rule[0], reverse=True)
+    starts, prices = [], []
+    for moment in boundaries:
+        price = next(
+            (p for start, until, p in by_start if start <= moment and (until is None or moment < until)), None
+        )
+        if prices and prices[-1] == price:
+            continue
+        starts.append(moment)
+        prices.append(price)
+    return starts, prices
+
+
+class PriceIndex:
+    """
+    In-process lookup of compiled price rules keyed by (product, station,
+    tier), station None being the default for every station. Built once
+    from all active rules, then kept current from the catalog version:
+    when it moves on, only the keys of rules stamped with a newer version
+    are recompiled. Order totals are charged from it, so every refresh
+    reads the committed version from its database row rather than from a
+    cache that may be per-process: any process's price change is seen by
+    the next cart priced anywhere, at the cost of one primary-key lookup.
+    """
+    _lock = threading.Lock()
+    _entries = {}
+    _version = None
+
+    @staticmethod
+    def _rows(rules):
+        return rules.filter(is_active=True).values_list(
+            'product_id', 'station_id', 'tier', 'effective_from', 'effective_until', 'price'
+        )
+
+    @classmethod
+    def _compile(cls, rows) -> dict:
+        grouped = defaultdict(list)
+        for product_id, station_id, tier, start, until, price in rows:
+            grouped[(product_id, station_id, tier)].append((start, until, price))
+        return {key: compile_rules(rules) for key, rules in grouped.items()}
+
+    @classmethod
+    def refresh(cls) -> None:
+        version = CatalogCache.stored_version()
+        if version == cls._version:
+            return
+        with cls._lock:
+            if version == cls._version:
+                return
+            if cls._version is None:
+                cls._entries = cls._compile(cls._rows(PriceRule.objects.all()))
+            else:
+                changed = set(
+                    PriceRule.objects.filter(catalog_version__gt=cls._version)
+                    .values_list('product_id', 'station_id', 'tier')
+                )
+                if changed:
+                    condition = Q()
+                    for product_id, station_id, tier in changed:
+                        condition |= Q(product_id=product_id, station_id=station_id, tier=tier)
+                    entries = dict(cls._entries)
+                    for key in changed:
+                        entries.pop(key, None)
+                    entries.update(cls._compile(cls._rows(PriceRule.objects.filter(condition))))
+                    cls._entries = entries
+            cls._version = version
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._entries = {}
+            cls._version = None
+
+    @classmethod
+    def _lookup(cls, entries: dict, key: tuple, at):
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        starts, prices = entry
+        position = bisect_right(starts, at) - 1
+        return prices[position] if position >= 0 else None
+
+    @classmethod
+    def price(cls, product_id: int, station_id: int = None, tier: str = PriceRule.RETAIL, at=None):
+        """Unit price at `at` (default now): the station's own rule, else the default; None if unpriced."""
+        return cls.price_lines([(product_id, 1)], station_id, tier, at)[0][0]
+
+    @classmethod
+    def price_lines(cls, lines: list, station_id: int = None, tier: str = PriceRule.RETAIL, at=None,
+                    refresh: bool = True) -> list:
+        """
+        Price a whole cart in one pass: [(unit price, line total)] for
+        [(product id, quantity)], totals rounded to the cent, None for both
+        where the product has no price at that station and tier. Pass
+        `refresh=False` when pricing many carts right after a `refresh()`.
+        """
+        if refresh:
+            cls.refresh()
+        at = at or timezone.now()
+        entries = cls._entries
+        priced = []
+        for product_id, quantity in lines:
+            unit_price = cls._lookup(entries, (product_id, station_id, tier), at)
+            if unit_price is None and station_id is not None:
+                unit_price = cls._lookup(entries, (product_id, None, tier), at)
+            if unit_price is None:
+                priced.append((None, None))
+            else:
+                priced.append((unit_price, (unit_price * Decimal(quantity)).quantize(CENT, rounding=ROUND_HALF_UP)))
+        return priced
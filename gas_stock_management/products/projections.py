@@ -0,0 +1,34 @@
+from rest_framework.fields import DateTimeField
+from gas_stock_management.projections import Column, Projection
+
+
+class ProductProjection(Projection):
+    """Same output as `ProductSerializer`, built from values()."""
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'sku': 'sku',
+        'category': 'category',
+        'brand': 'brand',
+        'size': 'size',
+        'unit': 'unit',
+        'is_active': 'is_active',
+    }
+
+
+# DRF's own datetime output (None for null)
+_datetime = DateTimeField().to_representation
+
+
+class PriceRuleProjection(Projection):
+    """Same output as `PriceRuleSerializer`, built from values()."""
+    fields = {
+        'id': 'id',
+        'product': 'product_id',
+        'station': 'station_id',
+        'tier': 'tier',
+        'price': Column('price', lambda price: f"{price:.2f}"),
+        'effective_from': Column('effective_from', _datetime),
+        'effective_until': Column('effective_until', _datetime),
+        'is_active': 'is_active',
+    }
@@ -0,0 +1,43 @@
+from django.db import transaction
+from rest_framework import status
+from products.models import PriceRule
+from gas_stock_management.response import RepositoryResponse
+
+
+class PriceRepository:
+    @staticmethod
+    def create_rule(data: dict, created_by_id: int = None) -> RepositoryResponse:
+        rule = PriceRule.objects.create(created_by_id=created_by_id, **data)
+        return RepositoryResponse(
+            success=True,
+            message="Price rule created successfully",
+            data={"rule": rule},
+            status_code=status.HTTP_201_CREATED
+        )
+
+    @staticmethod
+    def get_rule(rule_id: int) -> RepositoryResponse:
+        rule = PriceRule.objects.filter(pk=rule_id).first()
+        if rule is None:
+            return RepositoryResponse(
+                success=False,
+                message="Price rule not found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return RepositoryResponse(success=True, data={"rule": rule}, status_code=status.HTTP_200_OK)
+
+    @staticmethod
+    def update_rule(rule: PriceRule, data: dict, updated_by_id: int = None) -> RepositoryResponse:
+        """Only changed fields are written; an unchanged rule leaves the catalog version alone."""
+        with transaction.atomic():
+            for field, value in data.items():
+                setattr(rule, field, value)
+            if rule.is_dirty():
+                rule.updated_by_id = updated_by_id
+                rule.save()
+        return RepositoryResponse(
+            success=True,
+            message="Price rule updated successfully",
+            data={"rule": rule},
+            status_code=status.HTTP_200_OK
+        )
@@ -0,0 +1,121 @@
+from django.db import transaction, IntegrityError
+from rest_framework import status
+from django.db.models import Q
+from django.utils import timezone
+from products.models import PriceRule, Product
+from products.projections import PriceRuleProjection, ProductProjection
+from products.search import SearchIndex
+from stock.models import Station
+from stock.projections import StationProjection
+from gas_stock_management.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, keyset_page
+from gas_stock_management.response import RepositoryResponse
+
+# kind -> (model, projection) used to hydrate search hits
+SEARCH_RESULTS = {
+    'products': (Product, ProductProjection),
+    'stations': (Station, StationProjection),
+}
+
+
+class ProductRepository:
+    @staticmethod
+    def catalog_products() -> list:
+        """Active products as catalog dicts, in id order, in one query."""
+        return ProductProjection.list(Product.objects.filter(is_active=True).order_by('id'))
+
+    @staticmethod
+    def catalog_prices() -> list:
+        """Active price rules of active products that have not ended yet, as catalog dicts."""
+        rules = PriceRule.objects.filter(is_active=True, product__is_active=True).filter(
+            Q(effective_until__isnull=True) | Q(effective_until__gt=timezone.now())
+        )
+        return PriceRuleProjection.list(rules.order_by('product_id', 'station_id', 'tier', 'effective_from'))
+
+    @staticmethod
+    def search(kind: str, query: str, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE) -> RepositoryResponse:
+        """
+        Ranked active matches of one kind as output dicts, one index query
+        and one hydrating query per page. Rank order is not a stable key, so
+        the cursor carries the offset of the next page.
+        """
+        try:
+            offset = 0
+            if cursor:
+                (offset,) = decode_cursor(cursor)
+                if not isinstance(offset, int) or offset < 0:
+                    raise InvalidCursor("Invalid cursor")
+
+            ids = SearchIndex.search(kind, query, offset, limit + 1)
+            model, projection = SEARCH_RESULTS[kind]
+            rows = {row['id']: row for row in projection.list(model.objects.filter(pk__in=ids[:limit], is_active=True))}
+            page, next_cursor = keyset_page(ids, limit, lambda _: [offset + limit])
+            return RepositoryResponse(
+                success=True,
+                data={"results": [rows[pk] for pk in page if pk in rows], "next_cursor": next_cursor},
+                status_code=status.HTTP_200_OK
+            )
+        except (InvalidCursor, ValueError):
+            return RepositoryResponse(
+                success=False,
+                message="Invalid cursor",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+    @staticmethod
+    def get_product(product_id: int) -> RepositoryResponse:
+        product = Product.objects.filter(pk=product_id).first()
+        if product is None:
+            return RepositoryResponse(
+                success=False,
+                message="Product not found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return RepositoryResponse(success=True, data={"product": product}, status_code=status.HTTP_200_OK)
+
+    @staticmethod
+    def create_product(data: dict, created_by_id: int = None) -> RepositoryResponse:
+        try:
+            with transaction.atomic():
+                product = Product.objects.create(created_by_id=created_by_id, **data)
+            return RepositoryResponse(
+                success=True,
+                message="Product created successfully",
+                data={"product": product},
+                status_code=status.HTTP_201_CREATED
+            )
+        except IntegrityError as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+    @staticmethod
+    def update_product(product_id: int, data: dict, updated_by_id: int = None) -> RepositoryResponse:
+        """Only changed fields are written (BaseModel tracks them), so a no-op update leaves the catalog version alone."""
+        try:
+            with transaction.atomic():
+                product = Product.objects.select_for_update().filter(pk=product_id).first()
+                if product is None:
+                    return RepositoryResponse(
+                        success=False,
+                        message="Product not found",
+                        status_code=status.HTTP_404_NOT_FOUND
+                    )
+                for field, value in data.items():
+                    setattr(product, field, value)
+                if product.is_dirty():
+                    product.updated_by_id = updated_by_id
+                    product.save()
+            return RepositoryResponse(
+                success=True,
+                message="Product updated successfully",
+                data={"product": product},
+                status_code=status.HTTP_200_OK
+            )
+        except IntegrityError as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
@@ -0,0 +1,184 @@
+from functools import reduce
+from operator import or_
+from django.apps import apps
+from django.db import connection
+from django.db.models import Q
+
+# Terms shorter than a trigram cannot use the index and are matched with LIKE
+MIN_INDEXED_TERM = 3
+MAX_TERMS = 8
+
+# kind -> (model, search table on SQLite, [(column, bm25 / similarity weight)])
+INDEXES = {
+    'products': (
+        'products.Product',
+        'products_product_fts',
+        [('name', 10.0), ('brand', 4.0), ('size', 4.0), ('sku', 6.0)],
+    ),
+    'stations': (
+        'stock.Station',
+        'products_station_fts',
+        [('name', 10.0), ('code', 6.0), ('address', 1.0)],
+    ),
+}
+
+
+def search_terms(query: str) -> list:
+    """Distinct lower-cased whitespace-separated terms, at most MAX_TERMS."""
+    terms = []
+    for term in query.lower().split():
+        if term not in terms:
+            terms.append(term[:64])
+    return terms[:MAX_TERMS]
+
+
+def _like(term: str) -> str:
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class SearchIndex:
+    """
+    Full-text search over products and stations. On SQLite each kind has
+    an FTS5 table with the trigram tokenizer (so any substring of three or
+    more characters matches) whose rowid is the object id, kept in sync by
+    the signals in products/signals.py and rebuilt by the
+    rebuild_search_index command; results are ranked with bm25. On
+    PostgreSQL the base tables carry pg_trgm GIN indexes instead and
+    results are ranked by word similarity. Only active objects are
+    searchable.
+    """
+
+    @staticmethod
+    def _spec(kind: str):
+        label, table, columns = INDEXES[kind]
+        return apps.get_model(label), table, columns
+
+    @staticmethod
+    def fts_enabled() -> bool:
+        return connection.vendor == 'sqlite'
+
+    @staticmethod
+    def _insert_sql(table: str, names: list) -> str:
+        return f"INSERT INTO {table} (rowid, {', '.join(names)}) VALUES ({', '.join(['%s'] * (len(names) + 1))})"
+
+    @classmethod
+    def sync(cls, kind: str, objects: list) -> None:
+        """Re-index the given objects (dropping inactive ones)."""
+        if not cls.fts_enabled() or not objects:
+            return
+        _, table, columns = cls._spec(kind)
+        names = [column for column, _ in columns]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE rowid IN ({', '.join(['%s'] * len(objects))})",
+                [obj.pk for obj in objects],
+            )
+            rows = [
+                [obj.pk] + [getattr(obj, name) or '' for name in names]
+                for obj in objects if obj.is_active
+            ]
+            if rows:
+                cursor.executemany(cls._insert_sql(table, names), rows)
+
+    @classmethod
+    def remove(cls, kind: str, ids: list) -> None:
+        if not cls.fts_enabled() or not ids:
+            return
+        _, table, _ = cls._spec(kind)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE rowid IN ({', '.join(['%s'] * len(ids))})", list(ids))
+
+    @classmethod
+    def rebuild(cls, kind: str, chunk_size: int = 2000) -> int:
+        """Re-index every active object of a kind from scratch; returns how many were indexed."""
+        if not cls.fts_enabled():
+            return 0
+        model, table, columns = cls._spec(kind)
+        names = [column for column, _ in columns]
+        indexed = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+            rows = model.objects.filter(is_active=True).order_by('pk').values_list('pk', *names)
+            batch = []
+            for row in rows.iterator(chunk_size=chunk_size):
+                batch.append([row[0]] + [value or '' for value in row[1:]])
+                if len(batch) == chunk_size:
+                    cursor.executemany(cls._insert_sql(table, names), batch)
+                    indexed += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(cls._insert_sql(table, names), batch)
+                indexed += len(batch)
+        return indexed
+
+    @classmethod
+    def search(cls, kind: str, query: str, offset: int = 0, limit: int = 50) -> list:
+        """Ids of active objects matching every term of `query`, best match first."""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        if connection.vendor == 'sqlite':
+            return cls._search_fts(kind, terms, offset, limit)
+        if connection.vendor == 'postgresql':
+            return cls._search_trigram(kind, terms, offset, limit)
+        return cls._search_scan(kind, terms, offset, limit)
+
+    @classmethod
+    def _search_fts(cls, kind: str, terms: list, offset: int, limit: int) -> list:
+        _, table, columns = cls._spec(kind)
+        indexed = [term for term in terms if len(term) >= MIN_INDEXED_TERM]
+        short = [term for term in terms if len(term) < MIN_INDEXED_TERM]
+
+        conditions, params = [], []
+        if indexed:
+            conditions.append(f"{table} MATCH %s")
+            params.append(' '.join('"' + term.replace('"', '""') + '"' for term in indexed))
+        for term in short:
+            conditions.append('(' + ' OR '.join(f"{column} LIKE %s ESCAPE '\\'" for column, _ in columns) + ')')
+            params.extend([_like(term)] * len(columns))
+        if indexed:
+            order = f"bm25({table}, {', '.join(str(weight) for _, weight in columns)}), rowid"
+        else:
+            order = "rowid"
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {table} WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT %s OFFSET %s",
+                params + [limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def _search_trigram(cls, kind: str, terms: list, offset: int, limit: int) -> list:
+        model, _, columns = cls._spec(kind)
+        table = model._meta.db_table
+        conditions, params, scores, score_params = [], [], [], []
+        for term in terms:
+            if len(term) >= MIN_INDEXED_TERM:
+                conditions.append('(' + ' OR '.join(f"%s <%% {column}" for column, _ in columns) + ')')
+                params.extend([term] * len(columns))
+                scores.append('GREATEST(' + ', '.join(
+                    f"word_similarity(%s, {column}) * {weight}" for column, weight in columns
+                ) + ')')
+                score_params.extend([term] * len(columns))
+            else:
+                conditions.append('(' + ' OR '.join(f"{column} ILIKE %s" for column, _ in columns) + ')')
+                params.extend([_like(term)] * len(columns))
+        score = ' + '.join(scores) or '0'
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {table} WHERE is_active AND {' AND '.join(conditions)} "
+                f"ORDER BY {score} DESC, id LIMIT %s OFFSET %s",
+                params + score_params + [limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def _search_scan(cls, kind: str, terms: list, offset: int, limit: int) -> list:
+        model, _, columns = cls._spec(kind)
+        matches = model.objects.filter(is_active=True)
+        for term in terms:
+            matches = matches.filter(reduce(or_, (Q(**{f"{column}__icontains": term}) for column, _ in columns)))
+        return list(matches.order_by('pk').values_list('pk', flat=True)[offset:offset + limit])
@@ -0,0 +1,58 @@
+from decimal import Decimal
+from rest_framework import serializers
+from django.utils import timezone
+from .models import PriceRule, Product
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'sku', 'category', 'brand', 'size', 'unit', 'is_active']
+
+
+class PriceRuleSerializer(serializers.ModelSerializer):
+    """
+    `effective_from` defaults to now; an end, if given, must come after it.
+    A rule's product, station and tier are fixed once created, as price
+    indexes recompile by them: to price another key, retire the rule and
+    create a new one.
+    """
+    KEY_FIELDS = ('product', 'station', 'tier')
+
+    effective_from = serializers.DateTimeField(required=False)
+
+    class Meta:
+        model = PriceRule
+        fields = ['id', 'product', 'station', 'tier', 'price', 'effective_from', 'effective_until', 'is_active']
+        extra_kwargs = {'price': {'min_value': 0}}
+
+    def validate(self, attrs):
+        if self.instance is None:
+            attrs.setdefault('effective_from', timezone.now())
+        else:
+            moved = {
+                field: "Cannot be changed; retire this rule and create a new one"
+                for field in self.KEY_FIELDS
+                if field in attrs and attrs[field] != getattr(self.instance, field)
+            }
+            if moved:
+                raise serializers.ValidationError(moved)
+        start = attrs.get('effective_from', getattr(self.instance, 'effective_from', None))
+        until = attrs.get('effective_until', getattr(self.instance, 'effective_until', None))
+        if until is not None and until <= start:
+            raise serializers.ValidationError({"effective_until": "Must be after effective_from"})
+        return attrs
+
+
+class QuoteLineSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    quantity = serializers.DecimalField(max_digits=14, decimal_places=3, min_value=Decimal('0.001'))
+
+
+class QuoteSerializer(serializers.Serializer):
+    MAX_LINES = 1000
+
+    station = serializers.IntegerField(required=False, allow_null=True, default=None)
+    tier = serializers.ChoiceField(choices=PriceRule.TIER_CHOICES, default=PriceRule.RETAIL)
+    at = serializers.DateTimeField(required=False, allow_null=True, default=None)
+    lines = QuoteLineSerializer(many=True, allow_empty=False, max_length=MAX_LINES)
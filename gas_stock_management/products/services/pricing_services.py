@@ -0,0 +1,110 @@
+from decimal import Decimal
+from rest_framework import status
+from products.models import PriceRule
+from products.pricing import PriceIndex
+from products.repository.price_repository import PriceRepository
+from products.serializers import PriceRuleSerializer, QuoteSerializer
+
+
+class PricingService:
+
+    @staticmethod
+    def create_rule(data: dict, user_id: int = None):
+        serializer = PriceRuleSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        repo_response = PriceRepository.create_rule(serializer.validated_data, created_by_id=user_id)
+        return {
+            "success": True,
+            "message": repo_response.message,
+            "data": PriceRuleSerializer(repo_response.data['rule']).data,
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def update_rule(rule_id: int, data: dict, user_id: int = None):
+        repo_response = PriceRepository.get_rule(rule_id)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        serializer = PriceRuleSerializer(repo_response.data['rule'], data=data, partial=True)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        repo_response = PriceRepository.update_rule(
+            repo_response.data['rule'], serializer.validated_data, updated_by_id=user_id
+        )
+        return {
+            "success": True,
+            "message": repo_response.message,
+            "data": PriceRuleSerializer(repo_response.data['rule']).data,
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def price_cart(lines: list, station_id: int = None, tier: str = PriceRule.RETAIL, at=None,
+                   refresh: bool = True) -> dict:
+        """
+        Price [(product id, quantity)] in one pass over the price index:
+        {"lines": [(unit price, line total)], "total", "unpriced": product
+        ids with no price}. `total` only covers the priced lines.
+        """
+        priced = PriceIndex.price_lines(lines, station_id, tier, at, refresh=refresh)
+        return {
+            "lines": priced,
+            "total": sum((line_total for _, line_total in priced if line_total is not None), Decimal('0.00')),
+            "unpriced": [product_id for (product_id, _), (price, _) in zip(lines, priced) if price is None],
+        }
+
+    @staticmethod
+    def refresh_prices() -> None:
+        """Bring the price index up to the committed catalog version before pricing many carts."""
+        PriceIndex.refresh()
+
+    @staticmethod
+    def quote(data: dict):
+        serializer = QuoteSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        validated = serializer.validated_data
+        lines = [(line['product'], line['quantity']) for line in validated['lines']]
+        cart = PricingService.price_cart(lines, validated['station'], validated['tier'], validated['at'])
+        data = {
+            "lines": [
+                {"product": product_id, "quantity": quantity, "unit_price": unit_price, "total": line_total}
+                for (product_id, quantity), (unit_price, line_total) in zip(lines, cart['lines'])
+            ],
+            "total": cart['total'],
+            "unpriced": cart['unpriced'],
+        }
+        if cart['unpriced']:
+            return {
+                "success": False,
+                "message": "Some products have no price for this station and tier",
+                "data": data,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        return {
+            "success": True,
+            "message": "Cart priced successfully",
+            "data": data,
+            "status_code": status.HTTP_200_OK
+        }
@@ -0,0 +1,129 @@
+import hashlib
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from gas_stock_management.pagination import DEFAULT_PAGE_SIZE
+from products.catalog import CatalogCache
+from products.repository.product_repository import ProductRepository
+from products.serializers import ProductSerializer
+
+
+class ProductService:
+
+    @staticmethod
+    def _matches(if_none_match: str, etag: str) -> bool:
+        """If-None-Match uses the weak comparison: W/ prefixes are ignored."""
+        if not if_none_match or not etag:
+            return False
+        tags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+        return '*' in tags or etag in tags
+
+    @staticmethod
+    def _build_catalog(version: int) -> tuple:
+        body = JSONRenderer().render({
+            "success": True,
+            "message": "Catalog retrieved successfully",
+            "data": {
+                "version": version,
+                "products": ProductRepository.catalog_products(),
+                "prices": ProductRepository.catalog_prices(),
+            },
+        })
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        CatalogCache.set(version, etag, body)
+        return etag, body
+
+    @staticmethod
+    def get_catalog(if_none_match: str = None):
+        """
+        The serialized catalog bytes and their strong ETag. The current
+        version comes from the cache, so a client whose ETag still matches
+        gets a 304 and a client without one gets the cached bytes, neither
+        touching the database; bytes are rebuilt once per version.
+        """
+        version = CatalogCache.version()
+        etag = CatalogCache.get_etag(version)
+        if ProductService._matches(if_none_match, etag):
+            return {
+                "success": True,
+                "message": "Catalog not modified",
+                "data": {"etag": etag, "body": b""},
+                "status_code": status.HTTP_304_NOT_MODIFIED
+            }
+
+        entry = CatalogCache.get(version)
+        etag, body = entry if entry is not None else ProductService._build_catalog(version)
+        if ProductService._matches(if_none_match, etag):
+            return {
+                "success": True,
+                "message": "Catalog not modified",
+                "data": {"etag": etag, "body": b""},
+                "status_code": status.HTTP_304_NOT_MODIFIED
+            }
+        return {
+            "success": True,
+            "message": "Catalog retrieved successfully",
+            "data": {"etag": etag, "body": body},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def search(kind: str, query: str, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+        repo_response = ProductRepository.search(kind, query, cursor=cursor, limit=limit)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": "Search results retrieved successfully",
+            "data": repo_response.data,
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def create_product(data: dict, user_id: int = None):
+        serializer = ProductSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        repo_response = ProductRepository.create_product(serializer.validated_data, created_by_id=user_id)
+        return {
+            "success": repo_response.success,
+            "message": repo_response.message,
+            "data": ProductSerializer(repo_response.data['product']).data if repo_response.success else {},
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def update_product(product_id: int, data: dict, user_id: int = None):
+        repo_response = ProductRepository.get_product(product_id)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        serializer = ProductSerializer(repo_response.data['product'], data=data, partial=True)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        repo_response = ProductRepository.update_product(product_id, serializer.validated_data, updated_by_id=user_id)
+        return {
+            "success": repo_response.success,
+            "message": repo_response.message,
+            "data": ProductSerializer(repo_response.data['product']).data if repo_response.success else {},
+            "status_code": repo_response.status_code
+        }
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from stock.models import Station
+from .catalog import CatalogCache
+from .models import Product
+from .search import INDEXES, SearchIndex
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def bump_catalog_version(sender, instance, **kwargs):
+    CatalogCache.bump()
+
+
+def _touches_index(kind: str, update_fields) -> bool:
+    if update_fields is None:
+        return True
+    return bool({'is_active', *(column for column, _ in INDEXES[kind][2])} & set(update_fields))
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, update_fields=None, **kwargs):
+    if _touches_index('products', update_fields):
+        SearchIndex.sync('products', [instance])
+
+
+@receiver(post_save, sender=Station)
+def index_station(sender, instance, update_fields=None, **kwargs):
+    if _touches_index('stations', update_fields):
+        SearchIndex.sync('stations', [instance])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    SearchIndex.remove('products', [instance.pk])
+
+
+@receiver(post_delete, sender=Station)
+def unindex_station(sender, instance, **kwargs):
+    SearchIndex.remove('stations', [instance.pk])
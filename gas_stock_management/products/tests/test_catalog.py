@@ -0,0 +1,110 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.tokens import tokens_for_user
+from products.catalog import CatalogCache
+from products.models import Product
+
+
+class CatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['catalog'].clear()
+        self.user = User.objects.create_user(username='customer', email='customer@test.com', password='pass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens_for_user(self.user).access_token}")
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        Product.objects.create(name='Old', sku='OLD', category='lpg', is_active=False)
+
+    def _get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(reverse('product-catalog'), **headers)
+
+    def test_catalog_lists_active_products_with_strong_etag(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([p['sku'] for p in response.json()['data']['products']], ['LPG-12'])
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_unchanged_catalog_is_304_without_database_work(self):
+        etag = self._get()['ETag']
+
+        with self.assertNumQueries(0):
+            response = self._get(etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+        with self.assertNumQueries(0):
+            response = self._get('"stale", W/' + etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.assertNumQueries(0):
+            response = self._get('"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_product_writes_change_the_etag(self):
+        etag = self._get()['ETag']
+        manager = User.objects.create_user(username='manager', email='manager@test.com', password='pass123')
+        manager.profile.role = 'manager'
+        manager.profile.save()
+        admin_client = APIClient()
+        admin_client.force_authenticate(user=manager)
+
+        # A no-op update writes nothing and keeps the version
+        version = CatalogCache.version()
+        response = admin_client.patch(reverse('product-detail', args=[self.product.id]), {"sku": 'LPG-12'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(CatalogCache.version(), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            admin_client.patch(reverse('product-detail', args=[self.product.id]), {"name": 'LPG 12 kg'}, format='json')
+        self.assertEqual(self._get(etag).status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin_client.post(reverse('products'), {
+                "name": 'LPG 6kg', "sku": 'LPG-6', "category": 'lpg', "unit": 'cylinder',
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        catalog = self._get(etag)
+        self.assertEqual([p['name'] for p in catalog.json()['data']['products']], ['LPG 12 kg', 'LPG 6kg'])
+        self.assertNotEqual(catalog['ETag'], etag)
+
+    def test_only_managers_write_products(self):
+        response = self.client.post(reverse('products'), {"name": 'X', "sku": 'X', "category": 'lpg'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class CatalogVersionCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        caches['catalog'].clear()
+
+    def test_version_is_dropped_from_cache_only_on_commit(self):
+        version = CatalogCache.version()
+        try:
+            with transaction.atomic():
+                Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg')
+                self.assertEqual(CatalogCache.version(), version)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(CatalogCache.version(), version)
+
+        Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg')
+        self.assertEqual(CatalogCache.version(), version + 1)
+
+    def test_version_committed_while_it_is_read_is_not_cached(self):
+        stored = CatalogCache.stored_version()
+        # A writer commits, and drops the key, after this reader loaded the old version but before it cached it
+        with mock.patch.object(CatalogCache, 'stored_version', side_effect=[stored, stored + 1]):
+            self.assertEqual(CatalogCache.version(), stored + 1)
+        self.assertIsNone(caches['catalog'].get('products:catalog:version', version=CatalogCache.payload_version))
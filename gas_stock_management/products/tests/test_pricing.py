@@ -0,0 +1,182 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from products import pricing
+from products.catalog import CatalogCache
+from products.models import PriceRule, Product
+from products.pricing import PriceIndex, compile_rules
+from products.services.pricing_services import PricingService
+from stock.models import Station
+
+
+class CompileRulesTests(TestCase):
+    def test_latest_start_wins_and_earlier_rules_resume(self):
+        t0 = timezone.now()
+        starts, prices = compile_rules([
+            (t0, None, Decimal('100')),
+            (t0 + timedelta(days=1), t0 + timedelta(days=2), Decimal('80')),
+            (t0 + timedelta(days=5), None, Decimal('110')),
+        ])
+        self.assertEqual(starts, [t0, t0 + timedelta(days=1), t0 + timedelta(days=2), t0 + timedelta(days=5)])
+        self.assertEqual(prices, [Decimal('100'), Decimal('80'), Decimal('100'), Decimal('110')])
+
+    def test_gaps_have_no_price(self):
+        t0 = timezone.now()
+        _, prices = compile_rules([
+            (t0, t0 + timedelta(days=1), Decimal('100')),
+            (t0 + timedelta(days=3), None, Decimal('90')),
+        ])
+        self.assertEqual(prices, [Decimal('100'), None, Decimal('90')])
+
+
+class PriceIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['catalog'].clear()
+        PriceIndex.reset()
+        self.now = timezone.now()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.products = [
+            Product.objects.create(name=f'Product {i}', sku=f'SKU-{i}', category='lpg', unit='cylinder')
+            for i in range(3)
+        ]
+        for product in self.products:
+            self._rule(product, '100.00')
+        self._rule(self.products[0], '95.00', station=self.station)
+        self._rule(self.products[0], '80.00', tier=PriceRule.WHOLESALE)
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def _rule(self, product, price, **extra):
+        extra.setdefault('effective_from', self.now - timedelta(days=30))
+        with self.captureOnCommitCallbacks(execute=True):
+            return PriceRule.objects.create(product=product, price=Decimal(price), **extra)
+
+    def test_station_rules_override_the_default(self):
+        ids = [product.id for product in self.products]
+        priced = PriceIndex.price_lines([(ids[0], 2), (ids[1], Decimal('1.5'))], station_id=self.station.id)
+        self.assertEqual(priced, [(Decimal('95.00'), Decimal('190.00')), (Decimal('100.00'), Decimal('150.00'))])
+        self.assertEqual(PriceIndex.price(ids[0]), Decimal('100.00'))
+        self.assertEqual(PriceIndex.price(ids[0], tier=PriceRule.WHOLESALE), Decimal('80.00'))
+        self.assertIsNone(PriceIndex.price(ids[1], tier=PriceRule.DISTRIBUTOR))
+        self.assertIsNone(PriceIndex.price(ids[0], at=self.now - timedelta(days=31)))
+
+    def test_large_cart_is_priced_with_one_version_read(self):
+        PriceIndex.refresh()
+        lines = [(self.products[i % 3].id, i + 1) for i in range(500)]
+        with self.assertNumQueries(1):
+            cart = PricingService.price_cart(lines, station_id=self.station.id)
+        self.assertEqual(cart['unpriced'], [])
+        self.assertEqual(len(cart['lines']), 500)
+
+    def test_price_change_recompiles_only_its_key(self):
+        PriceIndex.refresh()
+        rule = PriceRule.objects.get(product=self.products[1], station=None)
+        rule.effective_until = self.now + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            rule.save()
+        self._rule(self.products[1], '120.00', effective_from=self.now + timedelta(days=1))
+
+        with mock.patch.object(pricing, 'compile_rules', wraps=compile_rules) as compiled, self.assertNumQueries(3):
+            PriceIndex.refresh()
+        self.assertEqual(compiled.call_count, 1)
+        self.assertEqual(PriceIndex.price(self.products[1].id), Decimal('100.00'))
+        self.assertEqual(PriceIndex.price(self.products[1].id, at=self.now + timedelta(days=2)), Decimal('120.00'))
+
+    def test_price_change_in_another_process_is_charged_at_once(self):
+        PriceIndex.refresh()
+        CatalogCache.version()
+        # Another process's write: this process's cached catalog version is never dropped
+        with mock.patch.object(CatalogCache, 'invalidate'):
+            self._rule(self.products[0], '110.00', effective_from=self.now - timedelta(days=1))
+        self.assertEqual(PriceIndex.price(self.products[0].id), Decimal('110.00'))
+
+    def test_retired_rules_drop_out(self):
+        PriceIndex.refresh()
+        rule = PriceRule.objects.get(product=self.products[2])
+        rule.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            rule.save()
+        self.assertIsNone(PriceIndex.price(self.products[2].id))
+        with self.assertRaises(ValueError):
+            rule.delete()
+
+
+class PricingViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['catalog'].clear()
+        PriceIndex.reset()
+        self.client = APIClient()
+        self.manager = User.objects.create_user(username='manager', email='manager@test.com', password='pass123')
+        self.manager.profile.role = 'manager'
+        self.manager.profile.save()
+        self.client.force_authenticate(user=self.manager)
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+
+    def tearDown(self):
+        PriceIndex.reset()
+
+    def test_price_rule_write_reprices_quotes_and_catalog(self):
+        etag = self.client.get(reverse('product-catalog'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('price-rules'), {"product": self.product.id, "price": '15000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        catalog = self.client.get(reverse('product-catalog'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(catalog.status_code, status.HTTP_200_OK)
+        self.assertEqual(catalog.json()['data']['prices'][0]['price'], '15000.00')
+
+        quote = self.client.post(reverse('price-quote'), {
+            "lines": [{"product": self.product.id, "quantity": '3'}],
+        }, format='json')
+        self.assertEqual(quote.status_code, status.HTTP_200_OK)
+        self.assertEqual(quote.data['data']['total'], Decimal('45000.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('price-rule-detail', args=[response.data['data']['id']]), {"price": '16000.00'}, format='json')
+        quote = self.client.post(reverse('price-quote'), {
+            "lines": [{"product": self.product.id, "quantity": '1'}],
+        }, format='json')
+        self.assertEqual(quote.data['data']['total'], Decimal('16000.00'))
+
+    def test_rule_key_cannot_be_moved(self):
+        other = Product.objects.create(name='LPG 6kg', sku='LPG-6', category='lpg', unit='cylinder')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('price-rules'), {"product": self.product.id, "price": '15000.00'}, format='json')
+        rule_id = response.data['data']['id']
+        self.assertEqual(PriceIndex.price(self.product.id), Decimal('15000.00'))
+
+        for change in ({"product": other.id}, {"tier": 'wholesale'}):
+            response = self.client.patch(reverse('price-rule-detail', args=[rule_id]), change, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(change)), response.data['data'])
+        self.assertEqual(PriceIndex.price(self.product.id), Decimal('15000.00'))
+        self.assertIsNone(PriceIndex.price(other.id))
+
+        response = self.client.patch(reverse('price-rule-detail', args=[rule_id]),
+                                     {"product": self.product.id, "price": '15500.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unpriced_products_are_reported(self):
+        response = self.client.post(reverse('price-quote'), {
+            "tier": 'wholesale', "lines": [{"product": self.product.id, "quantity": '1'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['data']['unpriced'], [self.product.id])
+
+    def test_rule_end_must_follow_start(self):
+        now = timezone.now()
+        response = self.client.post(reverse('price-rules'), {
+            "product": self.product.id, "price": '1.00',
+            "effective_from": now.isoformat(), "effective_until": (now - timedelta(days=1)).isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,100 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts.tokens import tokens_for_user
+from products.models import Product
+from products.search import SearchIndex
+from stock.models import Station
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches['catalog'].clear()
+        self.user = User.objects.create_user(username='customer', email='customer@test.com', password='pass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens_for_user(self.user).access_token}")
+        self.refill = Product.objects.create(
+            name='Oryx LPG Refill', sku='ORX-12', category='lpg', brand='Oryx', size='12kg', unit='cylinder'
+        )
+        self.regulator = Product.objects.create(
+            name='Regulator for Oryx cylinders', sku='REG-1', category='accessory', brand='Generic'
+        )
+        self.hose = Product.objects.create(name='Gas hose 1.5m', sku='HOSE-15', category='accessory', brand='Total')
+
+    def _search(self, q, **params):
+        return self.client.get(reverse('product-search'), {"q": q, **params})
+
+    def _ids(self, q, **params):
+        return [row['id'] for row in self._search(q, **params).json()['data']['results']]
+
+    def test_name_matches_rank_above_other_columns(self):
+        response = self._search('oryx')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._ids('oryx'), [self.refill.id, self.regulator.id])
+        self.assertEqual(response.json()['data']['results'][0]['sku'], 'ORX-12')
+
+    def test_substrings_short_terms_and_every_term_must_match(self):
+        self.assertEqual(self._ids('GULAT'), [self.regulator.id])
+        self.assertEqual(self._ids('12kg refill'), [self.refill.id])
+        self.assertEqual(self._ids('oryx 12'), [self.refill.id])
+        self.assertEqual(self._ids('hose 100%'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.hose.name = 'Rubber hose 1.5m'
+        self.hose.save()
+        self.assertEqual(self._ids('rubber'), [self.hose.id])
+        self.assertEqual(self._ids('gas hose'), [])
+
+        self.refill.is_active = False
+        self.refill.save()
+        self.assertEqual(self._ids('oryx'), [self.regulator.id])
+
+        self.regulator.delete()
+        self.assertEqual(self._ids('oryx'), [])
+
+    def test_stations_are_searchable(self):
+        station = Station.objects.create(name='Kigali Central', code='KGL01', address='KN 3 Rd, Nyarugenge')
+        Station.objects.create(name='Huye', code='HUY01', address='Main St')
+
+        self.assertEqual(self._ids('nyaru', type='stations'), [station.id])
+        self.assertEqual(self._search('kgl', type='stations').json()['data']['results'][0]['code'], 'KGL01')
+        self.assertEqual(self._search('x', type='users').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._search('  ').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pages_follow_the_cursor_with_constant_queries(self):
+        Product.objects.bulk_create([
+            Product(name=f'Burner {i}', sku=f'BRN-{i}', category='accessory') for i in range(7)
+        ])
+        call_command('rebuild_search_index', kind='products', stdout=StringIO())
+
+        seen, cursor = [], None
+        while True:
+            params = {"page_size": 3, **({"cursor": cursor} if cursor else {})}
+            with self.assertNumQueries(2):
+                data = self._search('burner', **params).json()['data']
+            seen.extend(row['sku'] for row in data['results'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(sorted(seen), sorted(f'BRN-{i}' for i in range(7)))
+        self.assertEqual(self._search('burner', cursor='bad').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_restores_a_stale_index(self):
+        if not SearchIndex.fts_enabled():
+            self.skipTest("The index is only maintained on SQLite")
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM products_product_fts")
+        self.assertEqual(self._ids('oryx'), [])
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 3 products', out.getvalue())
+        self.assertEqual(self._ids('oryx'), [self.refill.id, self.regulator.id])
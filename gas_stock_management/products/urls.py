@@ -0,0 +1,14 @@
+from django.urls import path
+from .views import (
+    CatalogView, SearchView, ProductListView, ProductDetailView, PriceRuleListView, PriceRuleDetailView, QuoteView
+)
+
+urlpatterns = [
+    path('', ProductListView.as_view(), name='products'),
+    path('catalog/', CatalogView.as_view(), name='product-catalog'),
+    path('search/', SearchView.as_view(), name='product-search'),
+    path('prices/', PriceRuleListView.as_view(), name='price-rules'),
+    path('prices/<int:rule_id>/', PriceRuleDetailView.as_view(), name='price-rule-detail'),
+    path('quote/', QuoteView.as_view(), name='price-quote'),
+    path('<int:product_id>/', ProductDetailView.as_view(), name='product-detail'),
+]
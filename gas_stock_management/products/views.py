@@ -1,3 +1,101 @@
-from django.shortcuts import render
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from accounts.permissions import IsManager
+from gas_stock_management.pagination import clamp_page_size
+from products.search import INDEXES
+from products.services.pricing_services import PricingService
+from products.services.product_services import ProductService
 
-# Create your views here.
+
+class CatalogView(APIView):
+    """
+    The active product catalog as pre-serialized JSON with a strong ETag.
+    Clients send it back in If-None-Match and get a bodiless 304 until the
+    catalog changes.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        service_response = ProductService.get_catalog(request.headers.get('If-None-Match'))
+        etag = service_response["data"]["etag"]
+        if service_response["status_code"] == status.HTTP_304_NOT_MODIFIED:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(service_response["data"]["body"], content_type='application/json')
+        response['ETag'] = etag
+        # Stored by clients, but revalidated on every use
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+class SearchView(APIView):
+    """Active products (or stations with `?type=stations`) matching `?q=`, best match first."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        kind = request.query_params.get('type', 'products')
+        if not query:
+            return Response({
+                "success": False,
+                "message": "'q' is required",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if kind not in INDEXES:
+            return Response({
+                "success": False,
+                "message": "Invalid type",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        service_response = ProductService.search(
+            kind,
+            query,
+            cursor=request.query_params.get('cursor'),
+            limit=clamp_page_size(request.query_params.get('page_size'))
+        )
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class ProductListView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def post(self, request):
+        service_response = ProductService.create_product(request.data, user_id=request.user.id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_201_CREATED))
+
+
+class ProductDetailView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def patch(self, request, product_id):
+        service_response = ProductService.update_product(product_id, request.data, user_id=request.user.id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class PriceRuleListView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def post(self, request):
+        service_response = PricingService.create_rule(request.data, user_id=request.user.id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_201_CREATED))
+
+
+class PriceRuleDetailView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def patch(self, request, rule_id):
+        service_response = PricingService.update_rule(rule_id, request.data, user_id=request.user.id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class QuoteView(APIView):
+    """Price a cart of `lines` for a station and tier without placing an order."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        service_response = PricingService.quote(request.data)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
@@ -1,3 +1,13 @@
 from django.contrib import admin
+from .models import DemandForecast, ReconciliationRun
 
-# Register your models here.
+@admin.register(ReconciliationRun)
+class ReconciliationRunAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'since', 'until', 'stations_checked', 'discrepancies', 'created_at', 'finished_at')
+    list_filter = ('status',)
+
+
+@admin.register(DemandForecast)
+class DemandForecastAdmin(admin.ModelAdmin):
+    list_display = ('station', 'product', 'as_of', 'moving_average', 'smoothed', 'reorder_point', 'reorder_quantity')
+    list_filter = ('station',)
@@ -0,0 +1,42 @@
+import time
+from gas_stock_management.caching import CacheCounters, VersionedCache
+
+GENERATION_KEY = "reports:forecasts:generation"
+
+
+class ForecastCache(VersionedCache):
+    """
+    Read-through cache of each station's serialized demand forecasts served
+    by `ReportsService.get_forecasts`. Keys carry a generation that the
+    nightly forecast run replaces, which drops every station's entry at
+    once; caches not shared between processes pick it up within the cache
+    timeout.
+    """
+    counters = CacheCounters()
+
+    @classmethod
+    def _generation(cls) -> int:
+        generation = cls._get(GENERATION_KEY)
+        if generation is None:
+            generation = time.time_ns()
+            cls._add(GENERATION_KEY, generation)
+        return generation
+
+    @classmethod
+    def _key(cls, station_id) -> str:
+        return f"reports:forecasts:{cls._generation()}:{station_id}"
+
+    @classmethod
+    def get(cls, station_id):
+        payload = cls._get(cls._key(station_id))
+        cls._count("hits" if payload is not None else "misses")
+        return payload
+
+    @classmethod
+    def set(cls, station_id, payload: list) -> None:
+        cls._set(cls._key(station_id), payload)
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        cls._set(GENERATION_KEY, time.time_ns())
+        cls._count("invalidations")
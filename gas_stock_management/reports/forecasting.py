@@ -0,0 +1,122 @@
+import math
+from array import array
+from collections import deque
+
+try:
+    import numpy
+except ImportError:  # optional; the array module covers the same operations
+    numpy = None
+
+# Suggestions are rounded up to whole units; float noise below this many
+# decimals must not add a unit
+ROUNDING = 6
+
+
+def _column(values):
+    if numpy is not None:
+        return numpy.fromiter(values, dtype=numpy.float64)
+    return array('d', values)
+
+
+def _blend(level, demand, alpha: float):
+    """Exponential smoothing step: level + alpha * (demand - level)."""
+    if numpy is not None:
+        return level + alpha * (demand - level)
+    return array('d', (old + alpha * (new - old) for old, new in zip(level, demand)))
+
+
+def _roll(total, entering, leaving, power: int = 1):
+    """Rolling sum of values (or squares) after one day enters the window and one leaves."""
+    if numpy is not None:
+        return total + entering ** power - leaving ** power
+    return array('d', (t + e ** power - l ** power for t, e, l in zip(total, entering, leaving)))
+
+
+def _count(observed, demand):
+    """Days observed per series: a series starts counting at its first sale."""
+    if numpy is not None:
+        return observed + ((observed > 0) | (demand > 0))
+    return array('d', (n + (n > 0 or d > 0) for n, d in zip(observed, demand)))
+
+
+class DemandFrame:
+    """
+    Daily demand state for many (station, product) series held as columns
+    (one entry per series), so each day advances every series at once:
+    an exponentially smoothed level, the count of days observed and the
+    last `window_days` daily demands with their running sum and sum of
+    squares for the moving average and its spread.
+    """
+
+    def __init__(self, keys: list, state: dict, window_days: int):
+        """`state` maps a key to (level, observed days, recent daily demands); other keys start empty."""
+        self.keys = sorted(keys)
+        self.window_days = window_days
+        empty = (0.0, 0, ())
+        rows = [state.get(key, empty) for key in self.keys]
+        self.level = _column(row[0] for row in rows)
+        self.observed = _column(row[1] for row in rows)
+
+        # Stored windows are oldest first and may be shorter than window_days
+        padded = [[0.0] * (window_days - len(row[2])) + list(row[2])[-window_days:] for row in rows]
+        self.window = deque(_column(day) for day in zip(*padded)) if padded else deque(
+            _column(()) for _ in range(window_days)
+        )
+        self.total = _column(sum(series) for series in padded)
+        self.squares = _column(sum(value * value for value in series) for series in padded)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def advance(self, days: list, alpha: float) -> None:
+        """Fold in consecutive days, each a {key: quantity sold} dict (missing keys sold nothing)."""
+        for sales in days:
+            demand = _column(float(sales.get(key, 0)) for key in self.keys)
+            leaving = self.window.popleft()
+            self.window.append(demand)
+            self.total = _roll(self.total, demand, leaving)
+            self.squares = _roll(self.squares, demand, leaving, power=2)
+            self.observed = _count(self.observed, demand)
+            self.level = _blend(self.level, demand, alpha)
+
+    def state(self) -> dict:
+        """{key: (level, observed days, recent daily demands)} to persist and resume from."""
+        windows = list(zip(*self.window)) if self.keys else []
+        return {
+            key: (float(self.level[i]), int(self.observed[i]), [float(value) for value in windows[i]])
+            for i, key in enumerate(self.keys)
+        }
+
+    def forecast(self, alpha: float, lead_time_days: float, review_days: float, service_z: float) -> dict:
+        """
+        {key: (moving average, smoothed demand, reorder point, reorder
+        quantity)} in units per day / units. The smoothed level is corrected
+        for starting at zero; the reorder point covers the lead time plus
+        `service_z` standard deviations of daily demand over it.
+        """
+        if numpy is not None:
+            seen = numpy.maximum(numpy.minimum(self.observed, self.window_days), 1)
+            mean = self.total / seen
+            spread = numpy.sqrt(numpy.maximum(self.squares / seen - mean ** 2, 0))
+            warmup = 1 - (1 - alpha) ** self.observed
+            rate = numpy.divide(self.level, warmup, out=numpy.zeros_like(self.level), where=warmup > 0)
+            reorder_point = numpy.ceil(numpy.round(
+                rate * lead_time_days + service_z * spread * math.sqrt(lead_time_days), ROUNDING
+            ))
+            reorder_quantity = numpy.ceil(numpy.round(rate * review_days, ROUNDING))
+            columns = zip(mean.tolist(), rate.tolist(), reorder_point.tolist(), reorder_quantity.tolist())
+        else:
+            columns = []
+            for level, observed, total, squares in zip(self.level, self.observed, self.total, self.squares):
+                seen = max(min(observed, self.window_days), 1)
+                mean = total / seen
+                spread = math.sqrt(max(squares / seen - mean * mean, 0))
+                warmup = 1 - (1 - alpha) ** observed
+                rate = level / warmup if warmup > 0 else 0.0
+                columns.append((
+                    mean,
+                    rate,
+                    math.ceil(round(rate * lead_time_days + service_z * spread * math.sqrt(lead_time_days), ROUNDING)),
+                    math.ceil(round(rate * review_days, ROUNDING)),
+                ))
+        return dict(zip(self.keys, columns))
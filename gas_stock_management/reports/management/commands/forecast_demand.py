@@ -0,0 +1,25 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from reports.services.reports_services import ReportsService
+
+
+class Command(BaseCommand):
+    help = "Fold the days since the last run into the demand forecasts (run nightly)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--until', help="Date (YYYY-MM-DD) to forecast up to, excluded; defaults to today")
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            try:
+                until = datetime.strptime(options['until'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("--until must be a date in YYYY-MM-DD format")
+
+        result = ReportsService.forecast_demand(until=until)
+        if not result['success']:
+            raise CommandError(result['message'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['message']} (as of {result['data']['as_of']})"
+        ))
@@ -0,0 +1,68 @@
+import json
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from reports.services.reports_services import ReportsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile stock across all stations and write discrepancies above tolerance as JSON lines. "
+        "Progress is checkpointed per chunk of stations; --resume continues an interrupted run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help="Start date (YYYY-MM-DD) of the movement window; defaults to yesterday")
+        parser.add_argument('--until', help="End date (YYYY-MM-DD, exclusive); defaults to today")
+        parser.add_argument('--tolerance', default='0', help="Absolute variance tolerated per station and product")
+        parser.add_argument('--chunk-size', type=int, default=200, help="Stations reconciled per chunk")
+        parser.add_argument('--resume', nargs='?', const=0, type=int, metavar='RUN_ID',
+                            help="Resume a run (default: the latest unfinished one)")
+        parser.add_argument('--output', help="Append discrepancies to this file instead of stdout")
+
+    def _date(self, value, default):
+        if not value:
+            return default
+        try:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def handle(self, *args, **options):
+        if options['resume'] is not None:
+            result = ReportsService.get_reconciliation(options['resume'] or None)
+            if not result['success']:
+                raise CommandError(result['message'])
+            run = result['data']['run']
+            if run.status != 'running':
+                raise CommandError(f"Run {run.pk} is {run.status}, nothing to resume")
+        else:
+            today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+            try:
+                tolerance = Decimal(options['tolerance'])
+            except InvalidOperation:
+                raise CommandError("--tolerance must be a number")
+            if options['chunk_size'] < 1:
+                raise CommandError("--chunk-size must be at least 1")
+            run = ReportsService.start_reconciliation(
+                since=self._date(options['since'], today - timedelta(days=1)),
+                until=self._date(options['until'], today),
+                tolerance=tolerance,
+                chunk_size=options['chunk_size'],
+            )['data']['run']
+
+        output = open(options['output'], 'a') if options['output'] else self.stdout
+        try:
+            for discrepancies in ReportsService.reconcile_stock(run):
+                for discrepancy in discrepancies:
+                    output.write(json.dumps(discrepancy) + '\n')
+                output.flush()
+        finally:
+            if options['output']:
+                output.close()
+
+        self.stderr.write(self.style.SUCCESS(
+            f"Run {run.pk}: {run.stations_checked} stations checked, {run.discrepancies} discrepancies"
+        ))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('reports', '0001_initial'),
+        ('stock', '0005_cylinders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemandForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('as_of', models.DateField(db_index=True)),
+                ('level', models.FloatField(default=0)),
+                ('observed_days', models.PositiveIntegerField(default=0)),
+                ('recent', models.JSONField(default=list)),
+                ('moving_average', models.DecimalField(decimal_places=3, default=0, max_digits=14)),
+                ('smoothed', models.DecimalField(decimal_places=3, default=0, max_digits=14)),
+                ('reorder_point', models.DecimalField(decimal_places=3, default=0, max_digits=14)),
+                ('reorder_quantity', models.DecimalField(decimal_places=3, default=0, max_digits=14)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='demand_forecasts', to='products.product')),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='demand_forecasts', to='stock.station')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('station', 'product'), name='demand_forecast_station_product_uniq')],
+            },
+        ),
+    ]
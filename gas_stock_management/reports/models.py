@@ -1,3 +1,57 @@
 from django.db import models
+from gas_stock_management.base.models import BaseModel
+from products.models import Product
+from stock.models import Station
 
-# Create your models here.
+
+class ReconciliationRun(BaseModel):
+    """
+    One stock reconciliation pass over all stations, in station id order.
+    `last_station_id` is the checkpoint: every station up to it has been
+    reconciled and its discrepancies written out.
+    """
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    since = models.DateTimeField()
+    until = models.DateTimeField()
+    tolerance = models.DecimalField(max_digits=14, decimal_places=3, default=0)
+    chunk_size = models.PositiveIntegerField(default=200)
+    last_station_id = models.BigIntegerField(default=0)
+    stations_checked = models.PositiveIntegerField(default=0)
+    discrepancies = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Reconciliation {self.pk} ({self.status})"
+
+
+class DemandForecast(BaseModel):
+    """
+    Daily demand forecast for one (station, product) from its sales up to
+    and including `as_of`, with the smoothing state the next nightly run
+    continues from: the exponentially smoothed `level`, the days observed
+    since the first sale and the `recent` daily sales of the moving-average
+    window (oldest first).
+    """
+    station = models.ForeignKey(Station, on_delete=models.CASCADE, related_name='demand_forecasts')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='demand_forecasts')
+    as_of = models.DateField(db_index=True)
+    level = models.FloatField(default=0)
+    observed_days = models.PositiveIntegerField(default=0)
+    recent = models.JSONField(default=list)
+    moving_average = models.DecimalField(max_digits=14, decimal_places=3, default=0)
+    smoothed = models.DecimalField(max_digits=14, decimal_places=3, default=0)
+    reorder_point = models.DecimalField(max_digits=14, decimal_places=3, default=0)
+    reorder_quantity = models.DecimalField(max_digits=14, decimal_places=3, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['station', 'product'], name='demand_forecast_station_product_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}@{self.station_id} as of {self.as_of}: {self.smoothed}/day"
@@ -0,0 +1,85 @@
+import operator
+from array import array
+from decimal import Decimal
+
+try:
+    import numpy
+except ImportError:  # optional; the array module covers the same operations
+    numpy = None
+
+# Quantities have three decimal places; columns hold exact integer thousandths
+SCALE = 1000
+
+
+def _units(value) -> int:
+    return int(value * SCALE) if value else 0
+
+
+def _quantity(units) -> str:
+    return str(Decimal(int(units)).scaleb(-3))
+
+
+class ColumnFrame:
+    """
+    Aggregated source rows aligned on one (station, product) index and
+    stored as compact int64 columns named "<source>.<column>". Pairs missing
+    from a source read as zero.
+    """
+
+    def __init__(self, sources: dict):
+        """`sources` maps a source name to (column names, rows of (station, product, *values))."""
+        by_source = {}
+        keys = set()
+        for name, (columns, rows) in sources.items():
+            values = {(row[0], row[1]): row[2:] for row in rows}
+            by_source[name] = (columns, values)
+            keys.update(values)
+
+        self.keys = sorted(keys)
+        self.columns = {}
+        zeros = (0,) * max((len(columns) for columns, _ in by_source.values()), default=0)
+        for name, (columns, values) in by_source.items():
+            for position, column in enumerate(columns):
+                self.columns[f"{name}.{column}"] = array(
+                    'q', (_units(values.get(key, zeros)[position]) for key in self.keys)
+                )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def variance(self, left: str, right: str):
+        if numpy is not None:
+            return numpy.frombuffer(self.columns[left], dtype=numpy.int64) \
+                - numpy.frombuffer(self.columns[right], dtype=numpy.int64)
+        return array('q', map(operator.sub, self.columns[left], self.columns[right]))
+
+    @staticmethod
+    def beyond(values, tolerance_units: int) -> list:
+        """Positions whose absolute value exceeds the tolerance."""
+        if numpy is not None:
+            return numpy.flatnonzero(numpy.abs(values) > tolerance_units).tolist()
+        return [position for position, value in enumerate(values) if value > tolerance_units or -value > tolerance_units]
+
+
+def find_discrepancies(frame: ColumnFrame, checks: list, tolerance: Decimal) -> list:
+    """
+    Run each (name, left column, right column) check over the whole frame
+    at once and return only the pairs whose variance exceeds `tolerance`.
+    """
+    tolerance_units = _units(tolerance)
+    found = []
+    for name, left, right in checks:
+        if left not in frame.columns or right not in frame.columns:
+            continue
+        variance = frame.variance(left, right)
+        for position in ColumnFrame.beyond(variance, tolerance_units):
+            station_id, product_id = frame.keys[position]
+            found.append({
+                "check": name,
+                "station_id": station_id,
+                "product_id": product_id,
+                left: _quantity(frame.columns[left][position]),
+                right: _quantity(frame.columns[right][position]),
+                "variance": _quantity(variance[position]),
+            })
+    return found
@@ -0,0 +1,143 @@
+from django.db import transaction
+from django.db.models import Max, Min, Q, Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+from rest_framework import status
+from orders.models import Order, OrderLine
+from reports.models import DemandForecast, ReconciliationRun
+from stock.models import Station, StockBalance, StockMovement
+from gas_stock_management.response import RepositoryResponse
+
+RECEIVED_TYPES = [StockMovement.RECEIPT, StockMovement.TRANSFER_IN]
+SOLD_TYPES = [StockMovement.SALE]
+
+
+class ReportsRepository:
+    @staticmethod
+    def station_ids_after(after_id: int, limit: int) -> list:
+        return list(Station.objects.filter(id__gt=after_id).order_by('id').values_list('id', flat=True)[:limit])
+
+    @staticmethod
+    def ledger_totals(first_station_id: int, last_station_id: int, since, until) -> list:
+        """
+        (station, product, net, received, sold) per pair in one grouped query:
+        `net` over the whole ledger (comparable with current balances),
+        received and sold (positive) within [since, until).
+        """
+        in_window = Q(created_at__gte=since, created_at__lt=until)
+        return list(
+            StockMovement.objects.filter(station_id__gte=first_station_id, station_id__lte=last_station_id)
+            .values('station_id', 'product_id')
+            .annotate(
+                net=Sum('quantity'),
+                received=Sum('quantity', filter=in_window & Q(movement_type__in=RECEIVED_TYPES)),
+                sold=-Sum('quantity', filter=in_window & Q(movement_type__in=SOLD_TYPES)),
+            )
+            .order_by()
+            .values_list('station_id', 'product_id', 'net', 'received', 'sold')
+        )
+
+    @staticmethod
+    def balance_totals(first_station_id: int, last_station_id: int) -> list:
+        return list(
+            StockBalance.objects.filter(station_id__gte=first_station_id, station_id__lte=last_station_id)
+            .values_list('station_id', 'product_id', 'quantity', 'reserved')
+        )
+
+    @staticmethod
+    def open_order_totals(first_station_id: int, last_station_id: int) -> list:
+        """(station, product, reserved) summed over the lines of pending orders, in one grouped query."""
+        return list(
+            OrderLine.objects.filter(
+                order__status=Order.PENDING,
+                order__station_id__gte=first_station_id,
+                order__station_id__lte=last_station_id,
+            )
+            .values('order__station_id', 'product_id')
+            .annotate(reserved=Sum('quantity'))
+            .order_by()
+            .values_list('order__station_id', 'product_id', 'reserved')
+        )
+
+    @staticmethod
+    def create_run(since, until, tolerance, chunk_size: int, created_by_id: int = None) -> RepositoryResponse:
+        run = ReconciliationRun.objects.create(
+            since=since, until=until, tolerance=tolerance, chunk_size=chunk_size, created_by_id=created_by_id
+        )
+        return RepositoryResponse(success=True, data={"run": run}, status_code=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def get_run(run_id: int = None) -> RepositoryResponse:
+        """A run by id, or the most recent unfinished one."""
+        runs = ReconciliationRun.objects.all()
+        run = runs.filter(id=run_id).first() if run_id else runs.filter(status='running').order_by('-id').first()
+        if run is None:
+            return RepositoryResponse(
+                success=False,
+                message="Reconciliation run not found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return RepositoryResponse(success=True, data={"run": run}, status_code=status.HTTP_200_OK)
+
+    @staticmethod
+    def checkpoint_run(run: ReconciliationRun, last_station_id: int, stations: int, discrepancies: int) -> None:
+        run.last_station_id = last_station_id
+        run.stations_checked += stations
+        run.discrepancies += discrepancies
+        run.save()
+
+    @staticmethod
+    def finish_run(run: ReconciliationRun, status_value: str = 'completed') -> None:
+        run.status = status_value
+        run.finished_at = timezone.now()
+        run.save()
+
+    @staticmethod
+    def forecast_watermark():
+        """The last day folded into the forecasts, or None before the first run."""
+        return DemandForecast.objects.aggregate(last=Max('as_of'))['last']
+
+    @staticmethod
+    def first_sale_at():
+        return StockMovement.objects.filter(movement_type__in=SOLD_TYPES).aggregate(first=Min('created_at'))['first']
+
+    @staticmethod
+    def daily_sales(since, until) -> list:
+        """(local day, station, product, quantity sold) for every pair that sold in [since, until), in one grouped query."""
+        return list(
+            StockMovement.objects.filter(movement_type__in=SOLD_TYPES, created_at__gte=since, created_at__lt=until)
+            .annotate(day=TruncDay('created_at', tzinfo=timezone.get_current_timezone()))
+            .values('day', 'station_id', 'product_id')
+            .annotate(sold=-Sum('quantity'))
+            .order_by('day')
+            .values_list('day', 'station_id', 'product_id', 'sold')
+        )
+
+    @staticmethod
+    def forecast_state() -> dict:
+        """{(station, product): (forecast id, level, observed days, recent daily sales)}."""
+        return {
+            (station_id, product_id): (forecast_id, level, observed_days, recent)
+            for forecast_id, station_id, product_id, level, observed_days, recent in DemandForecast.objects
+            .values_list('id', 'station_id', 'product_id', 'level', 'observed_days', 'recent')
+        }
+
+    @staticmethod
+    def save_forecasts(forecasts: list) -> None:
+        """Update existing forecasts (those with an id) and insert the rest, in one transaction."""
+        fields = [
+            'as_of', 'level', 'observed_days', 'recent', 'moving_average', 'smoothed',
+            'reorder_point', 'reorder_quantity', 'updated_at',
+        ]
+        now = timezone.now()
+        for forecast in forecasts:
+            forecast.updated_at = now
+        with transaction.atomic():
+            DemandForecast.objects.bulk_update([f for f in forecasts if f.pk], fields, batch_size=500)
+            DemandForecast.objects.bulk_create([f for f in forecasts if not f.pk], batch_size=500)
+
+    @staticmethod
+    def station_forecasts(station_id: int) -> list:
+        return list(
+            DemandForecast.objects.select_related('product').filter(station_id=station_id).order_by('product_id')
+        )
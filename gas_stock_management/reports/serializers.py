@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from .models import DemandForecast
+
+
+class DemandForecastSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+
+    class Meta:
+        model = DemandForecast
+        fields = [
+            'station', 'product', 'product_name', 'as_of', 'moving_average', 'smoothed',
+            'reorder_point', 'reorder_quantity', 'observed_days',
+        ]
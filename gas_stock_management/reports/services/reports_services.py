@@ -0,0 +1,191 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from reports.cache import ForecastCache
+from reports.forecasting import DemandFrame
+from reports.models import DemandForecast
+from reports.reconciliation import ColumnFrame, find_discrepancies
+from reports.repository.reports_repository import ReportsRepository
+from reports.serializers import DemandForecastSerializer
+
+
+class ReportsService:
+    # (name, left column, right column); each source adds "<source>.<column>" columns
+    RECONCILIATION_CHECKS = [
+        ('balance_vs_ledger', 'balance.quantity', 'ledger.net'),
+        ('reserved_vs_open_orders', 'balance.reserved', 'orders.reserved'),
+    ]
+
+    @staticmethod
+    def _reconciliation_sources(first_station_id: int, last_station_id: int, since, until) -> dict:
+        """One aggregated query per source for a range of stations."""
+        return {
+            'ledger': (
+                ('net', 'received', 'sold'),
+                ReportsRepository.ledger_totals(first_station_id, last_station_id, since, until),
+            ),
+            'balance': (
+                ('quantity', 'reserved'),
+                ReportsRepository.balance_totals(first_station_id, last_station_id),
+            ),
+            'orders': (
+                ('reserved',),
+                ReportsRepository.open_order_totals(first_station_id, last_station_id),
+            ),
+        }
+
+    @staticmethod
+    def start_reconciliation(since, until, tolerance: Decimal = Decimal('0'), chunk_size: int = 200,
+                             user_id: int = None):
+        repo_response = ReportsRepository.create_run(since, until, tolerance, chunk_size, created_by_id=user_id)
+        return {
+            "success": True,
+            "message": "Reconciliation run created",
+            "data": {"run": repo_response.data['run']},
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def get_reconciliation(run_id: int = None):
+        repo_response = ReportsRepository.get_run(run_id)
+        return {
+            "success": repo_response.success,
+            "message": repo_response.message or "Reconciliation run retrieved",
+            "data": repo_response.data or {},
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def reconcile_stock(run):
+        """
+        Generator over a run's discrepancies, one list per chunk of stations,
+        continuing after the run's checkpoint. The checkpoint advances when
+        the consumer asks for the next chunk, i.e. after it has written the
+        previous one out, so a resumed run repeats at most one chunk.
+        """
+        try:
+            while True:
+                station_ids = ReportsRepository.station_ids_after(run.last_station_id, run.chunk_size)
+                if not station_ids:
+                    break
+                sources = ReportsService._reconciliation_sources(station_ids[0], station_ids[-1], run.since, run.until)
+                frame = ColumnFrame(sources)
+                found = find_discrepancies(frame, ReportsService.RECONCILIATION_CHECKS, run.tolerance)
+                yield found
+                ReportsRepository.checkpoint_run(run, station_ids[-1], len(station_ids), len(found))
+        except Exception:
+            ReportsRepository.finish_run(run, 'failed')
+            raise
+        ReportsRepository.finish_run(run)
+
+    @staticmethod
+    def _forecast_config() -> dict:
+        return {
+            'WINDOW_DAYS': 28,
+            'ALPHA': 0.3,
+            'HISTORY_DAYS': 180,
+            'LEAD_TIME_DAYS': 3,
+            'REVIEW_DAYS': 7,
+            'SERVICE_Z': 1.65,
+            **getattr(settings, 'DEMAND_FORECAST', {}),
+        }
+
+    @staticmethod
+    def forecast_demand(until=None):
+        """
+        Fold the days since the last run, up to but excluding `until` (a
+        date, default today), into every (station, product) forecast. Only
+        those days' sales are read, in one grouped query; all series are
+        then advanced together a day at a time, including days they sold
+        nothing. The first run starts at the first sale, at most
+        HISTORY_DAYS back. Cached forecasts are dropped once saved.
+        """
+        config = ReportsService._forecast_config()
+        until = until or timezone.localdate()
+        watermark = ReportsRepository.forecast_watermark()
+        if watermark is not None:
+            start = watermark + timedelta(days=1)
+        else:
+            first_sale = ReportsRepository.first_sale_at()
+            if first_sale is None:
+                return {
+                    "success": True,
+                    "message": "No sales to forecast from",
+                    "data": {"series": 0, "days": 0, "as_of": None},
+                    "status_code": status.HTTP_200_OK
+                }
+            start = max(timezone.localdate(first_sale), until - timedelta(days=config['HISTORY_DAYS']))
+        if start >= until:
+            return {
+                "success": True,
+                "message": "Forecasts are up to date",
+                "data": {"series": 0, "days": 0, "as_of": watermark},
+                "status_code": status.HTTP_200_OK
+            }
+
+        def boundary(day):
+            return timezone.make_aware(datetime.combine(day, time.min))
+
+        day_count = (until - start).days
+        days = [defaultdict(float) for _ in range(day_count)]
+        keys = set()
+        for day, station_id, product_id, sold in ReportsRepository.daily_sales(boundary(start), boundary(until)):
+            days[(timezone.localdate(day) - start).days][(station_id, product_id)] += float(sold)
+            keys.add((station_id, product_id))
+
+        stored = ReportsRepository.forecast_state()
+        frame = DemandFrame(
+            keys | stored.keys(),
+            {key: (level, observed, recent) for key, (_, level, observed, recent) in stored.items()},
+            config['WINDOW_DAYS'],
+        )
+        frame.advance(days, config['ALPHA'])
+        state = frame.state()
+        forecasts = frame.forecast(
+            config['ALPHA'], config['LEAD_TIME_DAYS'], config['REVIEW_DAYS'], config['SERVICE_Z']
+        )
+
+        as_of = until - timedelta(days=1)
+        quantize = Decimal('0.001')
+        rows = []
+        for key, (moving_average, smoothed, reorder_point, reorder_quantity) in forecasts.items():
+            level, observed, recent = state[key]
+            rows.append(DemandForecast(
+                id=stored[key][0] if key in stored else None,
+                station_id=key[0],
+                product_id=key[1],
+                as_of=as_of,
+                level=level,
+                observed_days=observed,
+                recent=recent,
+                moving_average=Decimal(moving_average).quantize(quantize),
+                smoothed=Decimal(smoothed).quantize(quantize),
+                reorder_point=Decimal(reorder_point),
+                reorder_quantity=Decimal(reorder_quantity),
+            ))
+        ReportsRepository.save_forecasts(rows)
+        ForecastCache.invalidate_all()
+        return {
+            "success": True,
+            "message": f"Forecast {len(rows)} series over {day_count} days",
+            "data": {"series": len(rows), "days": day_count, "as_of": as_of},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def get_forecasts(station_id: int, product_id: int = None):
+        forecasts = ForecastCache.get(station_id)
+        if forecasts is None:
+            forecasts = list(DemandForecastSerializer(ReportsRepository.station_forecasts(station_id), many=True).data)
+            ForecastCache.set(station_id, forecasts)
+        if product_id is not None:
+            forecasts = [forecast for forecast in forecasts if forecast['product'] == product_id]
+        return {
+            "success": True,
+            "message": "Demand forecasts retrieved successfully",
+            "data": {"forecasts": forecasts},
+            "status_code": status.HTTP_200_OK
+        }
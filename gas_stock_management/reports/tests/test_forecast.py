@@ -0,0 +1,122 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from products.models import Product
+from reports.cache import ForecastCache
+from reports.forecasting import DemandFrame
+from reports.models import DemandForecast
+from reports.services.reports_services import ReportsService
+from stock.models import Station, StockMovement
+
+
+class DemandFrameTests(TestCase):
+    def test_steady_demand(self):
+        frame = DemandFrame([(1, 1)], {}, window_days=7)
+        frame.advance([{(1, 1): 4}] * 10, alpha=0.3)
+
+        moving_average, smoothed, reorder_point, reorder_quantity = frame.forecast(0.3, 3, 7, 1.65)[(1, 1)]
+        self.assertAlmostEqual(moving_average, 4)
+        self.assertAlmostEqual(smoothed, 4)
+        self.assertEqual((reorder_point, reorder_quantity), (12, 28))
+
+    def test_series_advance_together_and_start_at_first_sale(self):
+        frame = DemandFrame([(1, 1), (1, 2)], {}, window_days=4)
+        frame.advance([{(1, 1): 2}, {(1, 1): 2, (1, 2): 6}, {(1, 1): 2}], alpha=0.5)
+
+        forecasts = frame.forecast(0.5, 1, 1, 0)
+        self.assertAlmostEqual(forecasts[(1, 1)][0], 2)
+        # Two days observed since its first sale: 6 then 0
+        self.assertAlmostEqual(forecasts[(1, 2)][0], 3)
+        self.assertAlmostEqual(forecasts[(1, 2)][1], 2)
+        self.assertEqual(frame.state()[(1, 2)][1:], (2, [0.0, 0.0, 6.0, 0.0]))
+
+    def test_resuming_from_state_matches_one_pass(self):
+        days = [{(1, 1): n % 5, (2, 1): 3} for n in range(40)]
+        whole = DemandFrame([(1, 1), (2, 1)], {}, window_days=7)
+        whole.advance(days, alpha=0.3)
+
+        first = DemandFrame([(1, 1), (2, 1)], {}, window_days=7)
+        first.advance(days[:25], alpha=0.3)
+        resumed = DemandFrame([(1, 1), (2, 1)], first.state(), window_days=7)
+        resumed.advance(days[25:], alpha=0.3)
+
+        for key, expected in whole.forecast(0.3, 3, 7, 1.65).items():
+            for value, other in zip(resumed.forecast(0.3, 3, 7, 1.65)[key], expected):
+                self.assertAlmostEqual(value, other)
+
+
+class DemandForecastServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        self.today = date(2026, 3, 31)
+
+    def _sell(self, day, quantity, product=None):
+        movement = StockMovement.objects.create(
+            station=self.station, product=product or self.product, movement_type=StockMovement.SALE,
+            quantity=-Decimal(quantity),
+        )
+        StockMovement.objects.filter(pk=movement.pk).update(
+            created_at=timezone.make_aware(datetime.combine(day, time(12)))
+        )
+
+    def test_nightly_runs_only_fold_new_days(self):
+        for offset in range(1, 15):
+            self._sell(self.today - timedelta(days=offset), 5)
+
+        first = ReportsService.forecast_demand(until=self.today - timedelta(days=7))
+        self.assertEqual(first['data']['days'], 7)
+        second = ReportsService.forecast_demand(until=self.today)
+        self.assertEqual((second['data']['days'], second['data']['as_of']), (7, self.today - timedelta(days=1)))
+        self.assertEqual(ReportsService.forecast_demand(until=self.today)['data']['days'], 0)
+
+        forecast = DemandForecast.objects.get(station=self.station, product=self.product)
+        self.assertEqual(forecast.observed_days, 14)
+        self.assertEqual(forecast.moving_average, Decimal('5.000'))
+        self.assertEqual(forecast.smoothed, Decimal('5.000'))
+        self.assertEqual((forecast.reorder_point, forecast.reorder_quantity), (Decimal('15'), Decimal('35')))
+
+    def test_series_without_new_sales_still_advance(self):
+        other = Product.objects.create(name='LPG 6kg', sku='LPG-6', category='lpg', unit='cylinder')
+        self._sell(self.today - timedelta(days=3), 6, product=other)
+        self._sell(self.today - timedelta(days=2), 6)
+        ReportsService.forecast_demand(until=self.today - timedelta(days=1))
+        ReportsService.forecast_demand(until=self.today)
+
+        forecasts = DemandForecast.objects.filter(station=self.station).order_by('product_id')
+        self.assertEqual([f.as_of for f in forecasts], [self.today - timedelta(days=1)] * 2)
+        self.assertEqual([f.observed_days for f in forecasts], [2, 3])
+        self.assertEqual([f.moving_average for f in forecasts], [Decimal('3.000'), Decimal('2.000')])
+
+    def test_endpoint_serves_cached_forecasts(self):
+        manager = User.objects.create_user(username='manager', email='manager@test.com', password='pass123')
+        manager.profile.role = 'manager'
+        manager.profile.save()
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        self._sell(self.today - timedelta(days=1), 4)
+        call_command('forecast_demand', until=self.today.isoformat(), stdout=StringIO())
+
+        ForecastCache.reset_stats()
+        url = reverse('demand-forecasts')
+        response = client.get(url, {"station": self.station.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['forecasts'][0]['reorder_quantity'], '28.000')
+        with self.assertNumQueries(0):
+            ReportsService.get_forecasts(self.station.id, self.product.id)
+        self.assertEqual(ForecastCache.stats()['hits'], 1)
+
+        self._sell(self.today, 4)
+        ReportsService.forecast_demand(until=self.today + timedelta(days=1))
+        response = client.get(url, {"station": self.station.id, "product": self.product.id})
+        self.assertEqual(response.data['data']['forecasts'][0]['as_of'], self.today.isoformat())
+        self.assertEqual(client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
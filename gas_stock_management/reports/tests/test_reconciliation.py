@@ -0,0 +1,120 @@
+import json
+from array import array
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from products.models import Product
+from reports import reconciliation
+from reports.models import ReconciliationRun
+from reports.reconciliation import ColumnFrame, find_discrepancies
+from reports.services.reports_services import ReportsService
+from stock.models import Station, StockBalance
+from stock.repository.stock_repository import StockRepository
+
+
+class ColumnFrameTests(TestCase):
+    def setUp(self):
+        self.sources = {
+            'ledger': (('net',), [(1, 1, Decimal('10')), (1, 2, Decimal('4.5')), (2, 1, Decimal('7'))]),
+            'balance': (('quantity',), [(1, 1, Decimal('10')), (1, 2, Decimal('4.25')), (3, 1, Decimal('2'))]),
+        }
+        self.checks = [('balance_vs_ledger', 'balance.quantity', 'ledger.net')]
+
+    def test_columns_are_aligned_int_arrays(self):
+        frame = ColumnFrame(self.sources)
+        self.assertEqual(frame.keys, [(1, 1), (1, 2), (2, 1), (3, 1)])
+        self.assertEqual(frame.columns['ledger.net'], array('q', [10000, 4500, 7000, 0]))
+        self.assertEqual(frame.columns['balance.quantity'], array('q', [10000, 4250, 0, 2000]))
+
+    def test_only_discrepancies_beyond_tolerance(self):
+        frame = ColumnFrame(self.sources)
+        found = find_discrepancies(frame, self.checks, Decimal('0.5'))
+        self.assertEqual([(d['station_id'], d['product_id'], d['variance']) for d in found], [
+            (2, 1, '-7.000'),
+            (3, 1, '2.000'),
+        ])
+        self.assertEqual(len(find_discrepancies(frame, self.checks, Decimal('0'))), 3)
+
+    def test_array_and_numpy_paths_agree(self):
+        frame = ColumnFrame(self.sources)
+        with mock.patch.object(reconciliation, 'numpy', None):
+            expected = find_discrepancies(frame, self.checks, Decimal('0'))
+        if reconciliation.numpy is None:
+            self.skipTest("numpy is not installed")
+        self.assertEqual(find_discrepancies(frame, self.checks, Decimal('0')), expected)
+
+
+class ReconcileStockTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        self.stations = [Station.objects.create(name=f'Station {i}', code=f'ST{i:02d}') for i in range(5)]
+        for station in self.stations:
+            StockRepository.record_movements([{
+                "station_id": station.id, "product_id": self.product.id,
+                "movement_type": 'receipt', "quantity": Decimal('20'),
+            }])
+        # Drift on the second and last stations
+        StockBalance.objects.filter(station=self.stations[1]).update(quantity=Decimal('18'))
+        StockBalance.objects.filter(station=self.stations[4]).update(quantity=Decimal('20.5'))
+        now = timezone.now()
+        self.window = (now - timezone.timedelta(days=1), now + timezone.timedelta(minutes=1))
+
+    def _run(self, **kwargs):
+        return ReportsService.start_reconciliation(*self.window, chunk_size=2, **kwargs)['data']['run']
+
+    def test_one_query_per_source_per_chunk(self):
+        run = self._run()
+        chunks = ReportsService.reconcile_stock(run)
+        # Station ids, then ledger, balances and open orders
+        with self.assertNumQueries(4):
+            found = next(chunks)
+        self.assertEqual([d['station_id'] for d in found], [self.stations[1].id])
+        self.assertEqual(found[0]['ledger.net'], '20.000')
+        self.assertEqual(found[0]['balance.quantity'], '18.000')
+
+    def test_reservations_without_open_orders_are_reported(self):
+        StockBalance.objects.filter(station=self.stations[2]).update(reserved=Decimal('3'))
+        found = [d for chunk in ReportsService.reconcile_stock(self._run()) for d in chunk]
+
+        held = [d for d in found if d['check'] == 'reserved_vs_open_orders']
+        self.assertEqual([d['station_id'] for d in held], [self.stations[2].id])
+        self.assertEqual((held[0]['balance.reserved'], held[0]['orders.reserved']), ('3.000', '0.000'))
+
+    def test_tolerance(self):
+        run = self._run(tolerance=Decimal('1'))
+        found = [d for chunk in ReportsService.reconcile_stock(run) for d in chunk]
+        self.assertEqual([d['station_id'] for d in found], [self.stations[1].id])
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        run = self._run()
+        chunks = ReportsService.reconcile_stock(run)
+        next(chunks)
+        next(chunks)
+        chunks.close()
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, 'running')
+        self.assertEqual(run.last_station_id, self.stations[1].id)
+
+        remaining = [d for chunk in ReportsService.reconcile_stock(run) for d in chunk]
+        run.refresh_from_db()
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.stations_checked, 5)
+        self.assertEqual([d['station_id'] for d in remaining], [self.stations[4].id])
+
+    def test_command_writes_json_lines(self):
+        out = StringIO()
+        call_command(
+            'reconcile_stock', '--chunk-size', '2',
+            '--until', (timezone.localdate() + timezone.timedelta(days=1)).isoformat(),
+            stdout=out, stderr=StringIO(),
+        )
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line['variance'] for line in lines], ['-2.000', '0.500'])
+        self.assertEqual(ReconciliationRun.objects.get().status, 'completed')
+
+        with self.assertRaises(Exception):
+            call_command('reconcile_stock', '--resume', stdout=StringIO(), stderr=StringIO())
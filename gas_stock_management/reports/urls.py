@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import DemandForecastView
+
+urlpatterns = [
+    path('forecasts/', DemandForecastView.as_view(), name='demand-forecasts'),
+]
@@ -1,3 +1,26 @@
-from django.shortcuts import render
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from accounts.permissions import IsManager
+from reports.services.reports_services import ReportsService
 
-# Create your views here.
+
+class DemandForecastView(APIView):
+    """Latest nightly demand forecasts and reorder suggestions for `?station=`, optionally one `?product=`."""
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def get(self, request):
+        station_id = request.query_params.get('station', '')
+        product_id = request.query_params.get('product')
+        if not station_id.isdigit() or (product_id is not None and not product_id.isdigit()):
+            return Response({
+                "success": False,
+                "message": "A valid 'station' is required",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        service_response = ReportsService.get_forecasts(
+            int(station_id), int(product_id) if product_id is not None else None
+        )
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
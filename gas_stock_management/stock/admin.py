@@ -1,3 +1,50 @@
 from django.contrib import admin
+from .models import Cylinder, CylinderEvent, Station, StockMovement, StockBalance, StockThreshold
 
-# Register your models here.
+@admin.register(Station)
+class StationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'code', 'manager', 'is_active', 'created_at')
+    search_fields = ('name', 'code', 'address')
+    list_filter = ('is_active',)
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ('station', 'product', 'movement_type', 'quantity', 'reference', 'created_at', 'created_by')
+    search_fields = ('reference',)
+    list_filter = ('movement_type', 'created_at')
+
+    # The ledger is append-only
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(StockBalance)
+class StockBalanceAdmin(admin.ModelAdmin):
+    list_display = ('station', 'product', 'quantity', 'reserved', 'updated_at')
+    list_filter = ('station',)
+    readonly_fields = ('quantity', 'reserved')
+
+@admin.register(StockThreshold)
+class StockThresholdAdmin(admin.ModelAdmin):
+    list_display = ('station', 'product', 'reorder_point', 'clear_point', 'alert_active')
+    list_filter = ('station', 'alert_active')
+
+
+@admin.register(Cylinder)
+class CylinderAdmin(admin.ModelAdmin):
+    list_display = ('serial_number', 'product', 'state', 'location_type', 'location_id', 'updated_at')
+    search_fields = ('serial_number',)
+    list_filter = ('state', 'location_type')
+
+@admin.register(CylinderEvent)
+class CylinderEventAdmin(admin.ModelAdmin):
+    list_display = ('cylinder', 'from_state', 'to_state', 'to_location_type', 'to_location_id', 'reference', 'created_at')
+    search_fields = ('cylinder__serial_number', 'reference')
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,69 @@
+import random
+import threading
+import time
+from django.conf import settings
+from django.db import OperationalError
+
+
+class StockConflict(Exception):
+    """A balance changed between read and compare-and-swap; the whole transaction should be retried."""
+
+
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, StockConflict):
+        return True
+    # SQLite serializes writers on a database-wide lock and gives up after its timeout
+    return isinstance(exc, OperationalError) and 'locked' in str(exc)
+
+
+class ContentionMetrics:
+    """Process-local counters of stock write attempts, retries and aborts."""
+    _lock = threading.Lock()
+    _stats = {"attempts": 0, "conflicts": 0, "retries": 0, "aborts": 0}
+
+    @classmethod
+    def count(cls, name: str) -> None:
+        with cls._lock:
+            cls._stats[name] += 1
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            stats = dict(cls._stats)
+        stats["conflict_ratio"] = round(stats["conflicts"] / stats["attempts"], 4) if stats["attempts"] else 0.0
+        return stats
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            for name in cls._stats:
+                cls._stats[name] = 0
+
+
+def run_with_retries(operation):
+    """
+    Call `operation` (which must run its own transaction) until it does not
+    lose a race, sleeping with full jitter between attempts so contending
+    writers spread out. Re-raises the last conflict once STOCK_CONCURRENCY's
+    MAX_RETRIES is exhausted.
+    """
+    config = getattr(settings, 'STOCK_CONCURRENCY', {})
+    max_retries = config.get('MAX_RETRIES', 5)
+    base_delay = config.get('BASE_DELAY', 0.01)
+    max_delay = config.get('MAX_DELAY', 0.25)
+
+    attempt = 0
+    while True:
+        ContentionMetrics.count("attempts")
+        try:
+            return operation()
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            ContentionMetrics.count("conflicts")
+            if attempt >= max_retries:
+                ContentionMetrics.count("aborts")
+                raise StockConflict("Stock is being updated concurrently, please retry") from e
+        ContentionMetrics.count("retries")
+        time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+        attempt += 1
@@ -0,0 +1,30 @@
+from datetime import datetime, time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from stock.services.stock_service import StockService
+
+
+class Command(BaseCommand):
+    help = "Take daily stock snapshots from the last one taken (or the first movement) up to a date"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--until', help="Date (YYYY-MM-DD) of the last snapshot boundary; defaults to today")
+        parser.add_argument('--chunk-days', type=int, default=7, help="Days aggregated per query and transaction")
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            try:
+                day = datetime.strptime(options['until'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("--until must be a date in YYYY-MM-DD format")
+            until = timezone.make_aware(datetime.combine(day, time.min))
+        if options['chunk_days'] < 1:
+            raise CommandError("--chunk-days must be at least 1")
+
+        result = StockService.take_snapshots(until=until, chunk_days=options['chunk_days'])
+        if not result['success']:
+            raise CommandError(result['message'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {result['data']['snapshots']} snapshots through {result['data']['through']}"
+        ))
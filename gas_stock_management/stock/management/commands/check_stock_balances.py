@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from stock.services.stock_service import StockService
+
+
+class Command(BaseCommand):
+    help = "Rebuild stock balances from the movement ledger and report drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="Overwrite drifted balances with the ledger totals")
+
+    def handle(self, *args, **options):
+        result = StockService.check_balances(fix=options['fix'])
+        if not result['success']:
+            raise CommandError(result['message'])
+
+        data = result['data']
+        for row in data['drift']:
+            self.stdout.write(
+                f"station={row['station_id']} product={row['product_id']} "
+                f"ledger={row['ledger']} balance={row['balance']}"
+            )
+        if not data['drift']:
+            self.stdout.write(self.style.SUCCESS(f"Checked {data['checked']} balances, no drift"))
+        elif data['fixed']:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(data['drift'])} of {data['checked']} balances"))
+        else:
+            # Non-zero exit so cron and CI notice; rerun with --fix to repair
+            raise CommandError(f"{len(data['drift'])} of {data['checked']} balances drifted")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stock', '0003_stock_thresholds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockbalance',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('stock', '0004_stock_balance_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cylinder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('serial_number', models.CharField(max_length=64, unique=True)),
+                ('state', models.CharField(choices=[('full', 'Full'), ('empty', 'Empty'), ('retired', 'Retired')], default='full', max_length=20)),
+                ('location_type', models.CharField(choices=[('station', 'Station'), ('truck', 'Truck'), ('customer', 'Customer')], default='station', max_length=20)),
+                ('location_id', models.BigIntegerField()),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cylinders', to='products.product')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CylinderEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('from_state', models.CharField(blank=True, default='', max_length=20)),
+                ('to_state', models.CharField(max_length=20)),
+                ('from_location_type', models.CharField(blank=True, default='', max_length=20)),
+                ('from_location_id', models.BigIntegerField(blank=True, null=True)),
+                ('to_location_type', models.CharField(max_length=20)),
+                ('to_location_id', models.BigIntegerField()),
+                ('reference', models.CharField(blank=True, default='', max_length=64)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created_by', to=settings.AUTH_USER_MODEL)),
+                ('cylinder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='stock.cylinder')),
+                ('movement', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='cylinder_events', to='stock.stockmovement')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated_by', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cylinder',
+            index=models.Index(fields=['product', 'location_type', 'location_id', 'state', 'serial_number'], name='cylinder_availability_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 00:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stock', '0005_cylinders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockbalance',
+            name='reserved',
+            field=models.DecimalField(decimal_places=3, default=0, max_digits=14),
+        ),
+    ]
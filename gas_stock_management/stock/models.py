@@ -1,3 +1,188 @@
 from django.db import models
+from django.contrib.auth.models import User
+from gas_stock_management.base.models import BaseModel
+from products.models import Product
 
-# Create your models here.
+
+class Station(BaseModel):
+    name = models.CharField(max_length=150)
+    code = models.CharField(max_length=20, unique=True)
+    address = models.TextField(blank=True, null=True)
+    manager = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='managed_stations')
+    is_active = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.code})"
+
+
+class StockMovement(BaseModel):
+    """
+    One immutable ledger entry. `quantity` is signed: receipts and incoming
+    transfers are positive, sales and outgoing transfers negative, adjustments
+    either. Corrections are made with new adjustment rows, never by editing.
+    The two legs of a transfer share a `reference`.
+    """
+    RECEIPT = 'receipt'
+    SALE = 'sale'
+    TRANSFER_IN = 'transfer_in'
+    TRANSFER_OUT = 'transfer_out'
+    ADJUSTMENT = 'adjustment'
+    MOVEMENT_TYPE_CHOICES = [
+        (RECEIPT, 'Receipt'),
+        (SALE, 'Sale'),
+        (TRANSFER_IN, 'Transfer In'),
+        (TRANSFER_OUT, 'Transfer Out'),
+        (ADJUSTMENT, 'Adjustment'),
+    ]
+    station = models.ForeignKey(Station, on_delete=models.PROTECT, related_name='movements')
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='movements')
+    movement_type = models.CharField(max_length=20, choices=MOVEMENT_TYPE_CHOICES)
+    quantity = models.DecimalField(max_digits=14, decimal_places=3)
+    reference = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    note = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [
+            # Replaying one (station, product) from a snapshot onwards
+            models.Index(fields=['station', 'product', 'created_at'], name='stock_move_pair_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Stock movements are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Stock movements are append-only")
+
+    def __str__(self):
+        return f"{self.movement_type} {self.quantity} {self.product_id}@{self.station_id}"
+
+
+class StockBalance(BaseModel):
+    """
+    Materialized running total of the ledger for one (station, product),
+    updated with F() expressions in the transaction that writes the movements.
+    Every write bumps `version`, so writers that computed a new quantity from
+    an earlier read can compare-and-swap instead of locking the row.
+    `reserved` is the part of `quantity` held by open orders; only the rest
+    can be sold or reserved again.
+    """
+    station = models.ForeignKey(Station, on_delete=models.PROTECT, related_name='balances')
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='balances')
+    quantity = models.DecimalField(max_digits=14, decimal_places=3, default=0)
+    reserved = models.DecimalField(max_digits=14, decimal_places=3, default=0)
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['station', 'product'], name='stock_balance_station_product_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}@{self.station_id}: {self.quantity}"
+
+
+class StockSnapshot(BaseModel):
+    """
+    Ledger total for one (station, product) over every movement created before
+    `taken_at` (a period boundary). Only written for pairs that moved during the
+    period, so the latest snapshot at or before a time is the starting point
+    for replaying that pair.
+    """
+    station = models.ForeignKey(Station, on_delete=models.PROTECT, related_name='snapshots')
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='snapshots')
+    quantity = models.DecimalField(max_digits=14, decimal_places=3)
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['station', 'product', 'taken_at'], name='stock_snapshot_pair_taken_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}@{self.station_id} before {self.taken_at}: {self.quantity}"
+
+
+class StockThreshold(BaseModel):
+    """
+    Reorder point for one (station, product). An alert is raised when the
+    balance drops below `reorder_point` and re-armed only once it is back at
+    or above `clear_point`, so stock hovering around the reorder point does
+    not raise repeated alerts. `alert_active` holds that state.
+    """
+    station = models.ForeignKey(Station, on_delete=models.CASCADE, related_name='thresholds')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='thresholds')
+    reorder_point = models.DecimalField(max_digits=14, decimal_places=3)
+    clear_point = models.DecimalField(max_digits=14, decimal_places=3)
+    alert_active = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['station', 'product'], name='stock_threshold_station_product_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}@{self.station_id} < {self.reorder_point}"
+
+
+class Cylinder(BaseModel):
+    """
+    A serialized gas cylinder. `product` is its type (e.g. LPG 12kg) and
+    (`location_type`, `location_id`) where it is: a station id, a truck
+    number or a customer's user id. Full cylinders at a station are that
+    station's stock of the product, so moving them also writes the ledger.
+    """
+    FULL = 'full'
+    EMPTY = 'empty'
+    RETIRED = 'retired'
+    STATE_CHOICES = [
+        (FULL, 'Full'),
+        (EMPTY, 'Empty'),
+        (RETIRED, 'Retired'),
+    ]
+    STATION = 'station'
+    TRUCK = 'truck'
+    CUSTOMER = 'customer'
+    LOCATION_TYPE_CHOICES = [
+        (STATION, 'Station'),
+        (TRUCK, 'Truck'),
+        (CUSTOMER, 'Customer'),
+    ]
+    serial_number = models.CharField(max_length=64, unique=True)
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='cylinders')
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default=FULL)
+    location_type = models.CharField(max_length=20, choices=LOCATION_TYPE_CHOICES, default=STATION)
+    location_id = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            # Covers "serials of type X in state S at location Y" without touching the table
+            models.Index(
+                fields=['product', 'location_type', 'location_id', 'state', 'serial_number'],
+                name='cylinder_availability_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.serial_number
+
+
+class CylinderEvent(BaseModel):
+    """
+    Append-only history of one cylinder's state and location changes. When a
+    change moves station stock, `movement` is the ledger row it was booked in
+    (shared by all cylinders of that scan).
+    """
+    cylinder = models.ForeignKey(Cylinder, on_delete=models.CASCADE, related_name='events')
+    from_state = models.CharField(max_length=20, blank=True, default='')
+    to_state = models.CharField(max_length=20)
+    from_location_type = models.CharField(max_length=20, blank=True, default='')
+    from_location_id = models.BigIntegerField(null=True, blank=True)
+    to_location_type = models.CharField(max_length=20)
+    to_location_id = models.BigIntegerField()
+    reference = models.CharField(max_length=64, blank=True, default='')
+    movement = models.ForeignKey(StockMovement, on_delete=models.PROTECT, null=True, blank=True, related_name='cylinder_events')
+
+    def __str__(self):
+        return f"{self.cylinder_id}: {self.from_state or '-'} -> {self.to_state}"
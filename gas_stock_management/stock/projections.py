@@ -0,0 +1,13 @@
+from gas_stock_management.projections import Projection
+
+
+class StationProjection(Projection):
+    """Same output as `StationSerializer`, built from values()."""
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'code': 'code',
+        'address': 'address',
+        'manager': 'manager_id',
+        'is_active': 'is_active',
+    }
@@ -0,0 +1,126 @@
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from rest_framework import status
+from gas_stock_management.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, keyset_page
+from gas_stock_management.response import RepositoryResponse
+from stock.concurrency import StockConflict
+from stock.models import Cylinder, CylinderEvent
+
+
+class CylinderRepository:
+    @staticmethod
+    def read_cylinders(serials) -> dict:
+        """{serial: (id, product id, state, location type, location id)} for the given serials that exist."""
+        if not serials:
+            return {}
+        return {
+            serial: (cylinder_id, product_id, state, location_type, location_id)
+            for cylinder_id, serial, product_id, state, location_type, location_id in Cylinder.objects
+            .filter(serial_number__in=serials)
+            .values_list('id', 'serial_number', 'product_id', 'state', 'location_type', 'location_id')
+        }
+
+    @staticmethod
+    def register(product_id: int, serials: list, state: str, location_type: str, location_id: int,
+                 created_by_id: int = None) -> dict:
+        """
+        Bulk-insert new cylinders and return {serial: id}. Raises StockConflict
+        if one of the serials was registered concurrently; the caller retries
+        and then sees it as an existing cylinder.
+        """
+        if not serials:
+            return {}
+        try:
+            with transaction.atomic():
+                created = Cylinder.objects.bulk_create([
+                    Cylinder(
+                        serial_number=serial,
+                        product_id=product_id,
+                        state=state,
+                        location_type=location_type,
+                        location_id=location_id,
+                        created_by_id=created_by_id,
+                    )
+                    for serial in serials
+                ], batch_size=500)
+        except IntegrityError as e:
+            raise StockConflict("Cylinder registered concurrently") from e
+        if any(cylinder.id is None for cylinder in created):
+            return dict(Cylinder.objects.filter(serial_number__in=serials).values_list('serial_number', 'id'))
+        return {cylinder.serial_number: cylinder.id for cylinder in created}
+
+    @staticmethod
+    def relocate(groups: dict, location_type: str, location_id: int, state: str = None) -> None:
+        """
+        Move cylinders to a location (and state, if given). `groups` maps the
+        (state, location type, location id) the cylinders were read in to
+        their ids; each group is one UPDATE guarded on that read, so a
+        cylinder moved by someone else meanwhile raises StockConflict.
+        """
+        changes = {"location_type": location_type, "location_id": location_id, "updated_at": timezone.now()}
+        if state is not None:
+            changes["state"] = state
+        for (from_state, from_location_type, from_location_id), ids in groups.items():
+            updated = Cylinder.objects.filter(
+                id__in=ids, state=from_state, location_type=from_location_type, location_id=from_location_id
+            ).update(**changes)
+            if updated != len(ids):
+                raise StockConflict("Cylinders changed since they were read")
+
+    @staticmethod
+    def log_events(events: list, created_by_id: int = None) -> None:
+        CylinderEvent.objects.bulk_create([
+            CylinderEvent(created_by_id=created_by_id, **event) for event in events
+        ], batch_size=500)
+
+    @staticmethod
+    def get_available(product_id: int, station_id: int, state: str = Cylinder.FULL, cursor: str = None,
+                      limit: int = DEFAULT_PAGE_SIZE) -> RepositoryResponse:
+        """
+        One page of serial numbers of a cylinder type at a station in a state,
+        in serial order and paginated by keyset on the serial. The filter and
+        the sort are both served by the availability index alone.
+        """
+        try:
+            serials = Cylinder.objects.filter(
+                product_id=product_id, location_type=Cylinder.STATION, location_id=station_id, state=state
+            )
+            if cursor:
+                (last_serial,) = decode_cursor(cursor)
+                serials = serials.filter(serial_number__gt=last_serial)
+
+            rows = list(serials.order_by('serial_number').values_list('serial_number', flat=True)[:limit + 1])
+            page, next_cursor = keyset_page(rows, limit, lambda serial: [serial])
+            return RepositoryResponse(
+                success=True,
+                data={"serials": page, "next_cursor": next_cursor},
+                status_code=status.HTTP_200_OK
+            )
+        except (InvalidCursor, ValueError):
+            return RepositoryResponse(
+                success=False,
+                message="Invalid cursor",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @staticmethod
+    def get_cylinder(serial: str) -> RepositoryResponse:
+        cylinder = Cylinder.objects.select_related('product').filter(serial_number=serial).first()
+        if cylinder is None:
+            return RepositoryResponse(
+                success=False,
+                message="Cylinder not found",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        events = cylinder.events.order_by('created_at', 'id')
+        return RepositoryResponse(
+            success=True,
+            data={"cylinder": cylinder, "events": list(events)},
+            status_code=status.HTTP_200_OK
+        )
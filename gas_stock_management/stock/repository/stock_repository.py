@@ -0,0 +1,500 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction, IntegrityError, OperationalError
+from django.db.models import Case, DecimalField, F, IntegerField, Max, Min, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+from rest_framework import status
+from products.models import Product
+from stock.concurrency import StockConflict, is_retryable
+from stock.models import Station, StockBalance, StockMovement, StockSnapshot, StockThreshold
+from gas_stock_management.response import RepositoryResponse
+
+
+class InsufficientStock(Exception):
+    def __init__(self, station_id: int, product_id: int):
+        super().__init__(f"Insufficient stock for product {product_id} at station {station_id}")
+        self.station_id = station_id
+        self.product_id = product_id
+
+
+class StockRepository:
+    @staticmethod
+    def _apply_delta(station_id: int, product_id: int, delta: Decimal) -> None:
+        """
+        Add `delta` to one balance row with a single UPDATE ... SET quantity =
+        quantity + delta. Decrements are conditional on enough unreserved
+        stock, so the balance can never go negative (or below what open
+        orders hold) even under concurrent writers.
+        """
+        balances = StockBalance.objects.filter(station_id=station_id, product_id=product_id)
+        if delta < 0:
+            balances = balances.filter(quantity__gte=F('reserved') - delta)
+        if balances.update(quantity=F('quantity') + delta, version=F('version') + 1, updated_at=timezone.now()):
+            return
+        if delta < 0:
+            raise InsufficientStock(station_id, product_id)
+        try:
+            with transaction.atomic():
+                StockBalance.objects.create(station_id=station_id, product_id=product_id, quantity=delta)
+        except IntegrityError:
+            # Created concurrently since our UPDATE matched nothing
+            StockBalance.objects.filter(station_id=station_id, product_id=product_id).update(
+                quantity=F('quantity') + delta, version=F('version') + 1, updated_at=timezone.now()
+            )
+
+    @staticmethod
+    def _pairs_filter(keys) -> dict:
+        """
+        Lookups matching a superset of the (station, product) pairs in `keys`:
+        the stations and the products they name, as two flat IN lists rather
+        than one OR'd condition per pair (which SQLite refuses past ~1000
+        pairs). Callers keep only the rows whose pair is in `keys`.
+        """
+        return {
+            "station_id__in": {station_id for station_id, _ in keys},
+            "product_id__in": {product_id for _, product_id in keys},
+        }
+
+    @staticmethod
+    def _balances_for(keys) -> list:
+        if not keys:
+            return []
+        keys = set(keys)
+        balances = StockBalance.objects.select_related('product').filter(**StockRepository._pairs_filter(keys))
+        return [
+            balance for balance in balances.order_by('station_id', 'product_id')
+            if (balance.station_id, balance.product_id) in keys
+        ]
+
+    @staticmethod
+    def record_movements(movements: list, created_by_id: int = None) -> RepositoryResponse:
+        """
+        Append ledger rows and apply their net effect to the balances in one
+        transaction. Each movement needs station_id, product_id, movement_type
+        and a signed quantity; reference and note are optional. Each balance
+        changes in a single guarded UPDATE, so there is no read to go stale;
+        only lock timeouts are raised for the caller to retry.
+        """
+        try:
+            deltas = defaultdict(Decimal)
+            for movement in movements:
+                deltas[(movement['station_id'], movement['product_id'])] += Decimal(movement['quantity'])
+
+            with transaction.atomic():
+                created = StockMovement.objects.bulk_create([
+                    StockMovement(
+                        station_id=movement['station_id'],
+                        product_id=movement['product_id'],
+                        movement_type=movement['movement_type'],
+                        quantity=movement['quantity'],
+                        reference=movement.get('reference', ''),
+                        note=movement.get('note', ''),
+                        created_by_id=created_by_id,
+                    )
+                    for movement in movements
+                ])
+                # Fixed order so concurrent multi-row writers lock balances consistently
+                for (station_id, product_id), delta in sorted(deltas.items()):
+                    if delta:
+                        StockRepository._apply_delta(station_id, product_id, delta)
+                balances = StockRepository._balances_for(deltas)
+
+            return RepositoryResponse(
+                success=True,
+                data={"movements": created, "balances": balances, "deltas": dict(deltas)},
+                status_code=status.HTTP_201_CREATED
+            )
+        except InsufficientStock as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_409_CONFLICT
+            )
+        except OperationalError as e:
+            if is_retryable(e):
+                raise
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        except IntegrityError as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @staticmethod
+    def reserve(quantities: dict) -> None:
+        """
+        Hold stock for open orders: one guarded UPDATE per (station, product)
+        in `quantities`, in a fixed order, each adding to `reserved` only if
+        enough unreserved stock is left. Raises InsufficientStock otherwise;
+        must run inside the caller's transaction, which then rolls back the
+        reservations already made.
+        """
+        now = timezone.now()
+        for (station_id, product_id), quantity in sorted(quantities.items()):
+            reserved = StockBalance.objects.filter(
+                station_id=station_id, product_id=product_id, quantity__gte=F('reserved') + quantity
+            ).update(reserved=F('reserved') + quantity, version=F('version') + 1, updated_at=now)
+            if not reserved:
+                raise InsufficientStock(station_id, product_id)
+
+    @staticmethod
+    def release(quantities: dict) -> None:
+        """Give held stock back: `reserved` drops by each (station, product) quantity in `quantities`."""
+        now = timezone.now()
+        for (station_id, product_id), quantity in sorted(quantities.items()):
+            StockBalance.objects.filter(station_id=station_id, product_id=product_id).update(
+                reserved=F('reserved') - quantity, version=F('version') + 1, updated_at=now
+            )
+
+    @staticmethod
+    def active_ids(station_ids, product_ids, manager_id: int = None) -> tuple:
+        """
+        The subsets of the given station and product ids that exist and are
+        active (two queries); with `manager_id` only that manager's stations.
+        """
+        stations = Station.objects.filter(id__in=station_ids, is_active=True)
+        if manager_id is not None:
+            stations = stations.filter(manager_id=manager_id)
+        stations = set(stations.values_list('id', flat=True))
+        products = set(Product.objects.filter(id__in=product_ids, is_active=True).values_list('id', flat=True))
+        return stations, products
+
+    @staticmethod
+    def read_balances(keys) -> dict:
+        """{(station, product): (balance id, quantity, version, reserved)} for the given pairs that have a balance."""
+        if not keys:
+            return {}
+        keys = set(keys)
+        rows = StockBalance.objects.filter(**StockRepository._pairs_filter(keys)).values_list(
+            'id', 'station_id', 'product_id', 'quantity', 'version', 'reserved'
+        )
+        return {
+            (station_id, product_id): (balance_id, quantity, version, reserved)
+            for balance_id, station_id, product_id, quantity, version, reserved in rows
+            if (station_id, product_id) in keys
+        }
+
+    @staticmethod
+    def apply_batch(movements: list, deltas: dict, read: dict, created_by_id: int = None) -> list:
+        """
+        Set-based counterpart of `record_movements` for large batches whose
+        deltas were computed from `read_balances`: one bulk insert of the
+        ledger rows, one compare-and-swap UPDATE of every existing balance
+        (matched on the version read) and one bulk insert for new ones.
+        Decrements are also conditional on enough unreserved stock, as in
+        `_apply_delta`. Raises StockConflict if any balance changed or
+        appeared since it was read, or would drop below what open orders
+        hold; the caller's transaction must then be rolled back and retried.
+        Returns the touched balances.
+        """
+        StockMovement.objects.bulk_create([
+            StockMovement(created_by_id=created_by_id, **movement) for movement in movements
+        ], batch_size=500)
+
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        existing = {key: read[key] for key in deltas if key in read}
+        if existing:
+            # Compare-and-swap on the versions read, as one flat CASE rather than an OR per balance
+            expected = Case(
+                *[When(id=balance_id, then=Value(version)) for balance_id, _, version, _ in existing.values()],
+                output_field=IntegerField(),
+            )
+            # Decremented balances must keep what open orders hold; the rest compare quantity with itself
+            floor = Case(
+                *[When(id=balance_id, then=F('reserved') - Value(deltas[key]))
+                  for key, (balance_id, _, _, _) in existing.items() if deltas[key] < 0],
+                default=F('quantity'),
+                output_field=DecimalField(max_digits=14, decimal_places=3),
+            )
+            updated = StockBalance.objects.filter(
+                id__in=[balance_id for balance_id, _, _, _ in existing.values()], version=expected, quantity__gte=floor
+            ).update(
+                quantity=F('quantity') + Case(
+                    *[When(id=balance_id, then=Value(deltas[key])) for key, (balance_id, _, _, _) in existing.items()],
+                    output_field=DecimalField(max_digits=14, decimal_places=3),
+                ),
+                version=F('version') + 1,
+                updated_at=timezone.now(),
+            )
+            if updated != len(existing):
+                raise StockConflict("Stock balances changed since they were read")
+        try:
+            with transaction.atomic():
+                StockBalance.objects.bulk_create([
+                    StockBalance(station_id=key[0], product_id=key[1], quantity=delta)
+                    for key, delta in deltas.items() if key not in existing
+                ], batch_size=500)
+        except IntegrityError as e:
+            raise StockConflict("Stock balance created concurrently") from e
+        return StockRepository._balances_for(deltas)
+
+    @staticmethod
+    def get_balance(station_id: int, product_id: int) -> RepositoryResponse:
+        """Current on-hand quantity from the materialized balance; zero if nothing was ever recorded."""
+        quantity = StockBalance.objects.filter(
+            station_id=station_id, product_id=product_id
+        ).values_list('quantity', flat=True).first()
+        return RepositoryResponse(
+            success=True,
+            data={"station_id": station_id, "product_id": product_id, "quantity": quantity or Decimal('0')},
+            status_code=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def get_station_balances(station_id: int) -> RepositoryResponse:
+        balances = StockBalance.objects.select_related('product').filter(station_id=station_id).order_by('product_id')
+        return RepositoryResponse(
+            success=True,
+            data={"balances": list(balances)},
+            status_code=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def check_balances(fix: bool = False) -> RepositoryResponse:
+        """
+        Recompute every balance from the ledger and report the (station, product)
+        pairs whose materialized quantity drifted. With `fix`, drifted balances
+        are overwritten with the ledger totals. Balance rows are locked for the
+        duration, so writers to those pairs wait for the check to finish.
+        """
+        try:
+            with transaction.atomic():
+                stored = {
+                    (station_id, product_id): quantity
+                    for station_id, product_id, quantity in StockBalance.objects.select_for_update()
+                    .values_list('station_id', 'product_id', 'quantity')
+                }
+                ledger = {
+                    (row['station_id'], row['product_id']): row['total']
+                    for row in StockMovement.objects.values('station_id', 'product_id')
+                    .annotate(total=Sum('quantity')).order_by()
+                }
+
+                drift = []
+                for key in sorted(stored.keys() | ledger.keys()):
+                    expected = ledger.get(key) or Decimal('0')
+                    actual = stored.get(key)
+                    if actual is None and not expected:
+                        continue
+                    if actual != expected:
+                        drift.append({
+                            "station_id": key[0],
+                            "product_id": key[1],
+                            "ledger": expected,
+                            "balance": actual,
+                        })
+
+                if fix:
+                    now = timezone.now()
+                    for row in drift:
+                        updated = StockBalance.objects.filter(
+                            station_id=row['station_id'], product_id=row['product_id']
+                        ).update(quantity=row['ledger'], version=F('version') + 1, updated_at=now)
+                        if not updated:
+                            StockBalance.objects.create(
+                                station_id=row['station_id'], product_id=row['product_id'], quantity=row['ledger']
+                            )
+
+            return RepositoryResponse(
+                success=True,
+                data={"checked": len(stored.keys() | ledger.keys()), "drift": drift, "fixed": fix},
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @staticmethod
+    def _day_start(moment):
+        return timezone.localtime(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def _latest_snapshots(at=None, **filters):
+        """Latest snapshot per (station, product) matching `filters`, optionally at or before `at`."""
+        candidates = StockSnapshot.objects.filter(station_id=OuterRef('station_id'), product_id=OuterRef('product_id'))
+        if at is not None:
+            candidates = candidates.filter(taken_at__lte=at)
+        latest = candidates.order_by('-taken_at').values('taken_at')[:1]
+        return StockSnapshot.objects.filter(taken_at=Subquery(latest), **filters)
+
+    @staticmethod
+    def take_snapshots(until=None, chunk_days: int = 7) -> RepositoryResponse:
+        """
+        Write daily snapshots (at local midnight) up to `until`, default today's
+        midnight, continuing from the latest snapshot already taken. Each chunk
+        of `chunk_days` days is one grouped aggregate over the ledger and one
+        transaction, so an interrupted run resumes where it stopped. Run it
+        after the boundary, once writes from before midnight have committed.
+        """
+        try:
+            until = StockRepository._day_start(until or timezone.now())
+            watermark = StockSnapshot.objects.aggregate(last=Max('taken_at'))['last']
+            if watermark is None:
+                first = StockMovement.objects.aggregate(first=Min('created_at'))['first']
+                if first is None:
+                    return RepositoryResponse(success=True, data={"snapshots": 0, "through": None})
+                watermark = StockRepository._day_start(first)
+            watermark = timezone.localtime(watermark)
+
+            state = {
+                (station_id, product_id): quantity
+                for station_id, product_id, quantity in StockRepository._latest_snapshots()
+                .values_list('station_id', 'product_id', 'quantity')
+            }
+
+            written = 0
+            chunk_start = watermark
+            while chunk_start < until:
+                chunk_end = min(chunk_start + timedelta(days=chunk_days), until)
+                rows = (
+                    StockMovement.objects.filter(created_at__gte=chunk_start, created_at__lt=chunk_end)
+                    .annotate(day=TruncDay('created_at', tzinfo=timezone.get_current_timezone()))
+                    .values('day', 'station_id', 'product_id')
+                    .annotate(total=Sum('quantity'))
+                    .order_by('day', 'station_id', 'product_id')
+                )
+                snapshots = []
+                for row in rows:
+                    key = (row['station_id'], row['product_id'])
+                    state[key] = state.get(key, Decimal('0')) + row['total']
+                    snapshots.append(StockSnapshot(
+                        station_id=row['station_id'],
+                        product_id=row['product_id'],
+                        quantity=state[key],
+                        taken_at=row['day'] + timedelta(days=1),
+                    ))
+                with transaction.atomic():
+                    StockSnapshot.objects.bulk_create(snapshots, batch_size=1000, ignore_conflicts=True)
+                written += len(snapshots)
+                chunk_start = chunk_end
+
+            return RepositoryResponse(
+                success=True,
+                data={"snapshots": written, "through": max(until, watermark)},
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @staticmethod
+    def get_balance_at(station_id: int, product_id: int, at) -> RepositoryResponse:
+        """On-hand quantity at `at`: the nearest earlier snapshot plus the movements since it."""
+        snapshot = StockSnapshot.objects.filter(
+            station_id=station_id, product_id=product_id, taken_at__lte=at
+        ).order_by('-taken_at').values_list('taken_at', 'quantity').first()
+
+        movements = StockMovement.objects.filter(station_id=station_id, product_id=product_id, created_at__lte=at)
+        base = Decimal('0')
+        if snapshot is not None:
+            movements = movements.filter(created_at__gte=snapshot[0])
+            base = snapshot[1]
+        replayed = movements.aggregate(total=Sum('quantity'))['total'] or Decimal('0')
+
+        return RepositoryResponse(
+            success=True,
+            data={"station_id": station_id, "product_id": product_id, "at": at, "quantity": base + replayed},
+            status_code=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def get_station_balances_at(station_id: int, at) -> RepositoryResponse:
+        """
+        Every product's quantity at a station at `at`. Snapshots are only written
+        for pairs that moved, so no product has movements between its own latest
+        snapshot and the station's latest one; a single replay from there suffices.
+        """
+        snapshots = {
+            product_id: (taken_at, quantity)
+            for product_id, taken_at, quantity in StockRepository._latest_snapshots(at, station_id=station_id)
+            .values_list('product_id', 'taken_at', 'quantity')
+        }
+        movements = StockMovement.objects.filter(station_id=station_id, created_at__lte=at)
+        if snapshots:
+            movements = movements.filter(created_at__gte=max(taken_at for taken_at, _ in snapshots.values()))
+        replayed = dict(
+            movements.values('product_id').annotate(total=Sum('quantity')).order_by().values_list('product_id', 'total')
+        )
+
+        balances = [
+            {
+                "product_id": product_id,
+                "quantity": snapshots.get(product_id, (None, Decimal('0')))[1] + replayed.get(product_id, Decimal('0')),
+            }
+            for product_id in sorted(snapshots.keys() | replayed.keys())
+        ]
+        return RepositoryResponse(
+            success=True,
+            data={"station_id": station_id, "at": at, "balances": balances},
+            status_code=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def set_threshold_alert(threshold_id: int, active: bool) -> bool:
+        """Flip a threshold's alert state; False if it was already in that state (someone else flipped it)."""
+        return bool(
+            StockThreshold.objects.filter(id=threshold_id, alert_active=not active).update(alert_active=active)
+        )
+
+    @staticmethod
+    def save_threshold(station_id: int, product_id: int, reorder_point: Decimal, clear_point: Decimal,
+                       user_id: int = None, manager_id: int = None) -> RepositoryResponse:
+        """Create or update a threshold; with `manager_id` only at that manager's stations."""
+        try:
+            stations = Station.objects.filter(id=station_id)
+            if manager_id is not None:
+                stations = stations.filter(manager_id=manager_id)
+            if not stations.exists():
+                return RepositoryResponse(
+                    success=False,
+                    message="Station not found",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            threshold, created = StockThreshold.objects.update_or_create(
+                station_id=station_id,
+                product_id=product_id,
+                defaults={"reorder_point": reorder_point, "clear_point": clear_point, "updated_by_id": user_id},
+                create_defaults={
+                    "reorder_point": reorder_point, "clear_point": clear_point,
+                    "created_by_id": user_id, "updated_by_id": user_id,
+                },
+            )
+            return RepositoryResponse(
+                success=True,
+                data={"threshold": threshold},
+                status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+            )
+        except Exception as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @staticmethod
+    def get_station_thresholds(station_id: int) -> RepositoryResponse:
+        thresholds = StockThreshold.objects.filter(station_id=station_id).order_by('product_id')
+        return RepositoryResponse(
+            success=True,
+            data={"thresholds": list(thresholds)},
+            status_code=status.HTTP_200_OK
+        )
@@ -0,0 +1,174 @@
+from decimal import Decimal
+from rest_framework import serializers
+from products.models import Product
+from .models import Cylinder, CylinderEvent, Station, StockBalance, StockMovement, StockThreshold
+
+
+def signed_quantity(movement_type: str, quantity: Decimal) -> Decimal:
+    return -quantity if movement_type == StockMovement.SALE else quantity
+
+
+class StationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Station
+        fields = ['id', 'name', 'code', 'address', 'manager', 'is_active']
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StockMovement
+        fields = ['id', 'station', 'product', 'movement_type', 'quantity', 'reference', 'note', 'created_at', 'created_by']
+
+
+class StockBalanceSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+
+    class Meta:
+        model = StockBalance
+        fields = ['station', 'product', 'product_name', 'quantity', 'reserved', 'updated_at']
+
+
+class RecordMovementSerializer(serializers.Serializer):
+    """
+    Input for a single receipt, sale or adjustment. Receipts and sales take a
+    positive quantity (the sign comes from the type); adjustments are signed.
+    """
+    MOVEMENT_TYPES = [StockMovement.RECEIPT, StockMovement.SALE, StockMovement.ADJUSTMENT]
+
+    station = serializers.PrimaryKeyRelatedField(queryset=Station.objects.filter(is_active=True))
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.filter(is_active=True))
+    movement_type = serializers.ChoiceField(choices=MOVEMENT_TYPES)
+    quantity = serializers.DecimalField(max_digits=14, decimal_places=3)
+    reference = serializers.CharField(max_length=64, required=False, allow_blank=True, default='')
+    note = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, attrs):
+        if attrs['movement_type'] == StockMovement.ADJUSTMENT:
+            if attrs['quantity'] == 0:
+                raise serializers.ValidationError({"quantity": "Adjustment quantity must not be zero"})
+        elif attrs['quantity'] <= 0:
+            raise serializers.ValidationError({"quantity": "Quantity must be positive"})
+        return attrs
+
+    def signed_quantity(self) -> Decimal:
+        return signed_quantity(self.validated_data['movement_type'], self.validated_data['quantity'])
+
+
+class TransferSerializer(serializers.Serializer):
+    from_station = serializers.PrimaryKeyRelatedField(queryset=Station.objects.filter(is_active=True))
+    to_station = serializers.PrimaryKeyRelatedField(queryset=Station.objects.filter(is_active=True))
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.filter(is_active=True))
+    quantity = serializers.DecimalField(max_digits=14, decimal_places=3, min_value=Decimal('0.001'))
+    reference = serializers.CharField(max_length=64, required=False, allow_blank=True, default='')
+    note = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, attrs):
+        if attrs['from_station'] == attrs['to_station']:
+            raise serializers.ValidationError({"to_station": "Cannot transfer to the same station"})
+        return attrs
+
+
+class StockThresholdSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StockThreshold
+        fields = ['id', 'station', 'product', 'reorder_point', 'clear_point', 'alert_active']
+
+
+class SetThresholdSerializer(serializers.Serializer):
+    """Clear point defaults to the reorder point (alert re-armed as soon as stock is back)."""
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+    reorder_point = serializers.DecimalField(max_digits=14, decimal_places=3, min_value=Decimal('0'))
+    clear_point = serializers.DecimalField(max_digits=14, decimal_places=3, required=False)
+
+    def validate(self, attrs):
+        attrs.setdefault('clear_point', attrs['reorder_point'])
+        if attrs['clear_point'] < attrs['reorder_point']:
+            raise serializers.ValidationError({"clear_point": "Clear point must not be below the reorder point"})
+        return attrs
+
+
+class StocktakeLineSerializer(serializers.Serializer):
+    """
+    One stocktake line: either a `counted` quantity (the balance is adjusted
+    to it) or a movement. Ids are checked against the database per batch by
+    the service, not per line here.
+    """
+    product = serializers.IntegerField()
+    station = serializers.IntegerField(required=False)
+    counted = serializers.DecimalField(max_digits=14, decimal_places=3, min_value=Decimal('0'), required=False)
+    movement_type = serializers.ChoiceField(choices=RecordMovementSerializer.MOVEMENT_TYPES, required=False)
+    quantity = serializers.DecimalField(max_digits=14, decimal_places=3, required=False)
+    note = serializers.CharField(required=False, allow_blank=True, default='')
+
+    def validate(self, attrs):
+        if 'counted' in attrs:
+            if 'movement_type' in attrs or 'quantity' in attrs:
+                raise serializers.ValidationError("Give either a counted quantity or a movement, not both")
+            return attrs
+        if 'movement_type' not in attrs or 'quantity' not in attrs:
+            raise serializers.ValidationError("Give a counted quantity, or a movement_type and quantity")
+        if attrs['movement_type'] == StockMovement.ADJUSTMENT:
+            if attrs['quantity'] == 0:
+                raise serializers.ValidationError({"quantity": "Adjustment quantity must not be zero"})
+        elif attrs['quantity'] <= 0:
+            raise serializers.ValidationError({"quantity": "Quantity must be positive"})
+        return attrs
+
+
+class StocktakeSerializer(serializers.Serializer):
+    MAX_LINES = 1000
+
+    station = serializers.IntegerField(required=False)
+    reference = serializers.CharField(max_length=64, required=False, allow_blank=True, default='')
+    lines = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=MAX_LINES)
+
+
+class CylinderEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CylinderEvent
+        fields = [
+            'from_state', 'to_state', 'from_location_type', 'from_location_id',
+            'to_location_type', 'to_location_id', 'reference', 'movement', 'created_at', 'created_by'
+        ]
+
+
+class CylinderSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+
+    class Meta:
+        model = Cylinder
+        fields = ['serial_number', 'product', 'product_name', 'state', 'location_type', 'location_id', 'updated_at']
+
+
+class CylinderScanSerializer(serializers.Serializer):
+    """Serials scanned at one station; per-serial checks are done by the service in one query."""
+    MAX_SERIALS = 1000
+
+    station = serializers.PrimaryKeyRelatedField(queryset=Station.objects.filter(is_active=True))
+    serials = serializers.ListField(
+        child=serializers.CharField(max_length=64), allow_empty=False, max_length=MAX_SERIALS
+    )
+    reference = serializers.CharField(max_length=64, required=False, allow_blank=True, default='')
+
+
+class CylinderScanInSerializer(CylinderScanSerializer):
+    """
+    Cylinders arriving at the station, full or empty; `state` has no
+    default, since only full cylinders move stock. Serials not yet in the
+    registry are registered as `product` when it is given, and rejected
+    otherwise.
+    """
+    STATES = [Cylinder.FULL, Cylinder.EMPTY]
+
+    state = serializers.ChoiceField(choices=STATES, required=True)
+    product = serializers.PrimaryKeyRelatedField(
+        queryset=Product.objects.filter(is_active=True, unit='cylinder'), required=False
+    )
+
+
+class CylinderScanOutSerializer(CylinderScanSerializer):
+    """Cylinders leaving the station, in their current state, for a truck or a customer."""
+    DESTINATIONS = [Cylinder.TRUCK, Cylinder.CUSTOMER]
+
+    location_type = serializers.ChoiceField(choices=DESTINATIONS)
+    location_id = serializers.IntegerField(min_value=1)
@@ -0,0 +1,265 @@
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from rest_framework import status
+from gas_stock_management.pagination import DEFAULT_PAGE_SIZE
+from stock.concurrency import StockConflict, run_with_retries
+from stock.models import Cylinder, StockMovement
+from stock.repository.cylinder_repository import CylinderRepository
+from stock.repository.stock_repository import StockRepository
+from stock.serializers import (
+    CylinderEventSerializer,
+    CylinderScanInSerializer,
+    CylinderScanOutSerializer,
+    CylinderSerializer,
+    StockBalanceSerializer,
+)
+from stock.services.stock_service import StockService
+
+
+class CylinderService:
+
+    @staticmethod
+    def _ledger_legs(product_id: int, before: tuple, after: tuple) -> list:
+        """
+        The (station, product, movement type, signed quantity) ledger entries
+        for one cylinder going from `before` to `after`, each a (state,
+        location type, location id). Only full cylinders at a station are
+        stock, so anything else moves no stock.
+        """
+        legs = []
+        from_state, from_type, from_id = before
+        to_state, to_type, to_id = after
+        moved = (from_type, from_id) != (to_type, to_id)
+        if from_state == Cylinder.FULL and from_type == Cylinder.STATION:
+            if to_type == Cylinder.CUSTOMER:
+                movement_type = StockMovement.SALE
+            elif moved:
+                movement_type = StockMovement.TRANSFER_OUT
+            else:
+                movement_type = StockMovement.ADJUSTMENT
+            legs.append((from_id, product_id, movement_type, -1))
+        if to_state == Cylinder.FULL and to_type == Cylinder.STATION:
+            if moved and from_type in (Cylinder.STATION, Cylinder.TRUCK):
+                movement_type = StockMovement.TRANSFER_IN
+            else:
+                movement_type = StockMovement.RECEIPT
+            legs.append((to_id, product_id, movement_type, 1))
+        return legs
+
+    @staticmethod
+    def _apply_scan(serials: list, station_id: int, to_type: str, to_id: int, to_state: str = None,
+                    product_id: int = None, reference: str = '', user_id: int = None):
+        """
+        One attempt at a scan: read every serial in one query, check each,
+        move the accepted cylinders with guarded bulk updates, book the net
+        stock change per (station, product, movement type) in the ledger and
+        log one event per cylinder, all in one transaction. Cylinders sent
+        away must be at `station_id`; `to_state` None keeps their state. Raises StockConflict if a cylinder or
+        balance changed meanwhile; returns the per-serial results and the
+        ledger response.
+        """
+        with transaction.atomic():
+            current = CylinderRepository.read_cylinders(serials)
+            results = []
+            seen = set()
+            new = []
+            moving = []
+            for serial in serials:
+                if serial in seen:
+                    results.append({"serial": serial, "status": "error", "errors": ["Serial scanned twice."]})
+                    continue
+                seen.add(serial)
+
+                row = current.get(serial)
+                if row is None:
+                    if product_id is None:
+                        results.append({"serial": serial, "status": "error", "errors": ["Unknown serial number."]})
+                        continue
+                    new.append(serial)
+                    results.append({"serial": serial, "status": "registered"})
+                    continue
+
+                cylinder_id, cylinder_product_id, state, location_type, location_id = row
+                if state == Cylinder.RETIRED:
+                    results.append({"serial": serial, "status": "error", "errors": ["Cylinder is retired."]})
+                    continue
+                if to_type != Cylinder.STATION and (location_type, location_id) != (Cylinder.STATION, station_id):
+                    results.append({"serial": serial, "status": "error", "errors": ["Cylinder is not at this station."]})
+                    continue
+                before = (state, location_type, location_id)
+                after = (to_state or state, to_type, to_id)
+                if before == after:
+                    results.append({"serial": serial, "status": "unchanged"})
+                    continue
+                moving.append((cylinder_id, cylinder_product_id, before, after))
+                results.append({"serial": serial, "status": "moved"})
+
+            groups = defaultdict(list)
+            legs = []
+            for cylinder_id, cylinder_product_id, before, after in moving:
+                groups[before].append(cylinder_id)
+                legs.append(CylinderService._ledger_legs(cylinder_product_id, before, after))
+            CylinderRepository.relocate(groups, to_type, to_id, state=to_state)
+            registered = CylinderRepository.register(product_id, new, to_state, to_type, to_id, created_by_id=user_id)
+            for cylinder_id in registered.values():
+                moving.append((cylinder_id, product_id, ('', '', None), (to_state, to_type, to_id)))
+                legs.append(CylinderService._ledger_legs(product_id, ('', '', None), (to_state, to_type, to_id)))
+
+            totals = defaultdict(int)
+            for cylinder_legs in legs:
+                for station, product, movement_type, count in cylinder_legs:
+                    totals[(station, product, movement_type)] += count
+            keys = sorted(key for key, count in totals.items() if count)
+            repo_response = StockRepository.record_movements([
+                {
+                    "station_id": station,
+                    "product_id": product,
+                    "movement_type": movement_type,
+                    "quantity": Decimal(totals[(station, product, movement_type)]),
+                    "reference": reference,
+                    "note": "cylinder scan",
+                }
+                for station, product, movement_type in keys
+            ], created_by_id=user_id)
+            if not repo_response.success:
+                transaction.set_rollback(True)
+                return results, repo_response
+
+            movement_ids = {key: movement.id for key, movement in zip(keys, repo_response.data['movements'])}
+            CylinderRepository.log_events([
+                {
+                    "cylinder_id": cylinder_id,
+                    "from_state": before[0],
+                    "from_location_type": before[1],
+                    "from_location_id": before[2],
+                    "to_state": after[0],
+                    "to_location_type": after[1],
+                    "to_location_id": after[2],
+                    "reference": reference,
+                    "movement_id": next(
+                        (movement_ids[leg[:3]] for leg in cylinder_legs if leg[:3] in movement_ids), None
+                    ),
+                }
+                for (cylinder_id, _, before, after), cylinder_legs in zip(moving, legs)
+            ], created_by_id=user_id)
+            StockService._detect_low_stock(repo_response.data['deltas'], repo_response.data['balances'])
+        return results, repo_response
+
+    @staticmethod
+    def _scan(validated: dict, user_id: int = None, **target):
+        reference = validated['reference'] or uuid.uuid4().hex
+        try:
+            results, repo_response = run_with_retries(lambda: CylinderService._apply_scan(
+                validated['serials'], validated['station'].id, reference=reference, user_id=user_id, **target
+            ))
+        except StockConflict as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "data": {},
+                "status_code": status.HTTP_409_CONFLICT
+            }
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+
+        failed = sum(1 for result in results if result['status'] == 'error')
+        if not failed:
+            status_code = status.HTTP_200_OK
+        elif failed < len(results):
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
+        return {
+            "success": not failed,
+            "message": f"{len(results) - failed} cylinders scanned, {failed} failed",
+            "data": {
+                "reference": reference,
+                "results": results,
+                "balances": StockBalanceSerializer(repo_response.data['balances'], many=True).data,
+            },
+            "status_code": status_code
+        }
+
+    @staticmethod
+    def scan_in(data: dict, user_id: int = None):
+        serializer = CylinderScanInSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        validated = serializer.validated_data
+        product = validated.get('product')
+        return CylinderService._scan(
+            validated,
+            user_id=user_id,
+            to_type=Cylinder.STATION,
+            to_id=validated['station'].id,
+            to_state=validated['state'],
+            product_id=product.id if product else None,
+        )
+
+    @staticmethod
+    def scan_out(data: dict, user_id: int = None):
+        serializer = CylinderScanOutSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        validated = serializer.validated_data
+        return CylinderService._scan(
+            validated,
+            user_id=user_id,
+            to_type=validated['location_type'],
+            to_id=validated['location_id'],
+        )
+
+    @staticmethod
+    def get_available(product_id: int, station_id: int, state: str = Cylinder.FULL, cursor: str = None,
+                      limit: int = DEFAULT_PAGE_SIZE):
+        repo_response = CylinderRepository.get_available(product_id, station_id, state=state, cursor=cursor, limit=limit)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": "Available cylinders retrieved successfully",
+            "data": repo_response.data,
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def get_cylinder(serial: str):
+        repo_response = CylinderRepository.get_cylinder(serial)
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": "Cylinder retrieved successfully",
+            "data": {
+                "cylinder": CylinderSerializer(repo_response.data['cylinder']).data,
+                "events": CylinderEventSerializer(repo_response.data['events'], many=True).data,
+            },
+            "status_code": status.HTTP_200_OK
+        }
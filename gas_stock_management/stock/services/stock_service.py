@@ -0,0 +1,417 @@
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from rest_framework import status
+from notifications.services.notification_service import NotificationService
+from gas_stock_management.response import RepositoryResponse
+from stock.concurrency import ContentionMetrics, StockConflict, run_with_retries
+from stock.models import StockMovement
+from stock.repository.stock_repository import StockRepository
+from stock.serializers import (
+    RecordMovementSerializer,
+    SetThresholdSerializer,
+    StockBalanceSerializer,
+    StockMovementSerializer,
+    StockThresholdSerializer,
+    StocktakeLineSerializer,
+    StocktakeSerializer,
+    TransferSerializer,
+    signed_quantity,
+)
+from stock.thresholds import ThresholdCache
+
+
+class StockService:
+
+    @staticmethod
+    def _record(movements: list, user_id: int = None):
+        """
+        Write movements and raise any low-stock alerts they cause, all in one
+        transaction, retried with jitter if it loses a race for the balances.
+        """
+        def attempt():
+            with transaction.atomic():
+                repo_response = StockRepository.record_movements(movements, created_by_id=user_id)
+                if repo_response.success:
+                    StockService._detect_low_stock(repo_response.data['deltas'], repo_response.data['balances'])
+            return repo_response
+
+        try:
+            return run_with_retries(attempt)
+        except StockConflict as e:
+            return RepositoryResponse(
+                success=False,
+                message=str(e),
+                status_code=status.HTTP_409_CONFLICT
+            )
+
+    @staticmethod
+    def _detect_low_stock(deltas: dict, balances: list) -> None:
+        """
+        Compare each touched balance before and after the write against the
+        station's cached thresholds. Only a write that crosses a threshold
+        touches the database: crossing below the reorder point raises the
+        alert (one event, unless it is already active) and crossing back up to
+        the clear point re-arms it.
+        """
+        for balance in balances:
+            table = ThresholdCache.get(balance.station_id)
+            if balance.product_id not in table:
+                continue
+            threshold_id, reorder_point, clear_point, manager_id = table[balance.product_id]
+            after = balance.quantity
+            before = after - deltas[(balance.station_id, balance.product_id)]
+
+            if before >= reorder_point > after:
+                if StockRepository.set_threshold_alert(threshold_id, True):
+                    NotificationService.enqueue_low_stock(
+                        balance.station_id, balance.product_id, after, reorder_point, recipient_id=manager_id
+                    )
+            elif before < clear_point <= after:
+                StockRepository.set_threshold_alert(threshold_id, False)
+
+    @staticmethod
+    def _movement_response(repo_response, message: str):
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": message,
+            "data": {
+                "movements": StockMovementSerializer(repo_response.data['movements'], many=True).data,
+                "balances": StockBalanceSerializer(repo_response.data['balances'], many=True).data,
+            },
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def _outside_scope(stations: list, manager_id: int = None):
+        """A 404 response if `manager_id` is given and does not run every one of `stations`, else None."""
+        if manager_id is None or all(station.manager_id == manager_id for station in stations):
+            return None
+        return {
+            "success": False,
+            "message": "Station not found",
+            "data": {},
+            "status_code": status.HTTP_404_NOT_FOUND
+        }
+
+    @staticmethod
+    def record_movement(data: dict, user_id: int = None, manager_id: int = None):
+        """Record one movement; with `manager_id` only at that manager's stations."""
+        serializer = RecordMovementSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+
+        validated = serializer.validated_data
+        outside = StockService._outside_scope([validated['station']], manager_id)
+        if outside is not None:
+            return outside
+        repo_response = StockService._record([{
+            "station_id": validated['station'].id,
+            "product_id": validated['product'].id,
+            "movement_type": validated['movement_type'],
+            "quantity": serializer.signed_quantity(),
+            "reference": validated['reference'],
+            "note": validated['note'],
+        }], user_id=user_id)
+        return StockService._movement_response(repo_response, "Stock movement recorded successfully")
+
+    @staticmethod
+    def transfer_stock(data: dict, user_id: int = None, manager_id: int = None):
+        """
+        Both legs of a transfer are written in one transaction under a shared
+        reference. With `manager_id` the manager must run both stations.
+        """
+        serializer = TransferSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+
+        validated = serializer.validated_data
+        outside = StockService._outside_scope([validated['from_station'], validated['to_station']], manager_id)
+        if outside is not None:
+            return outside
+        reference = validated['reference'] or uuid.uuid4().hex
+        product_id = validated['product'].id
+        repo_response = StockService._record([
+            {
+                "station_id": validated['from_station'].id,
+                "product_id": product_id,
+                "movement_type": StockMovement.TRANSFER_OUT,
+                "quantity": -validated['quantity'],
+                "reference": reference,
+                "note": validated['note'],
+            },
+            {
+                "station_id": validated['to_station'].id,
+                "product_id": product_id,
+                "movement_type": StockMovement.TRANSFER_IN,
+                "quantity": validated['quantity'],
+                "reference": reference,
+                "note": validated['note'],
+            },
+        ], user_id=user_id)
+        return StockService._movement_response(repo_response, "Stock transferred successfully")
+
+    @staticmethod
+    def stocktake(data: dict, user_id: int = None, manager_id: int = None):
+        """
+        Apply a batch of stocktake counts and movements in one transaction.
+        Lines are parsed individually, ids are checked with one query each for
+        stations and products, and counts become adjustments by the difference
+        to the current balance. Invalid lines are reported and skipped; the
+        rest are written together with a compare-and-swap on the balances
+        read, and the batch is recomputed and retried if any of them moved.
+        With `manager_id`, lines for stations that manager does not run fail.
+        """
+        serializer = StocktakeSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+        batch = serializer.validated_data
+        reference = batch['reference'] or uuid.uuid4().hex
+
+        results = []
+        parsed = []
+        for index, raw in enumerate(batch['lines']):
+            line = StocktakeLineSerializer(data=raw)
+            if not line.is_valid():
+                results.append({"line": index, "status": "error", "errors": line.errors})
+                continue
+            line = dict(line.validated_data)
+            line.setdefault('station', batch.get('station'))
+            if line['station'] is None:
+                results.append({"line": index, "status": "error", "errors": {"station": ["This field is required."]}})
+                continue
+            results.append(None)
+            parsed.append((index, line))
+
+        try:
+            results, balances = run_with_retries(
+                lambda: StockService._apply_stocktake(parsed, list(results), reference, user_id, manager_id)
+            )
+        except StockConflict as e:
+            return {
+                "success": False,
+                "message": str(e),
+                "data": {},
+                "status_code": status.HTTP_409_CONFLICT
+            }
+
+        failed = sum(1 for result in results if result['status'] == 'error')
+        applied = sum(1 for result in results if result['status'] == 'applied')
+        if not failed:
+            status_code = status.HTTP_200_OK
+        elif applied or failed < len(results):
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
+        return {
+            "success": not failed,
+            "message": f"{applied} lines applied, {failed} failed",
+            "data": {
+                "reference": reference,
+                "results": results,
+                "balances": StockBalanceSerializer(balances, many=True).data,
+            },
+            "status_code": status_code
+        }
+
+    @staticmethod
+    def _apply_stocktake(parsed: list, results: list, reference: str, user_id: int = None, manager_id: int = None):
+        """One attempt at writing a parsed stocktake; raises StockConflict if a balance moved meanwhile."""
+        with transaction.atomic():
+            stations, products = StockRepository.active_ids(
+                {line['station'] for _, line in parsed}, {line['product'] for _, line in parsed}, manager_id=manager_id
+            )
+            keys = {
+                (line['station'], line['product']) for _, line in parsed
+                if line['station'] in stations and line['product'] in products
+            }
+            read = StockRepository.read_balances(keys)
+            running = defaultdict(Decimal, {key: quantity for key, (_, quantity, _, _) in read.items()})
+            # Held for open orders: like `record_movement`, no line may take stock from under them
+            reserved = defaultdict(Decimal, {key: held for key, (_, _, _, held) in read.items()})
+
+            movements = []
+            deltas = defaultdict(Decimal)
+            counted = set()
+            for index, line in parsed:
+                key = (line['station'], line['product'])
+                if line['station'] not in stations:
+                    results[index] = {"line": index, "status": "error", "errors": {"station": ["Unknown or inactive station."]}}
+                    continue
+                if line['product'] not in products:
+                    results[index] = {"line": index, "status": "error", "errors": {"product": ["Unknown or inactive product."]}}
+                    continue
+
+                if 'counted' in line:
+                    if key in counted:
+                        results[index] = {"line": index, "status": "error", "errors": {"counted": ["Product already counted in this batch."]}}
+                        continue
+                    counted.add(key)
+                    movement_type = StockMovement.ADJUSTMENT
+                    delta = line['counted'] - running[key]
+                    if delta < 0 and line['counted'] < reserved[key]:
+                        results[index] = {"line": index, "status": "error", "errors": {"counted": ["Count is below the stock reserved for open orders."]}}
+                        continue
+                else:
+                    movement_type = line['movement_type']
+                    delta = signed_quantity(movement_type, line['quantity'])
+                    if delta < 0 and running[key] + delta < reserved[key]:
+                        results[index] = {"line": index, "status": "error", "errors": {"quantity": ["Insufficient stock."]}}
+                        continue
+
+                running[key] += delta
+                results[index] = {
+                    "line": index,
+                    "status": "applied" if delta else "unchanged",
+                    "delta": delta,
+                    "quantity": running[key],
+                }
+                if delta:
+                    deltas[key] += delta
+                    movements.append({
+                        "station_id": key[0],
+                        "product_id": key[1],
+                        "movement_type": movement_type,
+                        "quantity": delta,
+                        "reference": reference,
+                        "note": line['note'] or ('stocktake count' if 'counted' in line else ''),
+                    })
+
+            balances = StockRepository.apply_batch(movements, deltas, read, created_by_id=user_id)
+            StockService._detect_low_stock(deltas, balances)
+        return results, balances
+
+    @staticmethod
+    def get_balance(station_id: int, product_id: int):
+        repo_response = StockRepository.get_balance(station_id, product_id)
+        return {
+            "success": True,
+            "message": "Stock balance retrieved successfully",
+            "data": repo_response.data,
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def get_station_balances(station_id: int):
+        repo_response = StockRepository.get_station_balances(station_id)
+        return {
+            "success": True,
+            "message": "Stock balances retrieved successfully",
+            "data": {"balances": StockBalanceSerializer(repo_response.data['balances'], many=True).data},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def get_balance_at(station_id: int, product_id: int, at):
+        repo_response = StockRepository.get_balance_at(station_id, product_id, at)
+        return {
+            "success": True,
+            "message": "Stock balance retrieved successfully",
+            "data": repo_response.data,
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def get_station_balances_at(station_id: int, at):
+        repo_response = StockRepository.get_station_balances_at(station_id, at)
+        return {
+            "success": True,
+            "message": "Stock balances retrieved successfully",
+            "data": repo_response.data,
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def set_threshold(station_id: int, data: dict, user_id: int = None, manager_id: int = None):
+        serializer = SetThresholdSerializer(data=data)
+        if not serializer.is_valid():
+            return {
+                "success": False,
+                "message": "Invalid input",
+                "data": serializer.errors,
+                "status_code": status.HTTP_400_BAD_REQUEST
+            }
+
+        validated = serializer.validated_data
+        repo_response = StockRepository.save_threshold(
+            station_id, validated['product'].id, validated['reorder_point'], validated['clear_point'],
+            user_id=user_id, manager_id=manager_id
+        )
+        if not repo_response.success:
+            return {
+                "success": False,
+                "message": repo_response.message,
+                "data": {},
+                "status_code": repo_response.status_code
+            }
+        return {
+            "success": True,
+            "message": "Stock threshold saved successfully",
+            "data": StockThresholdSerializer(repo_response.data['threshold']).data,
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def get_thresholds(station_id: int):
+        repo_response = StockRepository.get_station_thresholds(station_id)
+        return {
+            "success": True,
+            "message": "Stock thresholds retrieved successfully",
+            "data": {"thresholds": StockThresholdSerializer(repo_response.data['thresholds'], many=True).data},
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def take_snapshots(until=None, chunk_days: int = 7):
+        repo_response = StockRepository.take_snapshots(until=until, chunk_days=chunk_days)
+        return {
+            "success": repo_response.success,
+            "message": repo_response.message or "Stock snapshots taken",
+            "data": repo_response.data or {},
+            "status_code": repo_response.status_code
+        }
+
+    @staticmethod
+    def contention_stats():
+        return {
+            "success": True,
+            "message": "Stock contention statistics",
+            "data": ContentionMetrics.stats(),
+            "status_code": status.HTTP_200_OK
+        }
+
+    @staticmethod
+    def check_balances(fix: bool = False):
+        repo_response = StockRepository.check_balances(fix=fix)
+        return {
+            "success": repo_response.success,
+            "message": repo_response.message or (
+                "Stock balances match the ledger" if not repo_response.data['drift']
+                else f"{len(repo_response.data['drift'])} stock balances drifted from the ledger"
+            ),
+            "data": repo_response.data or {},
+            "status_code": repo_response.status_code
+        }
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Station, StockThreshold
+from .thresholds import ThresholdCache
+
+
+@receiver(post_save, sender=StockThreshold)
+@receiver(post_delete, sender=StockThreshold)
+def invalidate_cached_thresholds(sender, instance, **kwargs):
+    ThresholdCache.invalidate(instance.station_id)
+
+
+@receiver(post_save, sender=Station)
+def invalidate_cached_station_thresholds(sender, instance, **kwargs):
+    # The table carries the station manager as alert recipient
+    ThresholdCache.invalidate(instance.pk)
@@ -0,0 +1,169 @@
+import threading
+from decimal import Decimal
+from unittest import mock, skipUnless
+from django.core.cache import cache
+from django.db import connection, OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+from products.models import Product
+from stock.concurrency import ContentionMetrics, StockConflict, run_with_retries
+from stock.models import Station, StockBalance, StockMovement
+from stock.repository.stock_repository import StockRepository
+from stock.services.stock_service import StockService
+
+
+NO_SLEEP = {'MAX_RETRIES': 3, 'BASE_DELAY': 0, 'MAX_DELAY': 0}
+
+
+@override_settings(STOCK_CONCURRENCY=NO_SLEEP)
+class RetryTests(TestCase):
+    def setUp(self):
+        ContentionMetrics.reset()
+
+    def test_retries_until_success(self):
+        outcomes = [StockConflict(), OperationalError('database is locked'), 'done']
+
+        def operation():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        self.assertEqual(run_with_retries(operation), 'done')
+        stats = ContentionMetrics.stats()
+        self.assertEqual((stats['attempts'], stats['conflicts'], stats['retries'], stats['aborts']), (3, 2, 2, 0))
+
+    def test_aborts_after_max_retries(self):
+        def operation():
+            raise StockConflict()
+
+        with self.assertRaises(StockConflict):
+            run_with_retries(operation)
+        self.assertEqual(ContentionMetrics.stats()['aborts'], 1)
+        self.assertEqual(ContentionMetrics.stats()['attempts'], 4)
+
+    def test_other_errors_are_not_retried(self):
+        def operation():
+            raise OperationalError('no such table')
+
+        with self.assertRaises(OperationalError):
+            run_with_retries(operation)
+        self.assertEqual(ContentionMetrics.stats()['retries'], 0)
+
+
+@override_settings(STOCK_CONCURRENCY=NO_SLEEP)
+class CompareAndSwapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        ContentionMetrics.reset()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        StockService.record_movement({
+            "station": self.station.id, "product": self.product.id, "movement_type": 'receipt', "quantity": '10',
+        })
+
+    def test_every_write_bumps_version(self):
+        balance = StockBalance.objects.get()
+        StockService.record_movement({
+            "station": self.station.id, "product": self.product.id, "movement_type": 'sale', "quantity": '1',
+        })
+        balance.refresh_from_db()
+        self.assertEqual(balance.version, 2)
+
+    def test_stale_read_fails_swap(self):
+        key = (self.station.id, self.product.id)
+        read = StockRepository.read_balances([key])
+        StockBalance.objects.update(quantity=Decimal('4'), version=5)
+
+        with self.assertRaises(StockConflict):
+            StockRepository.apply_batch([], {key: Decimal('-3')}, read)
+        self.assertEqual(StockBalance.objects.get().quantity, Decimal('4'))
+
+    def test_swap_does_not_take_reserved_stock(self):
+        key = (self.station.id, self.product.id)
+        read = StockRepository.read_balances([key])
+        # Reserved without a version bump, so only the reserve guard can catch it
+        StockBalance.objects.update(reserved=Decimal('8'))
+
+        with self.assertRaises(StockConflict):
+            StockRepository.apply_batch([], {key: Decimal('-5')}, read)
+        self.assertEqual(StockBalance.objects.get().quantity, Decimal('10'))
+
+    def test_stocktake_recomputes_count_after_conflict(self):
+        key = (self.station.id, self.product.id)
+        stale = StockRepository.read_balances([key])
+        # A cashier sells 3 after the stocktake read the balance
+        StockService.record_movement({
+            "station": self.station.id, "product": self.product.id, "movement_type": 'sale', "quantity": '3',
+        })
+
+        original = StockRepository.read_balances
+        reads = [lambda keys: stale, original]
+        with mock.patch.object(StockRepository, 'read_balances', side_effect=lambda keys: reads.pop(0)(keys)):
+            response = StockService.stocktake({
+                "station": self.station.id, "lines": [{"product": self.product.id, "counted": '6'}],
+            })
+
+        self.assertTrue(response['success'])
+        self.assertEqual(response['data']['results'][0]['delta'], Decimal('-1'))
+        self.assertEqual(StockBalance.objects.get().quantity, Decimal('6'))
+        self.assertEqual(ContentionMetrics.stats()['retries'], 1)
+        self.assertEqual(StockService.check_balances()['data']['drift'], [])
+
+
+@skipUnless(connection.vendor != 'sqlite' or connection.settings_dict['TEST']['NAME'],
+            "needs a file-based test database: set THREADED_TESTS=1")
+@override_settings(STOCK_CONCURRENCY={'MAX_RETRIES': 50, 'BASE_DELAY': 0.002, 'MAX_DELAY': 0.05})
+class ConcurrentSalesStressTests(TransactionTestCase):
+    """Many cashiers selling the same product at once, each thread on its own connection."""
+    THREADS = 8
+    SALES_PER_THREAD = 15
+    OPENING_STOCK = 100
+
+    def setUp(self):
+        cache.clear()
+        ContentionMetrics.reset()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        StockService.record_movement({
+            "station": self.station.id, "product": self.product.id,
+            "movement_type": 'receipt', "quantity": str(self.OPENING_STOCK),
+        })
+
+    def test_no_oversell_and_ledger_matches(self):
+        outcomes = []
+        lock = threading.Lock()
+        start = threading.Barrier(self.THREADS)
+
+        def cashier(number):
+            try:
+                start.wait()
+                for sale in range(self.SALES_PER_THREAD):
+                    if sale % 5 == 4:
+                        response = StockService.stocktake({
+                            "station": self.station.id,
+                            "lines": [{"product": self.product.id, "movement_type": 'sale', "quantity": '1'}],
+                        })
+                    else:
+                        response = StockService.record_movement({
+                            "station": self.station.id, "product": self.product.id,
+                            "movement_type": 'sale', "quantity": '1',
+                        })
+                    with lock:
+                        outcomes.append(response['status_code'])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=cashier, args=(n,)) for n in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sold = sum(1 for code in outcomes if code in (200, 201))
+        demand = self.THREADS * self.SALES_PER_THREAD
+        self.assertEqual(len(outcomes), demand)
+        self.assertEqual(sold, self.OPENING_STOCK)
+        self.assertEqual(StockBalance.objects.get().quantity, Decimal('0'))
+        self.assertEqual(StockMovement.objects.filter(quantity__lt=0).count(), self.OPENING_STOCK)
+        self.assertEqual(StockService.check_balances()['data']['drift'], [])
+        self.assertEqual(ContentionMetrics.stats()['aborts'], 0)
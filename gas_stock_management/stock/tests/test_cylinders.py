@@ -0,0 +1,221 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from products.models import Product
+from stock.models import Cylinder, CylinderEvent, Station, StockBalance, StockMovement
+from stock.services.cylinder_service import CylinderService
+from stock.services.stock_service import StockService
+
+
+class CylinderScanTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.other = Station.objects.create(name='Huye', code='HYE01')
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        self.customer = User.objects.create_user(username='customer', email='customer@test.com', password='pass123')
+
+    def _balance(self, station=None):
+        return StockBalance.objects.get(station=station or self.station, product=self.product).quantity
+
+    def _receive(self, serials, **extra):
+        return CylinderService.scan_in({
+            "station": self.station.id,
+            "product": self.product.id,
+            "serials": serials,
+            "state": Cylinder.FULL,
+            **extra,
+        })
+
+    def test_scan_in_registers_and_receives(self):
+        response = self._receive(['A1', 'A2', 'A3'])
+
+        self.assertTrue(response['success'])
+        self.assertEqual([r['status'] for r in response['data']['results']], ['registered'] * 3)
+        self.assertEqual(self._balance(), Decimal('3'))
+        movement = StockMovement.objects.get(reference=response['data']['reference'])
+        self.assertEqual((movement.movement_type, movement.quantity), (StockMovement.RECEIPT, Decimal('3')))
+        self.assertEqual(CylinderEvent.objects.filter(movement=movement).count(), 3)
+
+    def test_scan_out_to_customer_is_a_sale(self):
+        self._receive(['A1', 'A2', 'A3'])
+        response = CylinderService.scan_out({
+            "station": self.station.id,
+            "serials": ['A1', 'A2'],
+            "location_type": 'customer',
+            "location_id": self.customer.id,
+        })
+
+        self.assertEqual(response['status_code'], status.HTTP_200_OK)
+        self.assertEqual(self._balance(), Decimal('1'))
+        self.assertEqual(
+            Cylinder.objects.filter(location_type=Cylinder.CUSTOMER, location_id=self.customer.id).count(), 2
+        )
+        sale = StockMovement.objects.get(reference=response['data']['reference'])
+        self.assertEqual((sale.movement_type, sale.quantity), (StockMovement.SALE, Decimal('-2')))
+
+    def test_truck_round_trip_transfers_between_stations(self):
+        self._receive(['A1', 'A2'])
+        CylinderService.scan_out({
+            "station": self.station.id, "serials": ['A1', 'A2'], "location_type": 'truck', "location_id": 7,
+        })
+        response = CylinderService.scan_in({"station": self.other.id, "serials": ['A1', 'A2'], "state": 'full'})
+
+        self.assertTrue(response['success'])
+        self.assertEqual(self._balance(), Decimal('0'))
+        self.assertEqual(self._balance(self.other), Decimal('2'))
+        self.assertEqual(
+            list(StockMovement.objects.filter(note='cylinder scan').order_by('id').values_list('movement_type', flat=True)),
+            [StockMovement.RECEIPT, StockMovement.TRANSFER_OUT, StockMovement.TRANSFER_IN]
+        )
+        self.assertEqual(StockService.check_balances()['data']['drift'], [])
+
+    def test_empty_returns_move_no_stock(self):
+        self._receive(['A1'])
+        CylinderService.scan_out({
+            "station": self.station.id, "serials": ['A1'], "location_type": 'customer', "location_id": self.customer.id,
+        })
+        response = CylinderService.scan_in({"station": self.station.id, "serials": ['A1'], "state": 'empty'})
+
+        self.assertTrue(response['success'])
+        self.assertEqual(self._balance(), Decimal('0'))
+        cylinder = Cylinder.objects.get(serial_number='A1')
+        self.assertEqual((cylinder.state, cylinder.location_type), (Cylinder.EMPTY, Cylinder.STATION))
+        last = cylinder.events.latest('id')
+        self.assertIsNone(last.movement_id)
+        self.assertEqual((last.from_location_type, last.to_state), (Cylinder.CUSTOMER, Cylinder.EMPTY))
+
+    def test_scan_in_must_say_what_arrived(self):
+        response = CylinderService.scan_in({"station": self.station.id, "product": self.product.id, "serials": ['A1']})
+        self.assertEqual(response['status_code'], status.HTTP_400_BAD_REQUEST)
+        self.assertIn('state', response['data'])
+        self.assertFalse(Cylinder.objects.exists())
+        self.assertFalse(StockMovement.objects.exists())
+
+    def test_per_serial_errors_do_not_block_the_rest(self):
+        self._receive(['A1'])
+        Cylinder.objects.create(serial_number='R1', product=self.product, state=Cylinder.RETIRED, location_id=self.station.id)
+        response = CylinderService.scan_out({
+            "station": self.other.id,
+            "serials": ['A1', 'R1', 'NOPE'],
+            "location_type": 'truck',
+            "location_id": 1,
+        })
+
+        self.assertEqual(response['status_code'], status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [r['errors'] for r in response['data']['results']],
+            [["Cylinder is not at this station."], ["Cylinder is retired."], ["Unknown serial number."]]
+        )
+
+        response = self._receive(['A1', 'B1', 'B1'])
+        self.assertEqual(response['status_code'], status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [r['status'] for r in response['data']['results']], ['unchanged', 'registered', 'error']
+        )
+        self.assertEqual(self._balance(), Decimal('2'))
+
+    def test_scan_is_rolled_back_when_the_ledger_refuses(self):
+        self._receive(['A1', 'A2'])
+        StockService.record_movement({
+            "station": self.station.id, "product": self.product.id, "movement_type": 'adjustment', "quantity": '-2',
+        })
+        response = CylinderService.scan_out({
+            "station": self.station.id, "serials": ['A1'], "location_type": 'truck', "location_id": 1,
+        })
+
+        self.assertEqual(response['status_code'], status.HTTP_409_CONFLICT)
+        self.assertEqual(Cylinder.objects.get(serial_number='A1').location_type, Cylinder.STATION)
+        self.assertEqual(CylinderEvent.objects.count(), 2)
+
+    def test_scan_query_count_does_not_grow_with_serials(self):
+        def scan(serials):
+            with CaptureQueriesContext(connection) as queries:
+                response = self._receive(serials)
+            self.assertTrue(response['success'])
+            return len(queries)
+
+        scan(['W0'])
+        # Within one insert batch (SQLite caps bulk inserts by bound parameters)
+        self.assertEqual(scan([f'S{i}' for i in range(5)]), scan([f'L{i}' for i in range(60)]))
+        self.assertLess(scan([f'H{i}' for i in range(500)]), 30)
+
+
+class CylinderAvailabilityTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.driver = User.objects.create_user(username='driver', email='driver@test.com', password='pass123')
+        self.driver.profile.role = 'delivery'
+        self.driver.profile.save()
+        self.client.force_authenticate(user=self.driver)
+
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        other = Product.objects.create(name='LPG 6kg', sku='LPG-6', category='lpg', unit='cylinder')
+        Cylinder.objects.bulk_create(
+            [Cylinder(serial_number=f'F{i:03}', product=self.product, location_id=self.station.id) for i in range(5)]
+            + [Cylinder(serial_number='E001', product=self.product, state=Cylinder.EMPTY, location_id=self.station.id),
+               Cylinder(serial_number='X001', product=other, location_id=self.station.id),
+               Cylinder(serial_number='T001', product=self.product, location_type=Cylinder.TRUCK, location_id=self.station.id)]
+        )
+
+    def _get(self, **params):
+        return self.client.get(reverse('cylinders-available'), {
+            "product": self.product.id, "station": self.station.id, **params,
+        })
+
+    def test_pages_through_available_serials(self):
+        first = self._get(page_size=3)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data['data']['serials'], ['F000', 'F001', 'F002'])
+
+        second = self._get(page_size=3, cursor=first.data['data']['next_cursor'])
+        self.assertEqual(second.data['data']['serials'], ['F003', 'F004'])
+        self.assertIsNone(second.data['data']['next_cursor'])
+
+        self.assertEqual(self._get(state='empty').data['data']['serials'], ['E001'])
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self._get(state='lost').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._get(cursor='!!').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('cylinders-available'), {"station": self.station.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_lookup_is_answered_from_the_index_alone(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("Query plan check is SQLite-specific")
+        queryset = Cylinder.objects.filter(
+            product_id=self.product.id, location_type=Cylinder.STATION, location_id=self.station.id, state=Cylinder.FULL,
+            serial_number__gt='F001',
+        ).order_by('serial_number').values_list('serial_number', flat=True)[:51]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn("COVERING INDEX cylinder_availability_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_cylinder_detail_with_history(self):
+        CylinderService.scan_out({
+            "station": self.station.id, "serials": ['E001'], "location_type": 'truck', "location_id": 3,
+        })
+        response = self.client.get(reverse('cylinder-detail', args=['E001']))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['cylinder']['location_type'], 'truck')
+        self.assertEqual(len(response.data['data']['events']), 1)
+        self.assertEqual(self.client.get(reverse('cylinder-detail', args=['NOPE'])).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_customers_cannot_scan(self):
+        customer = User.objects.create_user(username='customer', email='customer@test.com', password='pass123')
+        self.client.force_authenticate(user=customer)
+        response = self.client.post(reverse('cylinder-scan-in'), {
+            "station": self.station.id, "serials": ['F000'],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,81 @@
+from decimal import Decimal
+from django.test import TestCase
+from products.models import Product
+from stock.models import Station, StockBalance, StockMovement
+from stock.repository.stock_repository import StockRepository
+
+
+def movement(station, product, movement_type, quantity, **extra):
+    return {
+        "station_id": station.id,
+        "product_id": product.id,
+        "movement_type": movement_type,
+        "quantity": Decimal(quantity),
+        **extra,
+    }
+
+
+class StockLedgerTests(TestCase):
+    def setUp(self):
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.other = Station.objects.create(name='Huye', code='HYE01')
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+
+    def test_balance_follows_movements(self):
+        StockRepository.record_movements([movement(self.station, self.product, 'receipt', '40')])
+        StockRepository.record_movements([movement(self.station, self.product, 'sale', '-15')])
+        StockRepository.record_movements([movement(self.station, self.product, 'adjustment', '-1')])
+
+        balance = StockRepository.get_balance(self.station.id, self.product.id).data
+        self.assertEqual(balance['quantity'], Decimal('24'))
+        self.assertEqual(StockMovement.objects.count(), 3)
+
+    def test_balance_read_is_single_row(self):
+        StockRepository.record_movements([movement(self.station, self.product, 'receipt', '5')] * 20)
+        with self.assertNumQueries(1):
+            balance = StockRepository.get_balance(self.station.id, self.product.id).data
+        self.assertEqual(balance['quantity'], Decimal('100'))
+
+    def test_unknown_balance_is_zero(self):
+        self.assertEqual(StockRepository.get_balance(self.station.id, self.product.id).data['quantity'], 0)
+
+    def test_oversell_rolls_back_whole_batch(self):
+        StockRepository.record_movements([movement(self.station, self.product, 'receipt', '3')])
+        response = StockRepository.record_movements([
+            movement(self.other, self.product, 'receipt', '10'),
+            movement(self.station, self.product, 'sale', '-4'),
+        ])
+
+        self.assertFalse(response.success)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(StockMovement.objects.count(), 1)
+        self.assertFalse(StockBalance.objects.filter(station=self.other).exists())
+        self.assertEqual(StockBalance.objects.get(station=self.station).quantity, Decimal('3'))
+
+    def test_movements_are_append_only(self):
+        StockRepository.record_movements([movement(self.station, self.product, 'receipt', '3')])
+        entry = StockMovement.objects.get()
+        entry.quantity = Decimal('30')
+        with self.assertRaises(ValueError):
+            entry.save()
+        with self.assertRaises(ValueError):
+            entry.delete()
+
+    def test_check_balances_reports_and_fixes_drift(self):
+        StockRepository.record_movements([
+            movement(self.station, self.product, 'receipt', '10'),
+            movement(self.other, self.product, 'receipt', '7'),
+        ])
+        StockBalance.objects.filter(station=self.station).update(quantity=Decimal('12'))
+        StockBalance.objects.filter(station=self.other).delete()
+
+        report = StockRepository.check_balances().data
+        self.assertEqual(report['checked'], 2)
+        self.assertEqual(
+            [(row['station_id'], row['ledger'], row['balance']) for row in report['drift']],
+            [(self.station.id, Decimal('10'), Decimal('12')), (self.other.id, Decimal('7'), None)]
+        )
+
+        StockRepository.check_balances(fix=True)
+        self.assertEqual(StockRepository.check_balances().data['drift'], [])
+        self.assertEqual(StockBalance.objects.get(station=self.other).quantity, Decimal('7'))
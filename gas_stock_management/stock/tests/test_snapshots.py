@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from products.models import Product
+from stock.models import Station, StockMovement, StockSnapshot
+from stock.repository.stock_repository import StockRepository
+
+
+def at(day, hour=0):
+    return timezone.make_aware(datetime(2025, 3, day, hour))
+
+
+class StockSnapshotTests(TestCase):
+    def setUp(self):
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.lpg = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        self.fuel = Product.objects.create(name='Diesel', sku='DSL', category='fuel', unit='litre')
+
+        # (created_at, product, quantity)
+        history = [
+            (at(1, 9), self.lpg, '50'),
+            (at(1, 15), self.lpg, '-10'),
+            (at(2, 10), self.fuel, '1000'),
+            (at(3, 12), self.lpg, '-5'),
+            (at(5, 8), self.fuel, '-250'),
+            (at(5, 18), self.lpg, '20'),
+        ]
+        for created_at, product, quantity in history:
+            StockRepository.record_movements([{
+                "station_id": self.station.id,
+                "product_id": product.id,
+                "movement_type": 'adjustment',
+                "quantity": Decimal(quantity),
+            }])
+            StockMovement.objects.filter(id=StockMovement.objects.latest('id').id).update(created_at=created_at)
+
+    def _quantity_at(self, product, moment):
+        return StockRepository.get_balance_at(self.station.id, product.id, moment).data['quantity']
+
+    def test_snapshots_only_for_pairs_that_moved(self):
+        result = StockRepository.take_snapshots(until=at(6), chunk_days=2)
+
+        self.assertTrue(result.success)
+        snapshots = list(StockSnapshot.objects.order_by('taken_at', 'product_id')
+                         .values_list('product_id', 'taken_at', 'quantity'))
+        self.assertEqual(snapshots, [
+            (self.lpg.id, at(2), Decimal('40')),
+            (self.fuel.id, at(3), Decimal('1000')),
+            (self.lpg.id, at(4), Decimal('35')),
+            (self.lpg.id, at(6), Decimal('55')),
+            (self.fuel.id, at(6), Decimal('750')),
+        ])
+
+    def test_backfill_resumes_from_last_snapshot(self):
+        StockRepository.take_snapshots(until=at(3))
+        StockRepository.take_snapshots(until=at(6))
+        self.assertEqual(
+            StockSnapshot.objects.get(product=self.lpg, taken_at=at(6)).quantity, Decimal('55')
+        )
+        self.assertEqual(StockSnapshot.objects.count(), 5)
+
+    def test_point_in_time_matches_full_replay(self):
+        StockRepository.take_snapshots(until=at(6))
+
+        for moment in [at(1, 12), at(2), at(3, 12), at(4, 23), at(5, 12), at(7)]:
+            for product in (self.lpg, self.fuel):
+                expected = sum(
+                    (m.quantity for m in StockMovement.objects.filter(product=product, created_at__lte=moment)),
+                    Decimal('0')
+                )
+                self.assertEqual(self._quantity_at(product, moment), expected, (product, moment))
+
+    def test_point_in_time_loads_snapshot_and_replays_since(self):
+        StockRepository.take_snapshots(until=at(6))
+        with self.assertNumQueries(2):
+            self.assertEqual(self._quantity_at(self.lpg, at(5, 12)), Decimal('35'))
+
+    def test_station_balances_at(self):
+        StockRepository.take_snapshots(until=at(6))
+        balances = StockRepository.get_station_balances_at(self.station.id, at(5, 12)).data['balances']
+        self.assertEqual(balances, [
+            {"product_id": self.lpg.id, "quantity": Decimal('35')},
+            {"product_id": self.fuel.id, "quantity": Decimal('750')},
+        ])
+
+    def test_command_and_endpoint(self):
+        out = StringIO()
+        call_command('backfill_stock_snapshots', '--until', '2025-03-06', '--chunk-days', '1', stdout=out)
+        self.assertIn('Wrote 5 snapshots', out.getvalue())
+
+        manager = User.objects.create_user(username='manager', email='manager@test.com', password='pass123')
+        manager.profile.role = 'manager'
+        manager.profile.save()
+        client = APIClient()
+        client.force_authenticate(user=manager)
+
+        url = reverse('station-balances', args=[self.station.id])
+        response = client.get(url, {"product": self.lpg.id, "at": "2025-03-03T18:00:00"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['quantity'], Decimal('35'))
+
+        response = client.get(url, {"at": "last friday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
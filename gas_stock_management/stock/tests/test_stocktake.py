@@ -0,0 +1,156 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from products.models import Product
+from stock.models import Station, StockBalance, StockMovement
+from stock.repository.stock_repository import StockRepository
+from stock.serializers import StocktakeSerializer
+from stock.services.stock_service import StockService
+
+
+class StocktakeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01')
+        self.products = [
+            Product.objects.create(name=f'Product {i}', sku=f'SKU-{i}', category='lpg', unit='cylinder')
+            for i in range(120)
+        ]
+        self.inactive = Product.objects.create(name='Old', sku='OLD', category='lpg', is_active=False)
+        StockService.record_movement({
+            "station": self.station.id,
+            "product": self.products[0].id,
+            "movement_type": 'receipt',
+            "quantity": '10',
+        })
+
+    def _balance(self, product):
+        return StockBalance.objects.get(station=self.station, product=product).quantity
+
+    def test_counts_become_adjustments(self):
+        response = StockService.stocktake({
+            "station": self.station.id,
+            "lines": [
+                {"product": self.products[0].id, "counted": '7'},
+                {"product": self.products[1].id, "counted": '3'},
+                {"product": self.products[2].id, "counted": '0'},
+            ],
+        })
+
+        self.assertTrue(response['success'])
+        self.assertEqual(response['status_code'], status.HTTP_200_OK)
+        self.assertEqual(
+            [(r['status'], r['delta']) for r in response['data']['results']],
+            [('applied', Decimal('-3')), ('applied', Decimal('3')), ('unchanged', Decimal('0'))]
+        )
+        self.assertEqual(self._balance(self.products[0]), Decimal('7'))
+        self.assertEqual(self._balance(self.products[1]), Decimal('3'))
+        adjustments = StockMovement.objects.filter(reference=response['data']['reference'])
+        self.assertEqual(adjustments.count(), 2)
+        self.assertEqual(StockService.check_balances()['data']['drift'], [])
+
+    def test_per_line_errors_do_not_block_valid_lines(self):
+        response = StockService.stocktake({
+            "station": self.station.id,
+            "lines": [
+                {"product": self.products[0].id, "movement_type": 'sale', "quantity": '4'},
+                {"product": self.products[1].id, "movement_type": 'sale', "quantity": '1'},
+                {"product": self.inactive.id, "counted": '5'},
+                {"product": self.products[3].id},
+                {"product": self.products[0].id, "counted": '6'},
+                {"product": self.products[0].id, "counted": '2'},
+                {"product": self.products[4].id, "station": 999999, "counted": '1'},
+            ],
+        })
+
+        self.assertFalse(response['success'])
+        self.assertEqual(response['status_code'], status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [r['status'] for r in response['data']['results']],
+            ['applied', 'error', 'error', 'error', 'unchanged', 'error', 'error']
+        )
+        self.assertEqual(response['data']['results'][1]['errors'], {"quantity": ["Insufficient stock."]})
+        self.assertEqual(self._balance(self.products[0]), Decimal('6'))
+
+    def test_reserved_stock_is_not_sold_or_counted_away(self):
+        StockService.stocktake({"station": self.station.id, "lines": [
+            {"product": self.products[0].id, "counted": '10'}, {"product": self.products[1].id, "counted": '10'},
+        ]})
+        StockRepository.reserve({
+            (self.station.id, self.products[0].id): Decimal('8'), (self.station.id, self.products[1].id): Decimal('8'),
+        })
+        single = StockService.record_movement({
+            "station": self.station.id, "product": self.products[0].id, "movement_type": 'sale', "quantity": '5',
+        })
+        self.assertEqual(single['status_code'], status.HTTP_409_CONFLICT)
+
+        response = StockService.stocktake({"station": self.station.id, "lines": [
+            {"product": self.products[0].id, "movement_type": 'sale', "quantity": '5'},
+            {"product": self.products[0].id, "movement_type": 'sale', "quantity": '2'},
+            {"product": self.products[1].id, "counted": '7'},
+        ]})
+
+        self.assertEqual([r['status'] for r in response['data']['results']], ['error', 'applied', 'error'])
+        self.assertEqual(response['data']['results'][0]['errors'], {"quantity": ["Insufficient stock."]})
+        self.assertIn('counted', response['data']['results'][2]['errors'])
+        self.assertEqual(self._balance(self.products[0]), Decimal('8'))
+        self.assertEqual(self._balance(self.products[1]), Decimal('10'))
+
+    def test_query_count_does_not_grow_with_lines(self):
+        def run(products):
+            with CaptureQueriesContext(connection) as queries:
+                StockService.stocktake({
+                    "station": self.station.id,
+                    "lines": [{"product": product.id, "counted": '5'} for product in products],
+                })
+            return len(queries)
+
+        # Same shape on both runs: existing balances updated, new ones inserted
+        small = run(self.products[:2] + self.products[10:12])
+        large = run(self.products[:12] + self.products[20:120])
+        self.assertEqual(small, large)
+        self.assertEqual(StockBalance.objects.filter(quantity=Decimal('5')).count(), 112)
+
+    def test_full_size_stocktake(self):
+        limit = StocktakeSerializer.MAX_LINES
+        products = Product.objects.bulk_create([
+            Product(name=f'Bulk {i}', sku=f'BULK-{i}', category='lpg', unit='cylinder') for i in range(limit)
+        ])
+
+        def count(quantity):
+            return StockService.stocktake({
+                "station": self.station.id,
+                "lines": [{"product": product.id, "counted": quantity} for product in products],
+            })
+
+        # Inserts every balance, then compare-and-swaps all of them
+        self.assertTrue(count('4')['success'])
+        response = count('9')
+        self.assertTrue(response['success'], response['message'])
+        self.assertEqual(len(response['data']['balances']), limit)
+        self.assertEqual(StockBalance.objects.filter(quantity=Decimal('9')).count(), limit)
+
+    def test_endpoint(self):
+        manager = User.objects.create_user(username='manager', email='manager@test.com', password='pass123')
+        manager.profile.role = 'manager'
+        manager.profile.save()
+        self.station.manager = manager
+        self.station.save()
+        client = APIClient()
+        client.force_authenticate(user=manager)
+
+        response = client.post(reverse('stock-stocktake'), {
+            "station": self.station.id,
+            "lines": [{"product": self.products[5].id, "counted": '12'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['balances'][0]['quantity'], '12.000')
+
+        response = client.post(reverse('stock-stocktake'), {"lines": []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
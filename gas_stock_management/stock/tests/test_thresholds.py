@@ -0,0 +1,108 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from notifications.models import NotificationEvent
+from products.models import Product
+from stock.models import Station, StockThreshold
+from stock.services.stock_service import StockService
+from stock.thresholds import ThresholdCache
+
+
+class LowStockDetectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user(username='manager', email='manager@test.com', password='pass123')
+        self.manager.profile.role = 'manager'
+        self.manager.profile.save()
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01', manager=self.manager)
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        StockThreshold.objects.create(
+            station=self.station, product=self.product, reorder_point=Decimal('10'), clear_point=Decimal('20')
+        )
+        self._move('receipt', '30')
+
+    def _move(self, movement_type, quantity):
+        response = StockService.record_movement({
+            "station": self.station.id,
+            "product": self.product.id,
+            "movement_type": movement_type,
+            "quantity": quantity,
+        })
+        self.assertTrue(response['success'], response)
+        return response
+
+    def _alerts(self):
+        return NotificationEvent.objects.filter(event_type=NotificationEvent.LOW_STOCK)
+
+    def test_crossing_reorder_point_enqueues_one_event(self):
+        self._move('sale', '15')
+        self.assertFalse(self._alerts().exists())
+
+        self._move('sale', '6')
+        event = self._alerts().get()
+        self.assertEqual(event.recipient, self.manager)
+        self.assertEqual(event.payload, {
+            "station_id": self.station.id,
+            "product_id": self.product.id,
+            "quantity": '9.000',
+            "reorder_point": '10.000',
+        })
+
+        self._move('sale', '4')
+        self.assertEqual(self._alerts().count(), 1)
+
+    def test_hysteresis_until_clear_point(self):
+        self._move('sale', '21')
+        # Back above the reorder point but below the clear point: still alerting
+        self._move('receipt', '5')
+        self._move('sale', '5')
+        self.assertEqual(self._alerts().count(), 1)
+
+        self._move('receipt', '15')
+        self.assertFalse(StockThreshold.objects.get().alert_active)
+        self._move('sale', '15')
+        self.assertEqual(self._alerts().count(), 2)
+
+    def test_cached_table_needs_no_queries(self):
+        ThresholdCache.get(self.station.id)
+        with self.assertNumQueries(0):
+            ThresholdCache.get(self.station.id)
+
+    def test_threshold_change_invalidates_cached_table(self):
+        self.assertEqual(ThresholdCache.get(self.station.id)[self.product.id][1], Decimal('10'))
+        threshold = StockThreshold.objects.get()
+        threshold.reorder_point = Decimal('25')
+        threshold.save()
+
+        self.assertEqual(ThresholdCache.get(self.station.id)[self.product.id][1], Decimal('25'))
+        self._move('sale', '6')
+        self.assertEqual(self._alerts().count(), 1)
+
+    def test_failed_movement_raises_no_alert(self):
+        response = StockService.record_movement({
+            "station": self.station.id,
+            "product": self.product.id,
+            "movement_type": 'sale',
+            "quantity": '31',
+        })
+        self.assertEqual(response['status_code'], status.HTTP_409_CONFLICT)
+        self.assertFalse(self._alerts().exists())
+
+    def test_threshold_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(user=self.manager)
+        url = reverse('station-thresholds', args=[self.station.id])
+
+        response = client.post(url, {"product": self.product.id, "reorder_point": '5'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['clear_point'], '5.000')
+
+        response = client.post(url, {"product": self.product.id, "reorder_point": '5', "clear_point": '2'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.get(url)
+        self.assertEqual(len(response.data['data']['thresholds']), 1)
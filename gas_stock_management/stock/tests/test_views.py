@@ -0,0 +1,126 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from products.models import Product
+from stock.models import Station, StockBalance, StockMovement
+from stock.services.stock_service import StockService
+
+
+class StockViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.manager = User.objects.create_user(username='manager', email='manager@test.com', password='pass123')
+        self.manager.profile.role = 'manager'
+        self.manager.profile.save()
+        self.customer = User.objects.create_user(username='customer', email='customer@test.com', password='pass123')
+
+        self.station = Station.objects.create(name='Kigali Central', code='KGL01', manager=self.manager)
+        self.other = Station.objects.create(name='Huye', code='HYE01', manager=self.manager)
+        self.product = Product.objects.create(name='LPG 12kg', sku='LPG-12', category='lpg', unit='cylinder')
+        self.client.force_authenticate(user=self.manager)
+
+    def _move(self, movement_type, quantity):
+        return self.client.post(reverse('stock-movements'), {
+            "station": self.station.id,
+            "product": self.product.id,
+            "movement_type": movement_type,
+            "quantity": quantity,
+        }, format='json')
+
+    def test_receipt_and_sale(self):
+        self.assertEqual(self._move('receipt', '20').status_code, status.HTTP_201_CREATED)
+        response = self._move('sale', '5')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['movements'][0]['quantity'], '-5.000')
+        self.assertEqual(response.data['data']['balances'][0]['quantity'], '15.000')
+
+    def test_sale_needs_positive_quantity(self):
+        response = self._move('sale', '-5')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_oversell_conflict(self):
+        self._move('receipt', '2')
+        response = self._move('sale', '3')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_transfer_writes_both_legs(self):
+        self._move('receipt', '10')
+        response = self.client.post(reverse('stock-transfers'), {
+            "from_station": self.station.id,
+            "to_station": self.other.id,
+            "product": self.product.id,
+            "quantity": '4',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        legs = StockMovement.objects.filter(movement_type__startswith='transfer')
+        self.assertEqual(len({leg.reference for leg in legs}), 1)
+        self.assertEqual(StockBalance.objects.get(station=self.station).quantity, Decimal('6'))
+        self.assertEqual(StockBalance.objects.get(station=self.other).quantity, Decimal('4'))
+
+    def test_station_balances(self):
+        self._move('receipt', '10')
+        response = self.client.get(reverse('station-balances', args=[self.station.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['balances'][0]['product_name'], 'LPG 12kg')
+
+        response = self.client.get(reverse('station-balances', args=[self.station.id]), {"product": self.product.id})
+        self.assertEqual(response.data['data']['quantity'], Decimal('10'))
+
+    def test_managers_only_write_stock_at_their_stations(self):
+        elsewhere = Station.objects.create(name='Musanze', code='MSZ01')
+        self._move('receipt', '10')
+        writes = [
+            ('stock-movements', [], {"station": elsewhere.id, "product": self.product.id,
+                                     "movement_type": 'receipt', "quantity": '5'}),
+            ('stock-transfers', [], {"from_station": self.station.id, "to_station": elsewhere.id,
+                                     "product": self.product.id, "quantity": '4'}),
+            ('station-thresholds', [elsewhere.id], {"product": self.product.id, "reorder_point": '2', "clear_point": '4'}),
+        ]
+        for name, args, payload in writes:
+            response = self.client.post(reverse(name, args=args), payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, name)
+
+        response = self.client.post(reverse('stock-stocktake'), {
+            "station": elsewhere.id, "lines": [{"product": self.product.id, "counted": '7'}],
+        }, format='json')
+        self.assertEqual(response.data['data']['results'][0]['errors'], {"station": ["Unknown or inactive station."]})
+        self.assertFalse(StockBalance.objects.filter(station=elsewhere).exists())
+        self.assertFalse(elsewhere.thresholds.exists())
+
+        response = self.client.post(reverse('station-thresholds', args=[self.station.id]), {
+            "product": self.product.id, "reorder_point": '2', "clear_point": '4',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        threshold = self.station.thresholds.get()
+        self.assertEqual((threshold.created_by, threshold.updated_by), (self.manager, self.manager))
+
+    def test_customer_cannot_move_stock(self):
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self._move('receipt', '10').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_check_command_reports_drift(self):
+        self._move('receipt', '10')
+        StockBalance.objects.update(quantity=Decimal('9'))
+
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, '1 of 1 balances drifted'):
+            call_command('check_stock_balances', stdout=out)
+        self.assertIn('ledger=10', out.getvalue())
+
+        call_command('check_stock_balances', '--fix', stdout=StringIO())
+        self.assertEqual(StockBalance.objects.get().quantity, Decimal('10'))
+        call_command('check_stock_balances', stdout=StringIO())
+
+    def test_check_command_fails_when_the_check_fails(self):
+        failure = {"success": False, "message": "Balance check failed", "data": {}}
+        with mock.patch.object(StockService, 'check_balances', return_value=failure):
+            with self.assertRaisesMessage(CommandError, 'Balance check failed'):
+                call_command('check_stock_balances', stdout=StringIO())
@@ -0,0 +1,39 @@
+from gas_stock_management.caching import CacheCounters, VersionedCache
+from stock.models import StockThreshold
+
+
+class ThresholdCache(VersionedCache):
+    """
+    Read-through cache of each station's threshold table:
+    {product_id: (threshold_id, reorder_point, clear_point, manager_id)}.
+    Entries are dropped by the signals in stock/signals.py whenever a
+    threshold or the station changes. Alert state is not cached; it is
+    switched with conditional updates on the threshold row.
+    """
+    counters = CacheCounters()
+
+    @staticmethod
+    def _key(station_id) -> str:
+        return f"stock:thresholds:{station_id}"
+
+    @classmethod
+    def get(cls, station_id) -> dict:
+        table = cls._get(cls._key(station_id))
+        if table is not None:
+            cls._count("hits")
+            return table
+
+        cls._count("misses")
+        table = {
+            product_id: (threshold_id, reorder_point, clear_point, manager_id)
+            for threshold_id, product_id, reorder_point, clear_point, manager_id in StockThreshold.objects
+            .filter(station_id=station_id)
+            .values_list('id', 'product_id', 'reorder_point', 'clear_point', 'station__manager_id')
+        }
+        cls._set(cls._key(station_id), table)
+        return table
+
+    @classmethod
+    def invalidate(cls, station_id) -> None:
+        cls._delete(cls._key(station_id))
+        cls._count("invalidations")
@@ -0,0 +1,18 @@
+from django.urls import path
+from .views import (
+    StockMovementView, StockTransferView, StocktakeView, StationBalancesView, StationThresholdsView,
+    ContentionStatsView, CylinderScanInView, CylinderScanOutView, AvailableCylindersView, CylinderDetailView
+)
+
+urlpatterns = [
+    path('movements/', StockMovementView.as_view(), name='stock-movements'),
+    path('transfers/', StockTransferView.as_view(), name='stock-transfers'),
+    path('stocktake/', StocktakeView.as_view(), name='stock-stocktake'),
+    path('stations/<int:station_id>/balances/', StationBalancesView.as_view(), name='station-balances'),
+    path('stations/<int:station_id>/thresholds/', StationThresholdsView.as_view(), name='station-thresholds'),
+    path('cylinders/scan-in/', CylinderScanInView.as_view(), name='cylinder-scan-in'),
+    path('cylinders/scan-out/', CylinderScanOutView.as_view(), name='cylinder-scan-out'),
+    path('cylinders/available/', AvailableCylindersView.as_view(), name='cylinders-available'),
+    path('cylinders/<str:serial>/', CylinderDetailView.as_view(), name='cylinder-detail'),
+    path('contention-stats/', ContentionStatsView.as_view(), name='stock-contention-stats'),
+]
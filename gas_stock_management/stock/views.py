@@ -1,3 +1,158 @@
-from django.shortcuts import render
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from accounts.permissions import IsAdmin, IsManager, IsDeliveryStaff
+from gas_stock_management.pagination import clamp_page_size
+from stock.models import Cylinder
+from stock.services.cylinder_service import CylinderService
+from stock.services.stock_service import StockService
 
-# Create your views here.
+
+def _station_scope(request) -> dict:
+    """Managers write stock only at the stations they run; admins at every station."""
+    if request.user.profile.role == 'manager':
+        return {"manager_id": request.user.id}
+    return {}
+
+
+class StockMovementView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def post(self, request):
+        service_response = StockService.record_movement(request.data, user_id=request.user.id, **_station_scope(request))
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_201_CREATED))
+
+
+class StockTransferView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def post(self, request):
+        service_response = StockService.transfer_stock(request.data, user_id=request.user.id, **_station_scope(request))
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_201_CREATED))
+
+
+class StocktakeView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def post(self, request):
+        service_response = StockService.stocktake(request.data, user_id=request.user.id, **_station_scope(request))
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class StationBalancesView(APIView):
+    """Current balances, or with `?at=<ISO datetime>` the balances at that moment."""
+    permission_classes = [IsAuthenticated, IsDeliveryStaff]
+
+    def get(self, request, station_id):
+        product_id = request.query_params.get('product')
+        if product_id is not None and not product_id.isdigit():
+            return self._bad_request("Invalid product")
+
+        at = request.query_params.get('at')
+        if at is not None:
+            try:
+                at = parse_datetime(at)
+            except ValueError:
+                at = None
+            if at is None:
+                return self._bad_request("Invalid 'at' timestamp")
+            if timezone.is_naive(at):
+                at = timezone.make_aware(at)
+
+        if product_id is not None:
+            if at is not None:
+                service_response = StockService.get_balance_at(station_id, int(product_id), at)
+            else:
+                service_response = StockService.get_balance(station_id, int(product_id))
+        elif at is not None:
+            service_response = StockService.get_station_balances_at(station_id, at)
+        else:
+            service_response = StockService.get_station_balances(station_id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+    def _bad_request(self, message):
+        return Response({
+            "success": False,
+            "message": message,
+            "data": {}
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class StationThresholdsView(APIView):
+    permission_classes = [IsAuthenticated, IsManager]
+
+    def get(self, request, station_id):
+        service_response = StockService.get_thresholds(station_id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+    def post(self, request, station_id):
+        service_response = StockService.set_threshold(
+            station_id, request.data, user_id=request.user.id, **_station_scope(request)
+        )
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class ContentionStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        service_response = StockService.contention_stats()
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class CylinderScanInView(APIView):
+    permission_classes = [IsAuthenticated, IsDeliveryStaff]
+
+    def post(self, request):
+        service_response = CylinderService.scan_in(request.data, user_id=request.user.id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class CylinderScanOutView(APIView):
+    permission_classes = [IsAuthenticated, IsDeliveryStaff]
+
+    def post(self, request):
+        service_response = CylinderService.scan_out(request.data, user_id=request.user.id)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class AvailableCylindersView(APIView):
+    """Serial numbers of `?product=` cylinders at `?station=`, full unless `?state=` says otherwise."""
+    permission_classes = [IsAuthenticated, IsDeliveryStaff]
+
+    def get(self, request):
+        product_id = request.query_params.get('product', '')
+        station_id = request.query_params.get('station', '')
+        state = request.query_params.get('state', Cylinder.FULL)
+        if not product_id.isdigit() or not station_id.isdigit():
+            return Response({
+                "success": False,
+                "message": "'product' and 'station' are required",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if state not in dict(Cylinder.STATE_CHOICES):
+            return Response({
+                "success": False,
+                "message": "Invalid state",
+                "data": {}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        service_response = CylinderService.get_available(
+            int(product_id),
+            int(station_id),
+            state=state,
+            cursor=request.query_params.get('cursor'),
+            limit=clamp_page_size(request.query_params.get('page_size'))
+        )
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))
+
+
+class CylinderDetailView(APIView):
+    permission_classes = [IsAuthenticated, IsDeliveryStaff]
+
+    def get(self, request, serial):
+        service_response = CylinderService.get_cylinder(serial)
+        return Response(service_response, status=service_response.get("status_code", status.HTTP_200_OK))